@@ -0,0 +1,152 @@
+"""
+    Benchmark suite of the solver on synthetic games.
+
+    Run the benchmarks and write their results:
+        python -m benchmarks.run --sizes 13 39 100 500 --output results.json
+
+    Compare two runs and exit with a non-zero code when a benchmark got slower than the threshold:
+        python -m benchmarks.run compare baseline.json results.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from mckinseysolvegame import OptimizationResult, Solver, Species, __version__
+from mckinseysolvegame.domain.generator import generate_species
+
+DEFAULT_SIZES = [13, 39, 100, 500]
+
+
+def time_function(function: Callable[[], object], repeat: int, minimum_sample_time: float = 0.02) -> Dict[str, float]:
+    """
+        Time `function` per call, calling it in a loop long enough for every sample to last `minimum_sample_time`
+        seconds, as `timeit` does, so that fast functions are not dominated by the timer resolution.
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < minimum_sample_time:
+        number *= 2
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'min': min(timings), 'median': statistics.median(timings), 'max': max(timings), 'number': number}
+
+
+def species_to_dataframe(species: List[Species]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'name': [s.name for s in species],
+        'calories_provided': [s.calories_provided for s in species],
+        'calories_needed': [s.calories_needed for s in species],
+        'depth_range': [s.depth_range for s in species],
+        'temperature_range': [s.temperature_range for s in species],
+        'food_sources': [';'.join(s.food_sources) if s.food_sources else None for s in species]
+    })
+
+
+def benchmarks_for(species: List[Species]) -> Dict[str, Callable[[], object]]:
+    solver = Solver()
+    df = species_to_dataframe(species)
+    species_json = json.dumps([s.to_json() for s in species])
+    result = OptimizationResult(species=[s.name for s in species[:8]])
+    result_json = result.to_json("str")
+    return {
+        'find_sustainable_food_chain': lambda: solver.find_sustainable_food_chain(species),
+        'solve_from_dataframe': lambda: solver.solve_from_dataframe(df),
+        'species_to_json': lambda: [s.to_json("str") for s in species],
+        'species_from_json': lambda: Species.from_json(species_json, many=True),
+        'optimization_result_to_json': lambda: [result.to_json("str") for _ in species],
+        'optimization_result_from_json': lambda: [OptimizationResult.from_json(result_json) for _ in species]
+    }
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 5, seed: int = 0, only: List[str] = None) -> dict:
+    results = []
+    for size in sizes:
+        species = generate_species(size, seed=seed)
+        for name, function in benchmarks_for(species).items():
+            if only and name not in only:
+                continue
+            timings = time_function(function, repeat)
+            results.append({'name': name, 'size': size, 'repeat': repeat, **timings})
+            print(f'{name:<32} {size:>6} species {timings["min"] * 1000:>12.3f} ms', file=sys.stderr)
+    return {
+        'metadata': {
+            'version': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        },
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2) -> List[dict]:
+    """
+        Compare the best timings of two runs, flagging as regressions the benchmarks
+        that are more than `threshold` (relatively) slower in `current`.
+        The minimum is compared rather than the median as it is the least sensitive to a busy machine.
+    """
+    baseline_timings = {(r['name'], r['size']): r['min'] for r in baseline['results']}
+    comparisons = []
+    for r in current['results']:
+        key = (r['name'], r['size'])
+        if key not in baseline_timings:
+            continue
+        ratio = r['min'] / baseline_timings[key] if baseline_timings[key] else float('inf')
+        comparisons.append({
+            'name': r['name'],
+            'size': r['size'],
+            'baseline': baseline_timings[key],
+            'current': r['min'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+    return comparisons
+
+
+def main(argv: List[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'compare':
+        parser = argparse.ArgumentParser(prog='python -m benchmarks.run compare')
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='relative slowdown above which a benchmark is a regression')
+        args = parser.parse_args(argv[1:])
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+
+        comparisons = compare(baseline, current, args.threshold)
+        for c in comparisons:
+            flag = 'REGRESSION' if c['regression'] else ''
+            print(f'{c["name"]:<32} {c["size"]:>6} species {c["baseline"] * 1000:>12.3f} ms '
+                  f'-> {c["current"] * 1000:>12.3f} ms  x{c["ratio"]:.2f} {flag}')
+        return 1 if any(c['regression'] for c in comparisons) else 0
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='+', help='names of the benchmarks to run')
+    parser.add_argument('--output', help='path of the JSON results, printed to stdout when omitted')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.seed, args.only)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
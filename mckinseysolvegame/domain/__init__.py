@@ -1,8 +1,21 @@
-from mckinseysolvegame.domain.models import Species, OptimizationResult
-from mckinseysolvegame.domain.services import Solver
+from mckinseysolvegame.domain.models import Species, FrozenSpecies, OptimizationResult
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.food_web import FoodWeb
+from mckinseysolvegame.domain.services import (Solver, CompiledGame, IncrementalSolver, SolveStats, CancellationToken,
+                                               ProgressEvent, ChainValidation, validate_chains)
 
 __all__ = [
     'Solver',
+    'CompiledGame',
+    'IncrementalSolver',
+    'SolveStats',
+    'CancellationToken',
+    'ProgressEvent',
+    'ChainValidation',
+    'validate_chains',
     'Species',
-    'OptimizationResult'
+    'FrozenSpecies',
+    'OptimizationResult',
+    'NameRegistry',
+    'FoodWeb'
 ]
\ No newline at end of file
@@ -0,0 +1,113 @@
+from array import array
+from collections import deque
+from typing import Dict, List, Optional
+
+from mckinseysolvegame.domain.models import Species
+
+
+class FoodWeb:
+    """
+        Predator-prey graph of the species of a game, built once and shared by the solves of the game.
+
+        Species are identified by their index in the game. The prey of species `i` are
+        `prey[prey_offsets[i]:prey_offsets[i + 1]]` and its predators
+        `predators[predator_offsets[i]:predator_offsets[i + 1]]`, both in compressed sparse row form.
+        A food source is every species of the game with its name, e.g. one per depth range when a name repeats
+        across depth ranges, and food sources that are not species of the game are ignored. Species are looked up
+        by name as the first species with that name.
+
+        Attributes:
+            names (List[str]): The name of each species.
+            calories_provided (List[int]): The calories provided by each species.
+            calories_needed (List[int]): The calories needed by each species.
+            prey_offsets (array): The offsets of the prey of each species, one more than the species.
+            prey (array): The indices of the prey of every species, in the order of their food sources.
+            predator_offsets (array): The offsets of the predators of each species, one more than the species.
+            predators (array): The indices of the predators of every species, in ascending order.
+            layers (List[Optional[int]]): The trophic layer of each species: 0 for producers, otherwise one more
+                than the lowest layer of its prey, None when none of its prey leads to a producer.
+            strongest_food_sources (List[Optional[int]]): The prey providing the most calories of each species,
+                the first of its food sources on ties, None when it has no prey.
+    """
+    def __init__(self, species: List[Species]):
+        self.names = [s.name for s in species]
+        self.calories_provided = [int(s.calories_provided) for s in species]
+        self.calories_needed = [int(s.calories_needed) for s in species]
+        # the indices of the species having each name, in ascending order
+        self._indices: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            self._indices.setdefault(name, []).append(i)
+
+        self.prey_offsets = array('I', [0])
+        self.prey = array('I')
+        for s in species:
+            self.prey.extend(dict.fromkeys(i for name in s.food_sources for i in self._indices.get(name, ())))
+            self.prey_offsets.append(len(self.prey))
+
+        predators: List[List[int]] = [[] for _ in species]
+        for i in range(len(species)):
+            for p in self.prey_of_index(i):
+                predators[p].append(i)
+        self.predator_offsets = array('I', [0])
+        self.predators = array('I')
+        for p in predators:
+            self.predators.extend(p)
+            self.predator_offsets.append(len(self.predators))
+
+        self.layers = self._compute_layers()
+        self.strongest_food_sources = [max(self.prey_of_index(i), key=self.calories_provided.__getitem__, default=None)
+                                       for i in range(len(species))]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        try:
+            return self._indices[name][0]
+        except KeyError:
+            raise KeyError(f'Unknown species \'{name}\'') from None
+
+    def prey_of_index(self, i: int) -> array:
+        return self.prey[self.prey_offsets[i]:self.prey_offsets[i + 1]]
+
+    def predators_of_index(self, i: int) -> array:
+        return self.predators[self.predator_offsets[i]:self.predator_offsets[i + 1]]
+
+    def prey_of(self, name: str) -> List[str]:
+        return [self.names[i] for i in self.prey_of_index(self.index(name))]
+
+    def predators_of(self, name: str) -> List[str]:
+        return [self.names[i] for i in self.predators_of_index(self.index(name))]
+
+    def layer(self, name: str) -> Optional[int]:
+        return self.layers[self.index(name)]
+
+    def strongest_food_source(self, name: str) -> Optional[str]:
+        i = self.strongest_food_sources[self.index(name)]
+        return None if i is None else self.names[i]
+
+    @property
+    def producers(self) -> List[str]:
+        return [name for name, needed in zip(self.names, self.calories_needed) if needed == 0]
+
+    def species_by_layer(self) -> List[List[str]]:
+        """
+            Names of the species of each layer, from the producers up. Species reaching no producer are left out.
+        """
+        by_layer: List[List[str]] = [[] for _ in range(max((x for x in self.layers if x is not None), default=-1) + 1)]
+        for name, layer in zip(self.names, self.layers):
+            if layer is not None:
+                by_layer[layer].append(name)
+        return by_layer
+
+    def _compute_layers(self) -> List[Optional[int]]:
+        # breadth-first search from the producers up to their predators
+        layers: List[Optional[int]] = [0 if needed == 0 else None for needed in self.calories_needed]
+        queue = deque(i for i, layer in enumerate(layers) if layer == 0)
+        while queue:
+            i = queue.popleft()
+            for p in self.predators_of_index(i):
+                if layers[p] is None:
+                    layers[p] = layers[i] + 1
+                    queue.append(p)
+        return layers
@@ -0,0 +1,82 @@
+import random
+from itertools import product
+from typing import List
+
+from mckinseysolvegame.domain.models import Species
+
+PRODUCER_ADJECTIVES = ["Red", "Green", "Purple", "Yellow", "Stalked", "Fire", "Giant", "Common", "Rock", "Sea"]
+PRODUCER_NOUNS = ["Moss", "Kelp", "Coral", "Sponge", "Grass", "Algae", "Weed", "Fan", "Lettuce", "Hydrocoral"]
+ANIMAL_ADJECTIVES = ["Blue", "Queen", "Great White", "Bicolour", "Majestic", "Flame", "Coral", "Spotted", "Pacific",
+                     "Northern", "Striped", "Glass", "Loggerhead", "Olive", "Powder Blue", "Short-tail"]
+ANIMAL_NOUNS = ["Angelfish", "Tang", "Turtle", "Shark", "Snapper", "Parrotfish", "Jellyfish", "Squid", "Shrimp",
+                "Urchin", "Stingray", "Whale", "Eel", "Trout", "Pufferfish", "Swordfish", "Lanternfish", "Dolphinfish"]
+
+DEPTH_BAND = 30
+TEMPERATURE_BANDS = ["28.3-30", "26.7-28.2", "25-26.6", "23.3-24.9", "21.7-23.2"]
+
+
+def generate_species(number_of_species: int,
+                     seed: int = 0,
+                     species_per_depth_range: int = 13,
+                     producer_ratio: float = 0.25,
+                     maximum_food_sources: int = 9) -> List[Species]:
+    """
+        Generate a random but reproducible pool of species shaped like the ones of the game.
+
+        Species are spread over depth ranges of `species_per_depth_range` species, as in the game where 39 species
+        live in 3 depth ranges. Producers provide between 3000 and 6000 calories; animals provide between 800 and
+        6000 calories, need between 400 and 9000, and eat mostly species of their own depth range.
+    """
+    rng = random.Random(seed)
+    number_of_depth_ranges = max(1, -(-number_of_species // species_per_depth_range))
+    depth_ranges = [_depth_range(i) for i in range(number_of_depth_ranges)]
+    producer_names = iter(_names(rng, PRODUCER_ADJECTIVES, PRODUCER_NOUNS, number_of_species))
+    animal_names = iter(_names(rng, ANIMAL_ADJECTIVES, ANIMAL_NOUNS, number_of_species))
+
+    attributes = []
+    for i in range(number_of_species):
+        depth_index = i % number_of_depth_ranges
+        is_producer = rng.random() < producer_ratio
+        attributes.append({
+            'name': next(producer_names) if is_producer else next(animal_names),
+            'calories_provided': _calories(rng, 3000, 6000) if is_producer else _calories(rng, 800, 6000),
+            'calories_needed': 0 if is_producer else _calories(rng, 400, 9000),
+            'depth_range': depth_ranges[depth_index],
+            'temperature_range': TEMPERATURE_BANDS[depth_index % len(TEMPERATURE_BANDS)]
+        })
+
+    names_per_depth_range = {depth_range: [] for depth_range in depth_ranges}
+    for a in attributes:
+        names_per_depth_range[a['depth_range']].append(a['name'])
+    all_names = [a['name'] for a in attributes]
+
+    species = []
+    for a in attributes:
+        food_sources = []
+        if a['calories_needed'] > 0:
+            candidates = [name for name in names_per_depth_range[a['depth_range']] if name != a['name']]
+            number_of_food_sources = rng.randint(1, maximum_food_sources)
+            food_sources = rng.sample(candidates, min(number_of_food_sources, len(candidates)))
+            # a few food sources live at another depth, as in the game
+            if rng.random() < 0.1:
+                food_sources.append(rng.choice([name for name in all_names
+                                                if name != a['name'] and name not in food_sources]))
+        species.append(Species(food_sources=food_sources, **a))
+    rng.shuffle(species)
+    return species
+
+
+def _depth_range(index: int) -> str:
+    start = index * DEPTH_BAND + (1 if index else 0)
+    return f'{start}-{(index + 1) * DEPTH_BAND}m'
+
+
+def _calories(rng: random.Random, minimum: int, maximum: int) -> int:
+    return rng.randrange(minimum, maximum + 1, 50)
+
+
+def _names(rng: random.Random, adjectives: List[str], nouns: List[str], count: int) -> List[str]:
+    names = [f'{adjective} {noun}' for adjective, noun in product(adjectives, nouns)]
+    rng.shuffle(names)
+    # suffix the names once the catalogue is exhausted so that they stay unique
+    return [names[i % len(names)] + (f' {i // len(names) + 1}' if i >= len(names) else '') for i in range(count)]
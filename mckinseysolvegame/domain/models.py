@@ -1,9 +1,13 @@
 import json
-from typing import List
+import math
+import sys
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from marshmallow import Schema, fields, post_load, validate
+from marshmallow import Schema, fields, post_dump, post_load, validate
 
 
+@lru_cache(maxsize=None)
 def camelcase(s):
     parts = iter(s.split("_"))
     return next(parts) + "".join(i.title() for i in parts)
@@ -22,6 +26,8 @@ MAXIMUM_NUMBER_OF_CHARACTERS_SPECIES_NAME = 64
 
 
 class Species:
+    __slots__ = ('name', 'calories_provided', 'calories_needed', 'depth_range', 'temperature_range', 'food_sources')
+
     def __init__(self, name: str,
                  calories_provided: int,
                  calories_needed: int,
@@ -41,17 +47,97 @@ class Species:
 
     @classmethod
     def from_json(cls, data, many=False):
-        schema = SpeciesSchema(many=many)
+        schema = _get_schema(SpeciesSchema, many)
         if isinstance(data, dict):
             return schema.load(data)
-        elif isinstance(data, str):
+        elif isinstance(data, (str, bytes, bytearray)):
             json_data = json.loads(data)
-            return schema.load(json_data)
+            return (many and _load_species_many(json_data)) or schema.load(json_data)
         else:
             raise NotImplementedError(f"Invalid input type \'{type(data)}\' during deserialization")
 
     def to_json(self, format_type: str = "dict"):
-        schema = SpeciesSchema()
+        schema = _get_schema(SpeciesSchema)
+        my_json = schema.dump(self)
+        if format_type == "dict":
+            return my_json
+        elif format_type == "str":
+            return json.dumps(my_json)
+        else:
+            raise NotImplementedError(f"Invalid format type \'{format_type}\' during serialization")
+
+
+class FrozenSpecies:
+    """
+        Immutable and hashable variant of `Species`, e.g. to be used as a cache key or shared between solves.
+
+        Names are interned and the food sources are stored as an interned tuple, so species repeated across games
+        share their strings. Copying a frozen species returns it as is.
+    """
+    __slots__ = Species.__slots__ + ('_hash',)
+
+    def __init__(self, name: str,
+                 calories_provided: int,
+                 calories_needed: int,
+                 depth_range: str,
+                 temperature_range: str,
+                 food_sources: Tuple[str, ...]):
+        assert len(name) <= MAXIMUM_NUMBER_OF_CHARACTERS_SPECIES_NAME, \
+            f'name should be {MAXIMUM_NUMBER_OF_CHARACTERS_SPECIES_NAME} characters or less'
+        assert calories_provided >= 0, 'calories provided must be a positive integer'
+        assert calories_needed >= 0, 'calories needed must be a positive integer'
+        food_sources = _intern_food_sources(tuple(sys.intern(f) for f in food_sources))
+        attributes = (sys.intern(name), calories_provided, calories_needed,
+                      sys.intern(depth_range), sys.intern(temperature_range), food_sources)
+        for attribute, value in zip(Species.__slots__, attributes):
+            object.__setattr__(self, attribute, value)
+        object.__setattr__(self, '_hash', hash(attributes))
+
+    @classmethod
+    def from_species(cls, species: Species) -> 'FrozenSpecies':
+        return cls(species.name, species.calories_provided, species.calories_needed,
+                   species.depth_range, species.temperature_range, species.food_sources)
+
+    def to_species(self) -> Species:
+        return Species(self.name, self.calories_provided, self.calories_needed,
+                       self.depth_range, self.temperature_range, list(self.food_sources))
+
+    def _attributes(self) -> tuple:
+        return tuple(getattr(self, attribute) for attribute in Species.__slots__)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenSpecies):
+            return NotImplemented
+        return self._hash == other._hash and self._attributes() == other._attributes()
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f'{type(self).__name__}{self._attributes()!r}'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), self._attributes()
+
+    @classmethod
+    def from_json(cls, data, many=False):
+        species = Species.from_json(data, many)
+        return [cls.from_species(s) for s in species] if many else cls.from_species(species)
+
+    def to_json(self, format_type: str = "dict"):
+        schema = _get_schema(SpeciesSchema)
         my_json = schema.dump(self)
         if format_type == "dict":
             return my_json
@@ -61,6 +147,11 @@ class Species:
             raise NotImplementedError(f"Invalid format type \'{format_type}\' during serialization")
 
 
+@lru_cache(maxsize=65536)
+def _intern_food_sources(food_sources: Tuple[str, ...]) -> Tuple[str, ...]:
+    return food_sources
+
+
 class SpeciesSchema(CamelCaseSchema):
     """
         A marshmallow schema for the Species class.
@@ -75,6 +166,9 @@ class SpeciesSchema(CamelCaseSchema):
 
     @post_load
     def make_species(self, data, **kwargs) -> Species:
+        # names are only registered when compiled, in the registry of the solver
+        data['name'] = sys.intern(data['name'])
+        data['food_sources'] = [sys.intern(f) for f in data['food_sources']]
         return Species(**data)
 
 
@@ -84,23 +178,28 @@ class OptimizationResult:
 
         Attributes:
             species (List[str]): The list of species names ordered by their calories provided.
+            score (Optional[float]): The secondary score of the chain when it was ranked, e.g. its leftover calories.
+            trace (Optional[List[dict]]): The steps of the eating of the chain when it was traced, as exported by
+                `EatingTrace.to_json`.
     """
-    def __init__(self, species: List[str]):
+    def __init__(self, species: List[str], score: Optional[float] = None, trace: Optional[List[dict]] = None):
         self.species = species
+        self.score = score
+        self.trace = trace
 
     @classmethod
     def from_json(cls, data, many=False):
-        schema = OptimizationResultSchema(many=many)
+        schema = _get_schema(OptimizationResultSchema, many)
         if isinstance(data, dict):
             return schema.load(data)
-        elif isinstance(data, str):
+        elif isinstance(data, (str, bytes, bytearray)):
             json_data = json.loads(data)
-            return schema.load(json_data)
+            return (many and _load_optimization_results_many(json_data)) or schema.load(json_data)
         else:
             raise NotImplementedError(f"Invalid input type \'{type(data)}\' during deserialization")
 
     def to_json(self, format_type: str = "dict"):
-        schema = OptimizationResultSchema()
+        schema = _get_schema(OptimizationResultSchema)
         my_json = schema.dump(self)
         if format_type == "dict":
             return my_json
@@ -115,7 +214,87 @@ class OptimizationResultSchema(CamelCaseSchema):
         Marshmallow schema for deserializing and serializing OptimizationResult objects.
     """
     species = fields.List(fields.String(), required=True)
+    score = fields.Float(allow_none=True, load_default=None)
+    trace = fields.List(fields.Dict(), allow_none=True, load_default=None)
+
+    @post_dump
+    def remove_missing_fields(self, data, **kwargs) -> dict:
+        for key in ('score', 'trace'):
+            if data.get(key) is None:
+                data.pop(key, None)
+        return data
 
     @post_load
     def make_optimization_result(self, data, **kwargs) -> OptimizationResult:
         return OptimizationResult(**data)
+
+
+@lru_cache(maxsize=None)
+def _get_schema(schema_class, many: bool = False) -> Schema:
+    """
+        Schemas hold no state between loads and dumps, so a single instance per class is built and its fields bound once.
+    """
+    return schema_class(many=many)
+
+
+SPECIES_KEYS = frozenset(['name', 'caloriesProvided', 'caloriesNeeded', 'depthRange', 'temperatureRange', 'foodSources'])
+OPTIMIZATION_RESULT_KEYS = frozenset(['species', 'score'])
+
+
+def _load_species_many(items) -> Optional[List[Species]]:
+    """
+        Fast path of `Species.from_json(..., many=True)`: the rules of `SpeciesSchema` are checked column by column
+        and the species built directly. Returns None as soon as an item does not follow the rules, or follows them
+        in a way only the schema handles (e.g. numbers given as strings), so that the schema reports the errors.
+    """
+    if type(items) is not list or not items:
+        return None
+    if not all(type(item) is dict and item.keys() == SPECIES_KEYS for item in items):
+        return None
+
+    names = [item['name'] for item in items]
+    calories_provided = [item['caloriesProvided'] for item in items]
+    calories_needed = [item['caloriesNeeded'] for item in items]
+    depth_ranges = [item['depthRange'] for item in items]
+    temperature_ranges = [item['temperatureRange'] for item in items]
+    food_sources = [item['foodSources'] for item in items]
+
+    if not (all(type(x) is str for x in names)
+            and all(type(x) is int for x in calories_provided)
+            and all(type(x) is int for x in calories_needed)
+            and all(type(x) is str for x in depth_ranges)
+            and all(type(x) is str for x in temperature_ranges)
+            and all(type(x) is list for x in food_sources)):
+        return None
+    all_food_sources = [f for sources in food_sources for f in sources]
+    if not all(type(f) is str for f in all_food_sources):
+        return None
+    if (max(map(len, names)) > MAXIMUM_NUMBER_OF_CHARACTERS_SPECIES_NAME
+            or max(map(len, all_food_sources), default=0) > MAXIMUM_NUMBER_OF_CHARACTERS_SPECIES_NAME
+            or min(calories_provided) < 1
+            or min(calories_needed) < 0):
+        return None
+
+    intern = {name: sys.intern(name) for name in {*names, *all_food_sources}}.__getitem__
+    return [Species(intern(name), provided, needed, depth_range, temperature_range, list(map(intern, sources)))
+            for name, provided, needed, depth_range, temperature_range, sources in zip(
+                names, calories_provided, calories_needed, depth_ranges, temperature_ranges, food_sources)]
+
+
+def _load_optimization_results_many(items) -> Optional[List[OptimizationResult]]:
+    """
+        Fast path of `OptimizationResult.from_json(..., many=True)`, following the same rules as `_load_species_many`.
+    """
+    if type(items) is not list or not items:
+        return None
+    if not all(type(item) is dict and 'species' in item and item.keys() <= OPTIMIZATION_RESULT_KEYS for item in items):
+        return None
+
+    species = [item['species'] for item in items]
+    scores = [item.get('score') for item in items]
+    if not (all(type(x) is list and all(type(name) is str for name in x) for x in species)
+            and all(x is None or (type(x) in (int, float) and math.isfinite(x)) for x in scores)):
+        return None
+
+    return [OptimizationResult(species=names, score=None if score is None else float(score))
+            for names, score in zip(species, scores)]
@@ -0,0 +1,64 @@
+import sys
+import threading
+from typing import Iterable, List, Optional
+
+
+class NameRegistry:
+    """
+        Registry interning species names to small integer ids.
+
+        Names repeat across games, so each distinct name is stored once and identified by the order in which
+        it was first registered. The solver works with these ids and translates them back to names in its results.
+        The default registry, shared by the whole process, grows with the distinct names it sees: use a registry
+        per batch of games when names are unbounded.
+    """
+    def __init__(self):
+        self._ids = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def id(self, name: str) -> int:
+        """
+            Return the id of a name, registering it if needed.
+        """
+        try:
+            return self._ids[name]
+        except KeyError:
+            with self._lock:
+                if name not in self._ids:
+                    self._ids[sys.intern(name)] = len(self._names)
+                    self._names.append(sys.intern(name))
+                return self._ids[name]
+
+    def ids(self, names: Iterable[str]) -> List[int]:
+        return [self.id(name) for name in names]
+
+    def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """
+            Return the id of a name if it is registered, without registering it.
+        """
+        return self._ids.get(name, default)
+
+    def name(self, name_id: int) -> str:
+        return self._names[name_id]
+
+    def names(self, name_ids: Iterable[int]) -> List[str]:
+        return [self._names[i] for i in name_ids]
+
+    def intern(self, name: str) -> str:
+        """
+            Return the registered copy of a name, so that equal names share a single string.
+        """
+        try:
+            return self._names[self._ids[name]]
+        except KeyError:
+            return self._names[self.id(name)]
+
+
+DEFAULT_NAME_REGISTRY = NameRegistry()
@@ -0,0 +1,114 @@
+"""
+    Numeric intervals parsed from the depth and temperature ranges of species, e.g. "0-10m", "26.7-28.2"
+    or "90m+", and an index of intervals answering overlap queries.
+"""
+import math
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+RANGE_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(?:-\s*(-?\d+(?:\.\d+)?))?\s*(\+?)\s*([^\d\s.+-]*)\s*(\+?)\s*$')
+
+
+class Interval:
+    """
+        Closed interval of a range.
+
+        Attributes:
+            low (float): The lower bound of the interval.
+            high (float): The upper bound of the interval.
+            unit (str): The unit following the bounds, e.g. "m", empty when there is none.
+    """
+    __slots__ = ('low', 'high', 'unit')
+
+    def __init__(self, low: float, high: float, unit: str = ''):
+        if low > high:
+            raise ValueError(f'Invalid interval [{low}, {high}]')
+        self.low = low
+        self.high = high
+        self.unit = unit
+
+    def __eq__(self, other):
+        if not isinstance(other, Interval):
+            return NotImplemented
+        return (self.low, self.high, self.unit) == (other.low, other.high, other.unit)
+
+    def __hash__(self):
+        return hash((self.low, self.high, self.unit))
+
+    def __repr__(self):
+        return f'Interval({self.low!r}, {self.high!r}, {self.unit!r})'
+
+    def overlaps(self, low: float, high: float) -> bool:
+        return self.low <= high and low <= self.high
+
+
+@lru_cache(maxsize=65536)
+def parse_range(text: str) -> Interval:
+    """
+        Parse a range such as "0-10m", "26.7-28.2" or "-2-4.5C" into an interval. A single value is an interval
+        of zero width, and one followed by a "+", as in "90m+", has no upper bound. Parses are cached, as the same
+        ranges come up in every game.
+    """
+    match = RANGE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f'Invalid range \'{text}\'')
+    low, high, plus_before_unit, unit, plus_after_unit = match.groups()
+    open_ended = plus_before_unit + plus_after_unit
+    if open_ended:
+        if high is not None or len(open_ended) > 1:
+            raise ValueError(f'Invalid range \'{text}\'')
+        return Interval(float(low), math.inf, unit)
+    return Interval(float(low), float(high if high is not None else low), unit)
+
+
+class IntervalIndex(Generic[T]):
+    """
+        Static index of items by interval, answering overlap queries in O(log n + k) for k matches.
+
+        The intervals are sorted by lower bound and seen as an implicit balanced binary tree over that order,
+        each node keeping the highest upper bound of its subtree, so that subtrees ending before the query
+        are skipped.
+    """
+    def __init__(self, entries: Sequence[Tuple[Interval, T]]):
+        entries = sorted(entries, key=lambda entry: entry[0].low)
+        self._lows = [interval.low for interval, _ in entries]
+        self._highs = [interval.high for interval, _ in entries]
+        self._items = [item for _, item in entries]
+        self._max_highs = list(self._highs)
+        self._build(0, len(entries))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def overlapping(self, low: float, high: float) -> List[T]:
+        """
+            Items whose interval overlaps [low, high], in ascending order of lower bound.
+        """
+        matches = []
+        # only the intervals starting before the end of the query can overlap it
+        self._search(0, len(self._items), bisect_right(self._lows, high), low, matches)
+        return matches
+
+    def _build(self, start: int, end: int) -> Optional[float]:
+        if start >= end:
+            return None
+        middle = (start + end) // 2
+        for child in (self._build(start, middle), self._build(middle + 1, end)):
+            if child is not None and child > self._max_highs[middle]:
+                self._max_highs[middle] = child
+        return self._max_highs[middle]
+
+    def _search(self, start: int, end: int, limit: int, low: float, matches: List[T]) -> None:
+        if start >= end or start >= limit:
+            return
+        middle = (start + end) // 2
+        if self._max_highs[middle] < low:
+            return
+        self._search(start, middle, limit, low, matches)
+        if middle < limit and self._highs[middle] >= low:
+            matches.append(self._items[middle])
+        self._search(middle + 1, end, limit, low, matches)
@@ -1,5 +1,17 @@
 from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.domain.services.compiled_game import CompiledGame
+from mckinseysolvegame.domain.services.incremental_solver import IncrementalSolver
+from mckinseysolvegame.domain.services.instrumentation import SolveStats
+from mckinseysolvegame.domain.services.progress import CancellationToken, ProgressEvent
+from mckinseysolvegame.domain.services.validation import ChainValidation, validate_chains
 
 __all__ = [
-    'Solver'
+    'Solver',
+    'CompiledGame',
+    'IncrementalSolver',
+    'SolveStats',
+    'CancellationToken',
+    'ProgressEvent',
+    'ChainValidation',
+    'validate_chains'
 ]
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+    Eating rules of the game evaluated with NumPy on many chains at once.
+
+    The chains of a batch all have the same length and come from the same compiled group: the species eat in
+    lockstep, column by column, every row choosing its food source with array operations. The rules are those
+    of `eating`: the best food source of the chain, at least half of the needs from each of two tied best food
+    sources, otherwise strictly more than the needs from the best one. When Numba is installed, the chains are
+    evaluated by the compiled kernel of `eating_kernel` instead.
+"""
+from itertools import islice
+from typing import Iterable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from mckinseysolvegame.domain.services import eating_kernel
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+
+DEFAULT_BATCH_SIZE = 4096
+
+NO_FOOD = np.iinfo(np.int64).min
+
+
+def adjacency_matrix(group: CompiledGroup) -> np.ndarray:
+    """
+        Boolean matrix whose [s, f] entry tells whether species `s` feeds on species `f`, by position in the group.
+    """
+    size = len(group)
+    positions = np.arange(size)
+    masks = np.array([[mask] for mask in group.food_masks], dtype=object) if size else np.zeros((0, 1), dtype=object)
+    return ((masks >> positions) & 1).astype(bool).reshape(size, size)
+
+
+def evaluate_chains(group: CompiledGroup, chains: np.ndarray,
+                    adjacency: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+        Evaluate chains of positions of `group`, one per row of `chains`, each sorted in ascending order.
+
+        Returns:
+            The boolean mask of the sustainable chains, and the calories provided by each species of each chain
+            once every species has eaten, in the order of `chains`.
+    """
+    chains = np.asarray(chains, dtype=np.intp)
+    if chains.ndim != 2:
+        raise ValueError(f'Expected a 2-D array of chains, got {chains.ndim} dimensions')
+    if adjacency is None:
+        adjacency = adjacency_matrix(group)
+    calories_provided = np.asarray(group.calories_provided, dtype=np.int64)
+    calories_needed = np.asarray(group.calories_needed, dtype=np.int64)
+    if eating_kernel.ACCELERATED:
+        return eating_kernel.evaluate(calories_provided, calories_needed, adjacency, chains)
+
+    rows, length = chains.shape
+    calories = calories_provided[chains]
+    needs = calories_needed[chains]
+    # eats[b, k, j]: the k-th species of chain b feeds on its j-th species
+    eats = adjacency[chains[:, :, None], chains[:, None, :]]
+    fed = needs == 0
+    all_rows = np.arange(rows)
+
+    for k in range(length):
+        need = needs[:, k]
+        eating = need > 0
+        food_calories = np.where(eats[:, k, :], calories, NO_FOOD)
+        # argmax returns the first best food source, as the stable sort of the rules does on ties
+        first = food_calories.argmax(axis=1)
+        first_calories = food_calories[all_rows, first]
+        food_calories[all_rows, first] = NO_FOOD
+        second = food_calories.argmax(axis=1)
+        second_calories = food_calories[all_rows, second]
+
+        has_food = first_calories != NO_FOOD
+        split = eating & has_food & (second_calories == first_calories) & (2 * first_calories >= need)
+        single = eating & has_food & ~split & (first_calories > need)
+
+        half = need // 2
+        calories[all_rows[split], first[split]] -= half[split]
+        calories[all_rows[split], second[split]] -= half[split]
+        calories[all_rows[single], first[single]] -= need[single]
+        fed[:, k] |= split | single
+
+    sustainable = (needs == 0).any(axis=1) & fed.all(axis=1) & (calories > 0).all(axis=1)
+    return sustainable, calories
+
+
+def batches(chains: Iterable[Sequence[int]], length: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[np.ndarray]:
+    """
+        Pack chains of `length` species into arrays of at most `batch_size` rows, in order.
+    """
+    iterator = iter(chains)
+    while True:
+        batch = np.fromiter((p for chain in islice(iterator, batch_size) for p in chain), dtype=np.intp)
+        if not batch.size:
+            return
+        yield batch.reshape(-1, length)
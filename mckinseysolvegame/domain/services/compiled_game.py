@@ -0,0 +1,355 @@
+from math import comb
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from mckinseysolvegame.domain.food_web import FoodWeb
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import DEFAULT_NAME_REGISTRY, NameRegistry
+from mckinseysolvegame.domain.ranges import IntervalIndex, parse_range
+from mckinseysolvegame.domain.services.eating import is_sustainable, simulate_eating
+from mckinseysolvegame.domain.services.eating_trace import EatingTrace
+from mckinseysolvegame.domain.services.instrumentation import SolveStats
+from mckinseysolvegame.domain.services.progress import CancellationToken, ProgressEvent
+
+if TYPE_CHECKING:
+    from mckinseysolvegame.domain.services.optimization_service import Solver
+
+GROUPING_ATTRIBUTES = ('depth_range', 'temperature_range')
+
+GroupBy = Union[str, Tuple[str, ...], Callable[[Species], Hashable]]
+
+
+class CompiledGroup:
+    """
+        Tables of the species of a group, by default a depth range, indexed by their position once sorted
+        by calories provided in descending order, which is also the order in which they eat.
+
+        Attributes:
+            key (Hashable): The key of the group, e.g. the depth range of the species.
+            name_ids (List[int]): The ids of the names of the species in `registry`.
+            calories_provided (List[int]): The calories provided by each species.
+            calories_needed (List[int]): The calories needed by each species.
+            food_masks (List[int]): The bitmask of the positions of the food sources of each species in the group.
+            registry (NameRegistry): The registry of the names of the species.
+            temperature_ranges (List[str]): The temperature range of each species.
+            depth_ranges (List[str]): The depth range of each species.
+            producer_mask (int): The bitmask of the positions of the producers.
+            strong_food_masks (List[int]): The bitmask of the food sources of each species providing more calories
+                than it needs, any of which is enough to feed it.
+            half_food_masks (List[int]): The bitmask of the food sources of each species providing at least half
+                of the calories it needs, two of which are needed to feed it when none is strong enough.
+    """
+    def __init__(self, key: Hashable,
+                 name_ids: List[int],
+                 calories_provided: List[int],
+                 calories_needed: List[int],
+                 food_masks: List[int],
+                 registry: NameRegistry = DEFAULT_NAME_REGISTRY,
+                 temperature_ranges: Optional[List[str]] = None,
+                 depth_ranges: Optional[List[str]] = None):
+        self.key = key
+        self.name_ids = name_ids
+        self.calories_provided = calories_provided
+        self.calories_needed = calories_needed
+        self.food_masks = food_masks
+        self.registry = registry
+        self.temperature_ranges = temperature_ranges if temperature_ranges is not None else [''] * len(name_ids)
+        self.depth_ranges = depth_ranges if depth_ranges is not None else [''] * len(name_ids)
+        self.producer_mask = sum(1 << i for i, need in enumerate(calories_needed) if need == 0)
+        self.strong_food_masks = []
+        self.half_food_masks = []
+        for mask, need in zip(food_masks, calories_needed):
+            strong = half = 0
+            for bit in _bits(mask):
+                calories = calories_provided[bit.bit_length() - 1]
+                if calories > need:
+                    strong |= bit
+                if 2 * calories >= need:
+                    half |= bit
+            self.strong_food_masks.append(strong)
+            self.half_food_masks.append(half)
+
+    def __len__(self) -> int:
+        return len(self.name_ids)
+
+    @property
+    def names(self) -> List[str]:
+        return self.registry.names(self.name_ids)
+
+    def index(self, name: str) -> int:
+        return self.name_ids.index(self.registry.get(name))
+
+    def may_feed(self, i: int, available: int) -> bool:
+        """
+            Whether the food sources of species `i` among the `available` positions may feed it. Food sources
+            only ever lose calories, so a species fed by no strong food source nor two half ones cannot eat.
+        """
+        return self.calories_needed[i] == 0 or bool(self.strong_food_masks[i] & available) \
+            or (self.half_food_masks[i] & available).bit_count() >= 2
+
+    def has_producer(self, chain: Sequence[int]) -> bool:
+        calories_needed = self.calories_needed
+        return any(calories_needed[i] == 0 for i in chain)
+
+    def is_sustainable(self, chain: Sequence[int]) -> bool:
+        return is_sustainable(chain, self.calories_provided, self.calories_needed, self.food_masks)
+
+    def eating_steps(self, chain: Sequence[int], trace: Optional[EatingTrace] = None) -> dict:
+        """
+            Translate the eating of a chain back to species names, in the format of `find_sustainable_food_chain`,
+            recording its steps in `trace` when given.
+        """
+        if trace is not None:
+            trace.clear(self.names)
+        calories, needs, eats = simulate_eating(chain, self.calories_provided, self.calories_needed, self.food_masks,
+                                                trace)
+        name = self.registry.name
+        name_ids = self.name_ids
+        steps = {}
+        for i in chain:
+            steps[name(name_ids[i])] = {'calories_needed': needs[i], 'calories_provided': calories[i]}
+            if i in eats:
+                steps[name(name_ids[i])]['eats'] = [name(name_ids[f]) for f in eats[i]]
+        return steps
+
+    def feasible_positions(self) -> List[int]:
+        """
+            Positions of the species that may belong to a sustainable chain of the group: the producers, and the
+            species having either a food source providing more than they need, or two food sources each providing
+            at least half of it. Food sources only ever lose calories, so a species missing both can never eat,
+            and neither can the species only feeding on such species.
+        """
+        if not self.producer_mask:
+            return []
+
+        feasible = (1 << len(self)) - 1
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(self)):
+                if feasible >> i & 1 and not self.may_feed(i, feasible):
+                    feasible &= ~(1 << i)
+                    changed = True
+        return [i for i in range(len(self)) if feasible >> i & 1]
+
+    def completions(self, start: int, count: int, required: Optional[int] = None) -> int:
+        """
+            Number of combinations of `count` species from position `start` onwards, all containing the species
+            at position `required` when given, e.g. to count the combinations of a branch cut by a search.
+        """
+        if required is not None:
+            if required < start:
+                return 0
+            start, count = start + 1, count - 1
+        return comb(len(self) - start, count) if count >= 0 and start <= len(self) else 0
+
+    def length_bound(self) -> int:
+        """
+            Upper bound of the length of the sustainable chains of the group, without searching them.
+            Only the feasible positions may belong to a chain, and the calories of a chain must balance: each
+            of its species still provides a calorie once everyone has eaten, and each predator ate at least its
+            needs but one, when it split them between two tied food sources. A chain therefore keeps a
+            non-negative sum of `calories_provided - 1` for its producers and `calories_provided - calories_needed`
+            for its predators, which the longest prefix of these sorted in descending order bounds.
+        """
+        balances = sorted((self.calories_provided[i] - max(self.calories_needed[i], 1)
+                           for i in self.feasible_positions()), reverse=True)
+        bound = total = 0
+        for length, balance in enumerate(balances, 1):
+            total += balance
+            if total >= 0:
+                bound = length
+        return bound
+
+    def subset(self, positions: Sequence[int]) -> 'CompiledGroup':
+        """
+            Group made of the species at `positions`, given in ascending order, whose food sources outside of
+            the subset are dropped.
+        """
+        new_bits = {1 << p: 1 << i for i, p in enumerate(positions)}
+        food_masks = [sum(new_bits.get(bit, 0) for bit in _bits(self.food_masks[p])) for p in positions]
+        return CompiledGroup(self.key,
+                             [self.name_ids[p] for p in positions],
+                             [self.calories_provided[p] for p in positions],
+                             [self.calories_needed[p] for p in positions],
+                             food_masks,
+                             self.registry,
+                             [self.temperature_ranges[p] for p in positions],
+                             [self.depth_ranges[p] for p in positions])
+
+
+class CompiledGame:
+    """
+        Species of a game compiled once by `Solver.compile`, to be solved repeatedly with different parameters
+        without grouping, sorting and resolving the food sources again.
+
+        Attributes:
+            groups (Dict[Hashable, CompiledGroup]): The compiled species of each group, in ascending order of key.
+            solver (Solver): The solver searching the chains.
+            food_web (FoodWeb): The predator-prey graph of the game the groups were compiled from.
+    """
+    def __init__(self, groups: Dict[Hashable, CompiledGroup], solver: 'Solver', food_web: Optional[FoodWeb] = None):
+        self.groups = groups
+        self.solver = solver
+        self.food_web = food_web
+        self._selections: Dict[tuple, Dict[Hashable, CompiledGroup]] = {}
+        self._indexes: Dict[str, IntervalIndex] = {}
+        self._positions: Optional[Dict[Union[str, int], Tuple[CompiledGroup, int]]] = None
+
+    @property
+    def depth_ranges(self) -> List[str]:
+        return sorted({d for group in self.groups.values() for d in group.depth_ranges})
+
+    @property
+    def temperature_ranges(self) -> List[str]:
+        return sorted({t for group in self.groups.values() for t in group.temperature_ranges})
+
+    def solve(self, max_length: Optional[int] = None,
+              depth_ranges: Optional[Iterable[str]] = None,
+              temperature_ranges: Optional[Iterable[str]] = None,
+              stats: Optional[SolveStats] = None,
+              progress: Optional[Callable[[ProgressEvent], None]] = None,
+              cancellation_token: Optional[CancellationToken] = None,
+              processes: Optional[int] = None,
+              depth: Optional[Tuple[float, float]] = None,
+              temperature: Optional[Tuple[float, float]] = None,
+              trace: Optional[EatingTrace] = None) -> dict:
+        """
+            Find the longest sustainable food chain, as `Solver.find_sustainable_food_chain` would on the species
+            of the game within `depth_ranges` and `temperature_ranges` (all of them when not given), with chains
+            of at most `max_length` species (`MAXIMUM_FOOD_CHAIN_LENGTH` when not given).
+            `depth` and `temperature` are (low, high) habitats: only the species whose parsed ranges overlap them
+            are considered. With `processes`, the groups are searched by a pool of processes. The eating of the chain
+            found is recorded in `trace` when given.
+        """
+        groups = self.select(depth_ranges, temperature_ranges, depth, temperature)
+        return self.solver._solve_groups(groups, max_length, stats, progress, cancellation_token, processes, trace)
+
+    def select(self, depth_ranges: Optional[Iterable[str]] = None,
+               temperature_ranges: Optional[Iterable[str]] = None,
+               depth: Optional[Tuple[float, float]] = None,
+               temperature: Optional[Tuple[float, float]] = None) -> Dict[Hashable, CompiledGroup]:
+        """
+            Groups of the species within `depth_ranges` and `temperature_ranges` and overlapping the `depth`
+            and `temperature` habitats, restricted to the species that may belong to a sustainable chain.
+            Selections are cached, so solving again with the same filters skips every setup step.
+        """
+        key = (None if depth_ranges is None else frozenset(depth_ranges),
+               None if temperature_ranges is None else frozenset(temperature_ranges),
+               None if depth is None else tuple(depth),
+               None if temperature is None else tuple(temperature))
+        selection = self._selections.get(key)
+        if selection is None:
+            candidates = self._candidates(*key)
+            selection = {}
+            for group_key, group in self.groups.items():
+                if candidates is not None:
+                    group = group.subset([i for i in range(len(group)) if (group_key, i) in candidates])
+                    if not len(group):
+                        continue
+                selection[group_key] = group.subset(group.feasible_positions())
+            self._selections[key] = selection
+        return selection
+
+    @property
+    def positions(self) -> Dict[Union[str, int], Tuple[CompiledGroup, int]]:
+        """
+            The group of each species of the game and its position in it, by name and by id of the name.
+        """
+        if self._positions is None:
+            positions = {}
+            for group in self.groups.values():
+                for i, (name_id, name) in enumerate(zip(group.name_ids, group.names)):
+                    positions[name_id] = positions[name] = group, i
+            self._positions = positions
+        return self._positions
+
+    def _candidates(self, depth_ranges, temperature_ranges, depth, temperature) -> Optional[Set[Tuple[Hashable, int]]]:
+        """
+            The (group key, position) of the species passing the filters, None when there are no filters.
+        """
+        filters = []
+        if depth_ranges is not None or temperature_ranges is not None:
+            filters.append({(group_key, i) for group_key, group in self.groups.items() for i in range(len(group))
+                            if (depth_ranges is None or group.depth_ranges[i] in depth_ranges)
+                            and (temperature_ranges is None or group.temperature_ranges[i] in temperature_ranges)})
+        if depth is not None:
+            filters.append(set(self._index('depth_ranges').overlapping(*depth)))
+        if temperature is not None:
+            filters.append(set(self._index('temperature_ranges').overlapping(*temperature)))
+        return set.intersection(*filters) if filters else None
+
+    def _index(self, attribute: str) -> IntervalIndex:
+        """
+            Index of the species by their parsed depth or temperature range, built on first use.
+        """
+        if attribute not in self._indexes:
+            self._indexes[attribute] = IntervalIndex([
+                (parse_range(r), (group_key, i))
+                for group_key, group in self.groups.items() for i, r in enumerate(getattr(group, attribute))])
+        return self._indexes[attribute]
+
+
+def compile_groups(species: List[Species], registry: NameRegistry = DEFAULT_NAME_REGISTRY,
+                   group_by: GroupBy = 'depth_range', food_web: Optional[FoodWeb] = None) -> Dict[Hashable, CompiledGroup]:
+    """
+        Group species, by default by depth range, in ascending order of key, and compile the tables of each group.
+        The food sources of each species are taken from the `food_web` of the species, built when not given,
+        keeping those of its own group only, as a species can only eat species of its own chain.
+
+        `group_by` is either the name of an attribute of `GROUPING_ATTRIBUTES`, a tuple of them,
+        or a function returning the key of the group of a species. Keys that cannot be ordered are kept
+        in order of first appearance.
+    """
+    key_function = grouping_key(group_by)
+    food_web = food_web if food_web is not None else FoodWeb(species)
+    name_ids = registry.ids(s.name for s in species)
+    members = {}
+    for i, s in enumerate(species):
+        members.setdefault(key_function(s), []).append(i)
+    try:
+        keys = sorted(members)
+    except TypeError:
+        keys = list(members)
+
+    groups = {}
+    for key in keys:
+        indices = sorted(members[key], key=lambda i: species[i].calories_provided, reverse=True)
+        positions = {i: position for position, i in enumerate(indices)}
+
+        food_masks = []
+        for i in indices:
+            mask = 0
+            for prey in food_web.prey_of_index(i):
+                position = positions.get(prey)
+                if position is not None:
+                    mask |= 1 << position
+            food_masks.append(mask)
+
+        groups[key] = CompiledGroup(key,
+                                    [name_ids[i] for i in indices],
+                                    [int(species[i].calories_provided) for i in indices],
+                                    [int(species[i].calories_needed) for i in indices],
+                                    food_masks,
+                                    registry,
+                                    [species[i].temperature_range for i in indices],
+                                    [species[i].depth_range for i in indices])
+    return groups
+
+
+def _bits(mask: int) -> Iterator[int]:
+    # the set bits of a mask, lowest first
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def grouping_key(group_by: GroupBy) -> Callable[[Species], Hashable]:
+    if callable(group_by):
+        return group_by
+    attributes = (group_by,) if isinstance(group_by, str) else tuple(group_by)
+    unknown_attributes = [a for a in attributes if a not in GROUPING_ATTRIBUTES]
+    if not attributes or unknown_attributes:
+        raise ValueError(f'Invalid grouping {group_by!r}, expected a function or attributes among {GROUPING_ATTRIBUTES}')
+    return attrgetter(*attributes)
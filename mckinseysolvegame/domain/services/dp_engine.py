@@ -0,0 +1,190 @@
+"""
+    Search engine simulating the eating while the chain is being chosen, species by species in eating order.
+
+    The combinations of a group are walked depth-first in `itertools.combinations` order, cutting the branches
+    `Solver._combinations` cuts. Once every position
+    up to a food source has been decided, whether a species eats it or not is known, so the eating of the species
+    chosen is simulated as soon as all of their food sources have been decided, and a branch is cut as soon as one
+    of them cannot eat. The state carried along a branch is the calories left of the species chosen.
+
+    Whether a branch can be completed into a sustainable chain only depends on a compressed state: the next
+    position to decide, the number of species left to choose, whether the chain has a producer (and the required
+    species), the species chosen that have not eaten yet, and the calories left of the species chosen that these
+    or the species still to decide may eat. The other species chosen already ate and can no longer be eaten.
+    The states of the branches that failed are memoized, in a table bounded by least recently used eviction, so
+    that the branches reaching them again, through other choices of the species earlier in the chain, are cut.
+"""
+from collections import OrderedDict, namedtuple
+from typing import Dict, Optional, Tuple
+
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+from mckinseysolvegame.domain.services.instrumentation import GroupStats
+from mckinseysolvegame.domain.services.progress import SearchMonitor
+
+DEFAULT_MEMO_SIZE = 65536
+
+FoodCalories = Tuple[Tuple[int, int], ...]
+
+MemoInfo = namedtuple('MemoInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def eat(need: int, foods: FoodCalories) -> Optional[FoodCalories]:
+    """
+        Eating step of a species needing `need` calories, given the (position, calories left) of its food sources
+        within the chain in ascending order of position. Returns the (position, calories left) of the food sources
+        eaten once it has eaten, or None when it cannot eat.
+    """
+    if not foods:
+        return None
+    ranked = sorted(foods, key=lambda food: food[1], reverse=True)
+    first, first_calories = ranked[0]
+    if len(ranked) > 1:
+        second, second_calories = ranked[1]
+        if second_calories == first_calories and 2 * first_calories >= need:
+            half = need // 2
+            return (first, first_calories - half), (second, second_calories - half)
+    if first_calories > need:
+        return ((first, first_calories - need),)
+    return None
+
+
+class DynamicProgrammingSearch:
+    """
+        Search of the sustainable chains of a group, simulating the eating along the enumeration (see above).
+        The memo of the failed states is kept between searches of different lengths of the same group.
+    """
+    def __init__(self, group: CompiledGroup, memo_size: int = DEFAULT_MEMO_SIZE):
+        self.group = group
+        self.memo_size = memo_size
+        self._failed: 'OrderedDict[tuple, None]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        # the species eating each species
+        self._predator_masks = [sum(1 << s for s, mask in enumerate(group.food_masks) if mask >> f & 1)
+                                for f in range(len(group))]
+
+    def memo_info(self) -> MemoInfo:
+        return MemoInfo(self._hits, self._misses, self.memo_size, len(self._failed))
+
+    def find(self, length: int, required: Optional[int] = None,
+             stats: Optional[GroupStats] = None,
+             monitor: Optional[SearchMonitor] = None) -> Optional[Tuple[int, ...]]:
+        """
+            Return the first sustainable combination of `length` species in `itertools.combinations` order,
+            containing the species at position `required` when given, or None when there is none or the search
+            is cancelled through `monitor`.
+        """
+        group = self.group
+        size = len(group)
+        if not 0 < length <= size:
+            return None
+        all_positions = (1 << size) - 1
+        producer_mask = group.producer_mask
+        calories_provided = group.calories_provided
+        calories_needed = group.calories_needed
+        food_masks = group.food_masks
+        half_food_masks = group.half_food_masks
+        may_feed = group.may_feed
+        predator_masks = self._predator_masks
+        failed = self._failed
+        memo_size = self.memo_size
+        completions = group.completions
+
+        def simulate(members: Tuple[int, ...], chain_mask: int, eaten: int, calories: Dict[int, int],
+                     decided: int) -> Optional[int]:
+            """
+                Simulate the eating of the members not having eaten yet whose food sources are all below `decided`,
+                in order, updating `calories`. Returns the number of members having eaten, or None on failure.
+            """
+            while eaten < len(members):
+                s = members[eaten]
+                if food_masks[s] >> decided:
+                    break
+                need = calories_needed[s]
+                if need:
+                    foods = food_masks[s] & chain_mask
+                    result = eat(need, tuple((f, calories[f]) for f in members if foods >> f & 1))
+                    if result is None:
+                        return None
+                    for f, c in result:
+                        if c <= 0:
+                            return None
+                        calories[f] = c
+                eaten += 1
+            return eaten
+
+        def extend(start: int, members: Tuple[int, ...], chain_mask: int, eaten: int, calories: Dict[int, int]):
+            remaining = length - len(members)
+            pending = members[eaten:]
+            pending_mask = sum(1 << c for c in pending)
+            state = (start, remaining, required, bool(producer_mask & chain_mask),
+                     required is not None and bool(chain_mask >> required & 1), pending,
+                     tuple((f, calories[f]) for f in members
+                           if predator_masks[f] >> start or predator_masks[f] & pending_mask))
+            if state in failed:
+                failed.move_to_end(state)
+                self._hits += 1
+                if stats is not None:
+                    stats.combinations_pruned += completions(start, remaining, pending_required(chain_mask))
+                return None
+            self._misses += 1
+            chain = search(start, members, chain_mask, eaten, calories, remaining)
+            if chain is None and memo_size and not (monitor is not None and monitor.cancelled):
+                failed[state] = None
+                if len(failed) > memo_size:
+                    failed.popitem(last=False)
+            return chain
+
+        def pending_required(chain_mask: int) -> Optional[int]:
+            # the species required, while it is still to choose
+            return required if required is not None and not chain_mask >> required & 1 else None
+
+        def search(start: int, members: Tuple[int, ...], chain_mask: int, eaten: int, calories: Dict[int, int],
+                   remaining: int):
+            pending = pending_required(chain_mask)
+            for i in range(start, size - remaining + 1):
+                if pending is not None:
+                    if i > pending:
+                        return None
+                    if remaining == 1 and i < pending:
+                        continue
+                available = chain_mask | (all_positions >> i << i)
+                # the branch is over once no producer is left, or once the species skipped was the last able
+                # to feed a species chosen that has not eaten yet
+                if not producer_mask & available or i > start and any(
+                        half_food_masks[c] & 1 << (i - 1) and not may_feed(c, available) for c in members[eaten:]):
+                    if stats is not None:
+                        stats.combinations_pruned += completions(i, remaining, pending)
+                    return None
+                # a species providing no calories makes any chain unsustainable, whatever the state
+                if calories_provided[i] <= 0 or not may_feed(i, available):
+                    if stats is not None:
+                        stats.combinations_pruned += completions(i + 1, remaining - 1, None if pending == i else pending)
+                    continue
+
+                child_members = members + (i,)
+                child_mask = chain_mask | 1 << i
+                child_calories = dict(calories)
+                child_calories[i] = calories_provided[i]
+                # once the chain is complete, every position is decided
+                decided = size if remaining == 1 else i + 1
+                child_eaten = simulate(child_members, child_mask, eaten, child_calories, decided)
+                if remaining == 1:
+                    if stats is not None:
+                        stats.combinations_generated += 1
+                        stats.combinations_simulated += 1
+                    if monitor is not None and monitor.tick():
+                        return None
+                    if child_eaten is not None and producer_mask & child_mask and min(child_calories.values()) > 0:
+                        return child_members
+                    continue
+                if child_eaten is None:
+                    if stats is not None:
+                        stats.combinations_pruned += completions(i + 1, remaining - 1, None if pending == i else pending)
+                    continue
+                chain = extend(i + 1, child_members, child_mask, child_eaten, child_calories)
+                if chain is not None or (monitor is not None and monitor.cancelled):
+                    return chain
+            return None
+
+        return extend(0, (), 0, 0, {})
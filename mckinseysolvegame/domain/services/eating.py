@@ -0,0 +1,165 @@
+"""
+    Eating rules of the game on species indices, the hot path of the solver.
+
+    A chain is a sequence of indices into the arrays of a group, sorted in ascending order: the group being sorted
+    by calories provided in descending order, the species of a chain eat in that order. `food_masks[i]` is the
+    bitmask of the indices of the food sources of species `i`. The rules are those of `Solver._simulate_eating`:
+        - a species needing calories eats its food source of the chain providing the most calories at that time,
+        - if its two best food sources are tied and each provides at least half of its needs,
+          it eats half of its needs from each of them,
+        - otherwise it eats its best food source, provided that it provides strictly more than it needs.
+    A chain is sustainable when it has a producer and every species has eaten and still provides calories.
+"""
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from mckinseysolvegame.domain.services.eating_trace import EatingTrace
+
+NO_FOOD_SOURCE = 'no food source'
+NOT_ENOUGH_CALORIES = 'not enough calories'
+NO_CALORIES_LEFT = 'no calories left'
+NO_PRODUCER = 'no producer'
+
+# events of an `EatingTrace`
+ATE, SPLIT, NO_FOOD, NOT_ENOUGH, EXHAUSTED = range(5)
+
+
+def is_sustainable(chain: Sequence[int],
+                   calories_provided: Sequence[int],
+                   calories_needed: Sequence[int],
+                   food_masks: Sequence[int]) -> bool:
+    calories = {i: calories_provided[i] for i in chain}
+    has_producer = False
+    for s in chain:
+        need = calories_needed[s]
+        if need == 0:
+            has_producer = True
+            continue
+
+        mask = food_masks[s]
+        foods = [f for f in chain if mask >> f & 1]
+        if not foods:
+            return False
+        if len(foods) > 1:
+            foods.sort(key=calories.__getitem__, reverse=True)
+            first, second = foods[0], foods[1]
+            if calories[second] == calories[first] and 2 * calories[first] >= need:
+                half = need // 2
+                calories[first] -= half
+                calories[second] -= half
+                continue
+
+        first = foods[0]
+        if calories[first] > need:
+            calories[first] -= need
+        else:
+            return False
+
+    return has_producer and all(c > 0 for c in calories.values())
+
+
+def simulate_eating(chain: Sequence[int],
+                    calories_provided: Sequence[int],
+                    calories_needed: Sequence[int],
+                    food_masks: Sequence[int],
+                    trace: Optional['EatingTrace'] = None
+                    ) -> Tuple[Dict[int, int], Dict[int, int], Dict[int, Tuple[int, ...]]]:
+    """
+        Simulate the eating of a chain whether it is sustainable or not, recording its steps in `trace` when given.
+
+        Returns:
+            The calories provided and needed by each species of the chain once everyone has eaten,
+            and the food sources eaten by each species that ate.
+    """
+    calories = {i: calories_provided[i] for i in chain}
+    needs = {i: calories_needed[i] for i in chain}
+    eats = {}
+    for s in chain:
+        need = needs[s]
+        if need == 0:
+            continue
+
+        mask = food_masks[s]
+        foods: List[int] = sorted((f for f in chain if mask >> f & 1), key=calories.__getitem__, reverse=True)
+        if len(foods) > 1:
+            first, second = foods[0], foods[1]
+            if calories[second] == calories[first] and 2 * calories[first] >= need:
+                half = need // 2
+                if trace is not None:
+                    trace.record(SPLIT, s, need, first, calories[first], calories[first] - half,
+                                 second, calories[second], calories[second] - half)
+                calories[first] -= half
+                calories[second] -= half
+                needs[s] = 0
+                eats[s] = (first, second)
+                continue
+
+        if foods and calories[foods[0]] > need:
+            if trace is not None:
+                trace.record(ATE, s, need, foods[0], calories[foods[0]], calories[foods[0]] - need)
+            calories[foods[0]] -= need
+            needs[s] = 0
+            eats[s] = (foods[0],)
+        elif trace is not None:
+            if foods:
+                trace.record(NOT_ENOUGH, s, need, foods[0], calories[foods[0]], calories[foods[0]])
+            else:
+                trace.record(NO_FOOD, s, need)
+
+    if trace is not None:
+        for i in chain:
+            if calories[i] <= 0:
+                trace.record(EXHAUSTED, i, needs[i])
+    return calories, needs, eats
+
+
+def diagnose_eating(chain: Sequence[int],
+                    calories_provided: Sequence[int],
+                    calories_needed: Sequence[int],
+                    food_masks: Sequence[int]) -> Tuple[Dict[int, int], Optional[int], Optional[str]]:
+    """
+        Simulate the eating of a chain and tell why it is not sustainable.
+
+        Returns:
+            The calories provided by each species of the chain once everyone has eaten, and, unless the chain is
+            sustainable, the species that failed (None when the chain has no producer) and the reason why:
+            the first species that could not eat (`NO_FOOD_SOURCE`, `NOT_ENOUGH_CALORIES`), otherwise the first
+            species eaten down to no calories (`NO_CALORIES_LEFT`), otherwise `NO_PRODUCER`.
+    """
+    calories = {i: calories_provided[i] for i in chain}
+    failing = reason = None
+    has_producer = False
+    for s in chain:
+        need = calories_needed[s]
+        if need == 0:
+            has_producer = True
+            continue
+
+        mask = food_masks[s]
+        foods = [f for f in chain if mask >> f & 1]
+        if not foods:
+            if reason is None:
+                failing, reason = s, NO_FOOD_SOURCE
+            continue
+        if len(foods) > 1:
+            foods.sort(key=calories.__getitem__, reverse=True)
+            first, second = foods[0], foods[1]
+            if calories[second] == calories[first] and 2 * calories[first] >= need:
+                half = need // 2
+                calories[first] -= half
+                calories[second] -= half
+                continue
+
+        first = foods[0]
+        if calories[first] > need:
+            calories[first] -= need
+        elif reason is None:
+            failing, reason = s, NOT_ENOUGH_CALORIES
+
+    if reason is None:
+        for i in chain:
+            if calories[i] <= 0:
+                return calories, i, NO_CALORIES_LEFT
+        if not has_producer:
+            reason = NO_PRODUCER
+    return calories, failing, reason
@@ -0,0 +1,79 @@
+"""
+    Kernel simulating the eating of many chains on integer arrays, compiled with Numba when it is installed
+    (`pip install mckinseysolvegame[numba]`) and run as plain Python otherwise, with the same results.
+
+    The compiled kernel is cached on disk next to this module, so the compilation is only paid by the first
+    process to use it; `warm_up` loads or compiles it ahead of the first search, e.g. when a worker starts.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _evaluate(calories_provided, calories_needed, adjacency, chains):
+    """
+        Simulate the eating of every row of `chains`, given the calories provided and needed by each species
+        of a group and their feeding adjacency matrix (see `batch_eating.adjacency_matrix`).
+
+        Returns:
+            The boolean mask of the sustainable chains and the calories provided by their species once every
+            species has eaten.
+    """
+    rows, length = chains.shape
+    sustainable = np.zeros(rows, dtype=np.bool_)
+    calories = np.empty((rows, length), dtype=np.int64)
+    for b in range(rows):
+        for k in range(length):
+            calories[b, k] = calories_provided[chains[b, k]]
+        has_producer = False
+        fed = True
+        for k in range(length):
+            s = chains[b, k]
+            need = calories_needed[s]
+            if need == 0:
+                has_producer = True
+                continue
+            # the two best food sources, the first in the chain on ties
+            first = -1
+            second = -1
+            for j in range(length):
+                if adjacency[s, chains[b, j]]:
+                    if first == -1 or calories[b, j] > calories[b, first]:
+                        second = first
+                        first = j
+                    elif second == -1 or calories[b, j] > calories[b, second]:
+                        second = j
+            if first == -1:
+                fed = False
+                continue
+            best = calories[b, first]
+            if second != -1 and calories[b, second] == best and 2 * best >= need:
+                calories[b, first] -= need // 2
+                calories[b, second] -= need // 2
+            elif best > need:
+                calories[b, first] -= need
+            else:
+                fed = False
+        if has_producer and fed:
+            sustainable[b] = True
+            for k in range(length):
+                if calories[b, k] <= 0:
+                    sustainable[b] = False
+    return sustainable, calories
+
+
+ACCELERATED = njit is not None
+
+evaluate = njit(cache=True, nogil=True)(_evaluate) if ACCELERATED else _evaluate
+
+
+def warm_up() -> None:
+    """
+        Load the compiled kernel from the disk cache, compiling it if needed. Does nothing without Numba.
+    """
+    if ACCELERATED:
+        evaluate(np.zeros(2, dtype=np.int64), np.zeros(2, dtype=np.int64), np.zeros((2, 2), dtype=np.bool_),
+                 np.zeros((1, 2), dtype=np.intp))
@@ -0,0 +1,81 @@
+"""
+    Structured trace of the eating of a chain, recorded by `eating.simulate_eating` when given one.
+
+    Each step is a fixed-size record of integers in a buffer allocated once and reused: the event, the species,
+    the calories it needed, and up to two food sources with their calories before and after the step. Nothing is
+    recorded, nor allocated, when no trace is given.
+"""
+import json
+from array import array
+from typing import List, Optional
+
+from mckinseysolvegame.domain.services.eating import NO_CALORIES_LEFT, NO_FOOD_SOURCE, NOT_ENOUGH_CALORIES
+
+# by event of `eating`
+EVENTS = ('ate', 'split', NO_FOOD_SOURCE, NOT_ENOUGH_CALORIES, NO_CALORIES_LEFT)
+
+FIELDS = 9
+NO_SPECIES = -1
+DEFAULT_CAPACITY = 8
+
+
+class EatingTrace:
+    """
+        Buffer of the eating steps of the last chain simulated with it, growing when a chain has more steps than
+        `capacity`.
+
+        Events:
+            - 'ate': the species ate its best food source,
+            - 'split': the species ate half of its needs from each of its two tied best food sources,
+            - `eating.NO_FOOD_SOURCE`, `eating.NOT_ENOUGH_CALORIES`: the species could not eat,
+              its best food source, if any, being left as it was,
+            - `eating.NO_CALORIES_LEFT`: the species provided no calories once everyone had eaten.
+
+        Attributes:
+            names (Optional[List[str]]): The names of the species of the group by position, to export the steps
+                with names rather than positions.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f'capacity must be a positive integer, got {capacity}')
+        self._records = array('q', bytes(8 * FIELDS * capacity))
+        self._count = 0
+        self.names: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self, names: Optional[List[str]] = None) -> None:
+        self._count = 0
+        self.names = names
+
+    def record(self, event: int, species: int, need: int,
+               food: int = NO_SPECIES, food_before: int = 0, food_after: int = 0,
+               other_food: int = NO_SPECIES, other_before: int = 0, other_after: int = 0) -> None:
+        records = self._records
+        offset = self._count * FIELDS
+        if offset == len(records):
+            records.frombytes(bytes(8 * len(records)))
+        records[offset] = event
+        records[offset + 1] = species
+        records[offset + 2] = need
+        records[offset + 3] = food
+        records[offset + 4] = food_before
+        records[offset + 5] = food_after
+        records[offset + 6] = other_food
+        records[offset + 7] = other_before
+        records[offset + 8] = other_after
+        self._count += 1
+
+    def to_json(self, format_type: str = "dict"):
+        if format_type not in ("dict", "str"):
+            raise NotImplementedError(f"Invalid format type \'{format_type}\' during serialization")
+        name = self.names.__getitem__ if self.names is not None else (lambda position: position)
+        records = self._records
+        steps = []
+        for offset in range(0, self._count * FIELDS, FIELDS):
+            event, species, need = records[offset:offset + 3]
+            foods = [{'species': name(records[i]), 'caloriesBefore': records[i + 1], 'caloriesAfter': records[i + 2]}
+                     for i in (offset + 3, offset + 6) if records[i] != NO_SPECIES]
+            steps.append({'event': EVENTS[event], 'species': name(species), 'caloriesNeeded': need, 'foods': foods})
+        return steps if format_type == "dict" else json.dumps(steps)
@@ -0,0 +1,65 @@
+"""
+    Beam search building a sustainable chain of a group in a few milliseconds, without any guarantee that it is
+    the longest one.
+
+    The search starts from the producers and grows chains one species at a time: every chain of the beam is
+    extended by each species that may still be fed within it, the extensions that are not sustainable are
+    dropped, and the `beam_width` extensions leaving the most calories once every species has eaten, i.e. the
+    ones most able to feed another predator, make the next beam.
+"""
+from typing import List, Optional, Tuple
+
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+from mckinseysolvegame.domain.services.eating import simulate_eating
+from mckinseysolvegame.domain.services.instrumentation import GroupStats
+
+DEFAULT_BEAM_WIDTH = 8
+
+
+def beam_search(group: CompiledGroup, max_length: int,
+                beam_width: int = DEFAULT_BEAM_WIDTH,
+                required: Optional[int] = None,
+                stats: Optional[GroupStats] = None) -> List[int]:
+    """
+        Return a sustainable chain of at most `max_length` species of `group`, containing the species at position
+        `required` when given, the longest of the chains met during the search. Among several chains of that
+        length, the first in `itertools.combinations` order is returned; an empty chain when none was met.
+    """
+    if beam_width < 1:
+        raise ValueError(f'beam_width must be a positive integer, got {beam_width}')
+    calories_provided = group.calories_provided
+    calories_needed = group.calories_needed
+    food_masks = group.food_masks
+    may_feed = group.may_feed
+
+    beam: List[Tuple[int, ...]] = [(i,) for i in range(len(group)) if calories_needed[i] == 0]
+    best: List[int] = []
+    length = 1
+    while beam:
+        eligible = [chain for chain in beam if required is None or required in chain]
+        if eligible:
+            best = list(min(eligible))
+        if length >= max_length:
+            break
+
+        scored = {}
+        for chain in beam:
+            chain_mask = sum(1 << i for i in chain)
+            for i in range(len(group)):
+                if chain_mask >> i & 1 or not may_feed(i, chain_mask | 1 << i):
+                    continue
+                extension = tuple(sorted((*chain, i)))
+                if extension in scored:
+                    continue
+                calories, needs, _ = simulate_eating(extension, calories_provided, calories_needed, food_masks)
+                if stats is not None:
+                    stats.combinations_generated += 1
+                    stats.combinations_simulated += 1
+                if any(needs.values()) or min(calories.values()) <= 0:
+                    scored[extension] = None
+                    continue
+                scored[extension] = sum(calories.values())
+        beam = sorted((chain for chain, score in scored.items() if score is not None),
+                      key=lambda chain: (-scored[chain], chain))[:beam_width]
+        length += 1
+    return best
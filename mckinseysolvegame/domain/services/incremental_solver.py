@@ -0,0 +1,150 @@
+import copy
+from typing import Dict, List, Optional
+
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+from mckinseysolvegame.domain.services.optimization_service import MAXIMUM_FOOD_CHAIN_LENGTH, Solver
+
+
+class IncrementalSolver:
+    """
+        Stateful solving session that re-solves only the depth ranges touched by a change.
+
+        A chain never depends on species outside of it, so a change to one species can only affect the chains
+        containing it, i.e. the chains of its own depth range. The session keeps, per depth range, the compiled
+        species and the longest chain found, and uses the length of that chain as a bound when it is re-solved:
+            - a chain longer than the previous one must contain the changed species, so the longer lengths are
+              only searched among the combinations containing it,
+            - the previous chain still holds when the changed species is not part of it, so shorter lengths are
+              never searched,
+            - removing a species that is not in the previous chain leaves the result unchanged.
+
+        Every result is identical to `Solver.find_sustainable_food_chain` on the current species.
+        Species names must be unique within the session.
+    """
+    def __init__(self, species: List[Species], solver: Optional[Solver] = None):
+        self._solver = solver or Solver()
+        self._species = []
+        self._groups: Dict[str, CompiledGroup] = {}
+        self._chains: Dict[str, List[int]] = {}
+        self._eating_steps: Dict[str, dict] = {}
+        for s in species:
+            self._check_name_is_available(s.name)
+            self._species.append(copy.deepcopy(s))
+        for depth_range in {s.depth_range for s in self._species}:
+            self._resolve_group(depth_range)
+            self._solve_group(depth_range)
+
+    @property
+    def species(self) -> List[Species]:
+        return copy.deepcopy(self._species)
+
+    def solve(self) -> dict:
+        """
+            Return the longest sustainable food chain of the current species, as `find_sustainable_food_chain` would.
+        """
+        if not self._eating_steps:
+            return {}
+        return max((self._eating_steps[depth_range] for depth_range in sorted(self._eating_steps)), key=len)
+
+    def add_species(self, species: Species) -> dict:
+        self._check_name_is_available(species.name)
+        self._species.append(copy.deepcopy(species))
+        self._add_to_group(species.name, species.depth_range)
+        return self.solve()
+
+    def remove_species(self, name: str) -> dict:
+        species = self._species.pop(self._index(name))
+        self._remove_from_group(name, species.depth_range)
+        return self.solve()
+
+    def update_species(self, name: str, /, **changes) -> dict:
+        """
+            Change some attributes of a species, e.g. `update_species('Shrimp', calories_needed=1200)`.
+        """
+        index = self._index(name)
+        previous = self._species[index]
+        attributes = {
+            'name': previous.name,
+            'calories_provided': previous.calories_provided,
+            'calories_needed': previous.calories_needed,
+            'depth_range': previous.depth_range,
+            'temperature_range': previous.temperature_range,
+            'food_sources': previous.food_sources
+        }
+        unknown_attributes = set(changes) - set(attributes)
+        if unknown_attributes:
+            raise TypeError(f'Unknown species attributes {sorted(unknown_attributes)}')
+        attributes.update(copy.deepcopy(changes))
+        if attributes['name'] != name:
+            self._check_name_is_available(attributes['name'])
+        self._species[index] = Species(**attributes)
+
+        if attributes['depth_range'] != previous.depth_range:
+            self._remove_from_group(name, previous.depth_range)
+            self._add_to_group(attributes['name'], attributes['depth_range'])
+            return self.solve()
+
+        depth_range = previous.depth_range
+        self._resolve_group(depth_range)
+        self._solve_group(depth_range,
+                          bound=len(self._chains[depth_range]),
+                          required=self._find_in_group(attributes['name'], depth_range))
+        return self.solve()
+
+    def _add_to_group(self, name: str, depth_range: str) -> None:
+        if depth_range not in self._chains:
+            self._resolve_group(depth_range)
+            self._solve_group(depth_range)
+            return
+
+        self._resolve_group(depth_range)
+        self._solve_group(depth_range,
+                          bound=len(self._chains[depth_range]),
+                          required=self._find_in_group(name, depth_range))
+
+    def _remove_from_group(self, name: str, depth_range: str) -> None:
+        group_names = self._groups[depth_range].names
+        names = [group_names[i] for i in self._chains[depth_range]]
+        self._resolve_group(depth_range)
+        group = self._groups[depth_range]
+        if not len(group):
+            del self._groups[depth_range], self._chains[depth_range], self._eating_steps[depth_range]
+        elif name in names:
+            self._solve_group(depth_range, bound=len(names))
+        else:
+            # the chain is unchanged but the positions of its species in the recompiled group have shifted
+            self._chains[depth_range] = sorted(group.index(n) for n in names)
+
+    def _resolve_group(self, depth_range: str) -> None:
+        species = [s for s in self._species if s.depth_range == depth_range]
+        self._groups[depth_range] = self._solver._compile_groups(species).get(
+            depth_range, CompiledGroup(depth_range, [], [], [], [], self._solver.name_registry))
+
+    def _solve_group(self, depth_range: str, bound: Optional[int] = None, required: Optional[int] = None) -> None:
+        """
+            Solve a depth range knowing that every chain not containing `required` has at most `bound` species.
+            When the previous chain is still sustainable, the search of the lengths up to `bound` stops at `bound`.
+        """
+        group = self._groups[depth_range]
+        chain = []
+        if required is not None:
+            chain = self._solver._find_longest_chain(group, min_length=bound + 1, required=required)
+        if not chain:
+            max_length = MAXIMUM_FOOD_CHAIN_LENGTH if bound is None else bound
+            chain = self._solver._find_longest_chain(group, max_length=max_length)
+        self._chains[depth_range] = chain
+        self._eating_steps[depth_range] = group.eating_steps(chain)
+
+    def _find_in_group(self, name: str, depth_range: str) -> int:
+        return self._groups[depth_range].index(name)
+
+    def _index(self, name: str) -> int:
+        for i, s in enumerate(self._species):
+            if s.name == name:
+                return i
+        raise KeyError(f'Unknown species \'{name}\'')
+
+    def _check_name_is_available(self, name: str) -> None:
+        if any(s.name == name for s in self._species):
+            raise ValueError(f'A species named \'{name}\' already exists')
@@ -0,0 +1,121 @@
+import json
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Dict, Hashable, Optional
+
+STAGES = ['ingest', 'populate', 'search', 'simulate']
+
+
+class GroupStats:
+    """
+        Counters of the search of one group of species, by default a depth range.
+
+        Attributes:
+            combinations_generated (int): The combinations enumerated by the search.
+            combinations_pruned (int): The combinations discarded without simulating the eating, either because
+                they have no producer or because a bound proved they could not improve the result.
+            combinations_simulated (int): The combinations whose eating was simulated.
+            search_time (float): The seconds spent searching the depth range, simulations included.
+            simulate_time (float): The seconds spent simulating the eating.
+            chain_length (int): The length of the best chain found.
+    """
+    def __init__(self):
+        self.combinations_generated = 0
+        self.combinations_pruned = 0
+        self.combinations_simulated = 0
+        self.search_time = 0.0
+        self.simulate_time = 0.0
+        self.chain_length = 0
+
+    def merge(self, other: 'GroupStats') -> None:
+        """
+            Add the counters of another search of the same group, e.g. of a part of it searched by another process.
+        """
+        self.combinations_generated += other.combinations_generated
+        self.combinations_pruned += other.combinations_pruned
+        self.combinations_simulated += other.combinations_simulated
+        self.search_time += other.search_time
+        self.simulate_time += other.simulate_time
+        self.chain_length = max(self.chain_length, other.chain_length)
+
+    def to_json(self, format_type: str = "dict"):
+        return _format(dict(self.__dict__), format_type)
+
+
+class SolveStats:
+    """
+        Statistics of a solve, filled in by the solver when passed to it.
+
+        Attributes:
+            stage_times (Dict[str, float]): The seconds spent in each stage: 'ingest' (reading a DataFrame),
+                'populate' (copying, resolving the food sources and grouping), 'search' and 'simulate',
+                the latter being part of the search.
+            groups (Dict[Hashable, GroupStats]): The counters of the search of each group, keyed as the groups.
+    """
+    def __init__(self):
+        self.stage_times = {stage: 0.0 for stage in STAGES}
+        self.groups: Dict[Hashable, GroupStats] = {}
+
+    @property
+    def combinations_generated(self) -> int:
+        return sum(g.combinations_generated for g in self.groups.values())
+
+    @property
+    def combinations_pruned(self) -> int:
+        return sum(g.combinations_pruned for g in self.groups.values())
+
+    @property
+    def combinations_simulated(self) -> int:
+        return sum(g.combinations_simulated for g in self.groups.values())
+
+    @property
+    def total_time(self) -> float:
+        return self.stage_times['ingest'] + self.stage_times['populate'] + self.stage_times['search']
+
+    def group(self, key: Hashable) -> GroupStats:
+        if key not in self.groups:
+            self.groups[key] = GroupStats()
+        return self.groups[key]
+
+    @contextmanager
+    def stage(self, stage: str, group: Optional[GroupStats] = None):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            self.stage_times[stage] += elapsed
+            if group is not None and stage == 'search':
+                group.search_time += elapsed
+
+    def to_json(self, format_type: str = "dict"):
+        data = {
+            'combinations_generated': self.combinations_generated,
+            'combinations_pruned': self.combinations_pruned,
+            'combinations_simulated': self.combinations_simulated,
+            'total_time': self.total_time,
+            'stage_times': dict(self.stage_times),
+            'groups': {_label(key): g.to_json() for key, g in self.groups.items()}
+        }
+        return _format(data, format_type)
+
+
+def stage(stats: Optional[SolveStats], name: str, group: Optional[GroupStats] = None):
+    """
+        Time a stage of a solve, doing nothing when statistics are not collected.
+    """
+    return nullcontext() if stats is None else stats.stage(name, group)
+
+
+def _label(key) -> str:
+    # groups keyed by several attributes, e.g. depth and temperature ranges, have tuple keys
+    return ' / '.join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+def _format(data: dict, format_type: str):
+    if format_type == "dict":
+        return data
+    elif format_type == "str":
+        return json.dumps(data)
+    else:
+        raise NotImplementedError(f"Invalid format type \'{format_type}\' during serialization")
@@ -1,17 +1,81 @@
-import copy
-from itertools import combinations, groupby
-from typing import List
+import heapq
+import multiprocessing
+from itertools import count, takewhile
+from math import comb
+from time import perf_counter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import pandas as pd
 
-from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.food_web import FoodWeb
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.domain.name_registry import DEFAULT_NAME_REGISTRY, NameRegistry
+from mckinseysolvegame.domain.services import work_stealing
+from mckinseysolvegame.domain.services.batch_eating import DEFAULT_BATCH_SIZE, adjacency_matrix, batches, evaluate_chains
+from mckinseysolvegame.domain.services.dp_engine import DEFAULT_MEMO_SIZE, DynamicProgrammingSearch
+from mckinseysolvegame.domain.services.eating_kernel import warm_up
+from mckinseysolvegame.domain.services.eating_trace import EatingTrace
+from mckinseysolvegame.domain.services.heuristic import DEFAULT_BEAM_WIDTH, beam_search
+from mckinseysolvegame.domain.services.compiled_game import CompiledGame, CompiledGroup, GroupBy, compile_groups
+from mckinseysolvegame.domain.services.instrumentation import GroupStats, SolveStats, stage
+from mckinseysolvegame.domain.services.progress import CancellationToken, ProgressEvent, SearchMonitor
+from mckinseysolvegame.domain.services.shared_game import SharedGameTable, attached_table
+
+MAXIMUM_FOOD_CHAIN_LENGTH = 8
+EXACT_ENGINES = ('combinations', 'dp', 'batch')
+ENGINES = EXACT_ENGINES + ('greedy',)
+# groups having fewer combinations are searched faster than the beam search would run on them
+INCUMBENT_SEARCH_SPACE = 1 << 16
+
+
+def leftover_calories(eating_steps: dict) -> int:
+    """
+        Secondary score of a sustainable chain: the total calories provided left once every species has eaten.
+        The higher it is, the more robust the ecosystem.
+    """
+    return sum(s['calories_provided'] for s in eating_steps.values())
 
 
 class Solver:
-    def __init__(self):
-        pass
+    """
+        Solver of the game.
+
+        Attributes:
+            stats_hook (Optional[Callable[[SolveStats], None]]): Called with the statistics of every solve,
+                e.g. to forward them to a metrics system. Statistics are only collected when a hook is set
+                or when a `SolveStats` is passed to a solve.
+            name_registry (NameRegistry): The registry interning the names of the species to the ids
+                the solver works with. Defaults to the registry shared by the whole process.
+            engine (str): The search engine, one of `ENGINES`: 'combinations' enumerates the combinations and
+                simulates the eating of each, 'dp' simulates the eating while choosing the species (see `dp_engine`),
+                'batch' enumerates the combinations and simulates the eating of many at once with NumPy
+                (see `batch_eating`). All return the same chains. 'greedy' only runs the beam search of `heuristic`,
+                returning a sustainable chain at once but not always the longest one; the other engines use it
+                to know the length of chain each group must beat before searching them.
+            memo_size (int): The maximum number of failed search states memoized by the 'dp' engine per group.
+            batch_size (int): The maximum number of combinations simulated at once by the 'batch' engine.
+            beam_width (int): The number of chains kept at each step of the beam search.
+    """
+    def __init__(self, stats_hook: Optional[Callable[[SolveStats], None]] = None,
+                 name_registry: Optional[NameRegistry] = None,
+                 engine: str = 'combinations',
+                 memo_size: int = DEFAULT_MEMO_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 beam_width: int = DEFAULT_BEAM_WIDTH):
+        if engine not in ENGINES:
+            raise ValueError(f'Invalid engine \'{engine}\', expected one of {ENGINES}')
+        self.stats_hook = stats_hook
+        self.name_registry = DEFAULT_NAME_REGISTRY if name_registry is None else name_registry
+        self.engine = engine
+        self.memo_size = memo_size
+        self.batch_size = batch_size
+        self.beam_width = beam_width
 
     @staticmethod
     def _simulate_eating(species: List[Species]):
+        """
+            Reference implementation of the eating rules on species whose food sources were resolved by
+            `_populate_food_sources`. The solver uses the equivalent rules of `eating` on compiled groups.
+        """
         species_dict = {s.name: {'calories_needed': s.calories_needed,
                                  'calories_provided': s.calories_provided} for s in species}
 
@@ -48,38 +112,444 @@ class Solver:
 
         return species_dict
 
-    def find_sustainable_food_chain(self, species: List[Species]) -> dict:
-        maximum_food_chain_length = 8
-        species_copy = copy.deepcopy(species)
-        if not species_copy:
+    def find_sustainable_food_chain(self, species: List[Species],
+                                    stats: Optional[SolveStats] = None,
+                                    progress: Optional[Callable[[ProgressEvent], None]] = None,
+                                    cancellation_token: Optional[CancellationToken] = None,
+                                    group_by: GroupBy = 'depth_range',
+                                    processes: Optional[int] = None,
+                                    depth: Optional[Tuple[float, float]] = None,
+                                    temperature: Optional[Tuple[float, float]] = None,
+                                    trace: Optional[EatingTrace] = None) -> dict:
+        """
+            Find the longest sustainable food chain among the species of a same group, by default of a same
+            depth range (see `compile_groups` for the other groupings). When several groups have chains
+            of the longest length, the chain of the first group in order of key is returned.
+
+            `progress` is called with a `ProgressEvent` at every chain length searched and every few thousand
+            combinations. Once `cancellation_token` is cancelled, the search stops and the best chain of the
+            groups fully searched so far is returned. With `processes`, the groups are searched by a pool
+            of processes. `depth` and `temperature` restrict the search to the species whose ranges overlap
+            a (low, high) habitat, e.g. `depth=(0, 25)`. `trace` records every step of the eating of the chain
+            returned (see `eating_trace`), and is left empty when there is none.
+        """
+        stats = self._collect_stats(stats)
+        if not species:
+            if trace is not None:
+                trace.clear()
+            self._report_stats(stats)
+            return {}
+
+        with stage(stats, 'populate'):
+            game = self.compile(species, group_by)
+
+        return game.solve(stats=stats, progress=progress, cancellation_token=cancellation_token, processes=processes,
+                          depth=depth, temperature=temperature, trace=trace)
+
+    def compile(self, species: List[Species], group_by: GroupBy = 'depth_range') -> CompiledGame:
+        """
+            Build the food web of species, group and sort them once, to solve them repeatedly with
+            `CompiledGame.solve`, e.g. with different chain lengths or depth and temperature filters.
+        """
+        food_web = FoodWeb(species)
+        return CompiledGame(self._compile_groups(species, group_by, food_web), self, food_web)
+
+    def solve_many(self, games: Iterable[Union[List[Species], bytes]],
+                   processes: Optional[int] = None, chunksize: int = 1) -> Iterator[dict]:
+        """
+            Solve several games, lazily and in order. A game is either a list of species or a game encoded with
+            `mckinseysolvegame.infrastructure.binary_format`. With `processes`, games are solved by a pool of
+            processes, to which they are sent encoded rather than pickled, with the same search settings. The
+            statistics of each game are sent back to `stats_hook`. Registries are not shared between processes:
+            the workers of a solver given its own registry intern names in a registry of their own, and the names
+            of the chains found are registered in the registry of the solver.
+        """
+        from mckinseysolvegame.infrastructure.binary_format import decode_game, encode_game
+
+        if processes is None:
+            for game in games:
+                yield self.find_sustainable_food_chain(decode_game(game) if _is_encoded(game) else game)
+            return
+
+        settings = self._settings()
+        own_registry = self.name_registry is not DEFAULT_NAME_REGISTRY
+        collect_stats = self.stats_hook is not None
+        tasks = ((bytes(game) if _is_encoded(game) else encode_game(game), settings, own_registry, collect_stats)
+                 for game in games)
+        initializer = warm_up if self.engine == 'batch' else None
+        with multiprocessing.Pool(processes, initializer) as pool:
+            for chain, stats in pool.imap(_solve_encoded_game, tasks, chunksize):
+                self.name_registry.ids(chain)
+                if stats is not None:
+                    self.stats_hook(stats)
+                yield chain
+
+    def _collect_stats(self, stats: Optional[SolveStats]) -> Optional[SolveStats]:
+        if stats is None and self.stats_hook is not None:
+            return SolveStats()
+        return stats
+
+    def _report_stats(self, stats: Optional[SolveStats]) -> None:
+        if stats is None:
+            return
+        stats.stage_times['simulate'] = sum(g.simulate_time for g in stats.groups.values())
+        if self.stats_hook is not None:
+            self.stats_hook(stats)
+
+    def _compile_groups(self, species: List[Species], group_by: GroupBy = 'depth_range',
+                        food_web: Optional[FoodWeb] = None) -> Dict[Hashable, CompiledGroup]:
+        return compile_groups(species, self.name_registry, group_by, food_web)
+
+    def _solve_groups(self, groups: Dict[Hashable, CompiledGroup],
+                      max_length: Optional[int] = None,
+                      stats: Optional[SolveStats] = None,
+                      progress: Optional[Callable[[ProgressEvent], None]] = None,
+                      cancellation_token: Optional[CancellationToken] = None,
+                      processes: Optional[int] = None,
+                      trace: Optional[EatingTrace] = None) -> dict:
+        """
+            Keep the longest chain of the first group, in order of key, reaching it. The groups are searched in
+            descending order of their `length_bound`: once a chain is found, the groups before its own only search
+            for chains at least as long, the next ones for longer chains, and the groups whose bound falls short
+            are skipped. The exact engines first run the beam search of `heuristic` on the large groups, whose
+            longest chain the groups up to its own must then match, and the next ones beat. When the search is
+            cancelled, that chain is kept if it beats the chains found.
+        """
+        max_length = MAXIMUM_FOOD_CHAIN_LENGTH if max_length is None else max_length
+        stats = self._collect_stats(stats)
+        monitor = None
+        if progress is not None or cancellation_token is not None:
+            monitor = SearchMonitor(groups, max_length, progress, cancellation_token)
+        incumbent_index, incumbent = -1, []
+        if self.engine != 'greedy' and not (monitor is not None and monitor.check_cancellation()):
+            with stage(stats, 'search'):
+                incumbent_index, incumbent = self._find_incumbent(groups, max_length, stats)
+
+        if processes is not None:
+            best_group, best_chain = self._search_groups_in_parallel(groups, max_length, stats, monitor, processes,
+                                                                     incumbent_index, incumbent)
+        else:
+            items = list(groups.items())
+            bounds = [min(group.length_bound(), max_length) for group in groups.values()]
+            best_index, best_group, best_chain = -1, None, []
+            for index in sorted(range(len(items)), key=lambda index: -bounds[index]):
+                key, group = items[index]
+                if monitor is not None:
+                    if monitor.check_cancellation():
+                        break
+                    monitor.start_group(key, len(group))
+                group_stats = stats.group(key) if stats is not None else None
+                min_length = max(len(best_chain) + (index > best_index), len(incumbent) + (index > incumbent_index))
+                if bounds[index] >= min_length:
+                    with stage(stats, 'search', group_stats):
+                        chain = self._find_longest_chain(group, min_length=min_length, max_length=bounds[index],
+                                                         stats=group_stats, monitor=monitor)
+                    if group_stats is not None:
+                        group_stats.chain_length = len(chain)
+                    if chain:
+                        best_index, best_group, best_chain = index, group, chain
+                if monitor is not None:
+                    monitor.end_group()
+
+        if incumbent and monitor is not None and monitor.cancelled:
+            values = list(groups.values())
+            best_index = next((index for index, group in enumerate(values) if group is best_group), -1)
+            if len(incumbent) > len(best_chain) or (len(incumbent) == len(best_chain) and incumbent_index < best_index):
+                best_group, best_chain = values[incumbent_index], incumbent
+        self._report_stats(stats)
+        if best_group is None:
+            if trace is not None:
+                trace.clear()
             return {}
+        return best_group.eating_steps(best_chain, trace)
+
+    def _find_incumbent(self, groups: Dict[Hashable, CompiledGroup], max_length: int,
+                        stats: Optional[SolveStats]) -> Tuple[int, List[int]]:
+        """
+            Run the beam search on the groups having at least `INCUMBENT_SEARCH_SPACE` combinations, returning
+            the index of the first group having the longest chain found and that chain, (-1, []) when there is none.
+        """
+        best_index, best_chain = -1, []
+        for index, (key, group) in enumerate(groups.items()):
+            lengths = range(1, min(len(group), max_length) + 1)
+            if len(lengths) > len(best_chain) \
+                    and sum(comb(len(group), length) for length in lengths) >= INCUMBENT_SEARCH_SPACE:
+                chain = beam_search(group, max_length, self.beam_width,
+                                    stats=stats.group(key) if stats is not None else None)
+                if len(chain) > len(best_chain):
+                    best_index, best_chain = index, chain
+        return best_index, best_chain
 
-        self._populate_food_sources(species_copy)
+    def _search_groups_in_parallel(self, groups: Dict[Hashable, CompiledGroup], max_length: int,
+                                   stats: Optional[SolveStats], monitor: Optional[SearchMonitor], processes: int,
+                                   incumbent_index: int = -1, incumbent: Sequence[int] = ()):
+        if self.engine == 'combinations':
+            with stage(stats, 'search'):
+                index, best_chain, groups_stats = work_stealing.search_groups(
+                    list(groups.values()), max_length, processes, stats is not None, monitor,
+                    (incumbent_index, incumbent) if incumbent else None)
+            if stats is not None:
+                for key, group_stats in zip(groups, groups_stats):
+                    stats.group(key).merge(group_stats)
+            if monitor is not None:
+                for key, group in groups.items():
+                    monitor.start_group(key, len(group))
+                    monitor.end_group()
+            return (list(groups.values())[index] if index is not None else None), best_chain
 
-        species_copy.sort(key=lambda x: x.depth_range)
-        grouped_species = {key: list(group) for key, group in groupby(
-            species_copy, key=lambda x: x.depth_range)}
+        # the tables of the groups are shared with the workers, which read them in place: tasks only carry the index
+        # of their group, and names stay in the registry of this process
+        items = list(groups.items())
+        bounds = [min(group.length_bound(), max_length) for group in groups.values()]
+        best_index, best_chain = -1, []
+        initializer = warm_up if self.engine == 'batch' else None
+        with stage(stats, 'search'), SharedGameTable.create(list(groups.values())) as table, \
+                multiprocessing.Pool(processes, initializer) as pool:
+            tasks = [(table.name, index, len(incumbent) + (index > incumbent_index), bounds[index],
+                      stats is not None, self._settings())
+                     for index in sorted(range(len(items)), key=lambda index: -bounds[index])]
+            for task, (chain, group_stats) in zip(tasks, pool.imap(_search_group, tasks)):
+                index = task[1]
+                key, group = items[index]
+                if monitor is not None:
+                    if monitor.check_cancellation():
+                        break
+                    monitor.start_group(key, len(group))
+                    monitor.end_group()
+                if stats is not None:
+                    stats.group(key).merge(group_stats)
+                if len(chain) > len(best_chain) or (chain and len(chain) == len(best_chain) and index < best_index):
+                    best_index, best_chain = index, chain
+        return (items[best_index][1] if best_chain else None), best_chain
 
-        longest_sustainable_chain_per_depth_range = {}
-        for depth_range, species_copy in grouped_species.items():
-            n = min(maximum_food_chain_length, len(species_copy))
-            species_copy.sort(key=lambda x: x.calories_provided, reverse=True)
+    def _settings(self) -> dict:
+        # the settings of the search, to build an equivalent solver in another process
+        return {'engine': self.engine, 'memo_size': self.memo_size, 'batch_size': self.batch_size,
+                'beam_width': self.beam_width}
 
-            optimal_list = []
-            for length in range(1, n + 1):
-                for combination in combinations(species_copy, length):
-                    combination = list(combination)
-                    if self._is_sustainable(combination) and len(combination) > len(optimal_list):
-                        optimal_list = combination
+    def _find_longest_chain(self, group: CompiledGroup,
+                            min_length: int = 1,
+                            max_length: int = MAXIMUM_FOOD_CHAIN_LENGTH,
+                            required: Optional[int] = None,
+                            stats: Optional[GroupStats] = None,
+                            monitor: Optional[SearchMonitor] = None) -> List[int]:
+        """
+            Find the longest sustainable combination of `group` whose length lies within [min_length, max_length].
+            Lengths are tried from the longest down, so the search stops at the first length having a solution,
+            and among the combinations of that length the first one in `itertools.combinations` order is returned.
+            When `required` is given, only the combinations containing the species at that position are considered.
+            An empty chain is returned when the search is cancelled through `monitor`.
+        """
+        if self.engine == 'greedy':
+            chain = beam_search(group, max_length, self.beam_width, required, stats)
+            return chain if len(chain) >= min_length else []
 
-            optimal_list.sort(key=lambda x: x.calories_provided, reverse=True)
-            eating_steps = self._simulate_eating(optimal_list)
-            longest_sustainable_chain_per_depth_range[depth_range] = eating_steps
+        if self.engine == 'dp':
+            search = DynamicProgrammingSearch(group, self.memo_size)
+            for length in range(min(max_length, len(group)), max(min_length, 1) - 1, -1):
+                if monitor is not None:
+                    monitor.start_length(length)
+                chain = search.find(length, required, stats, monitor)
+                if chain is not None:
+                    return list(chain)
+                if monitor is not None and monitor.cancelled:
+                    return []
+            return []
 
-        _, max_value = max(
-            longest_sustainable_chain_per_depth_range.items(), key=lambda x: len(x[1]))
+        if self.engine == 'batch':
+            adjacency = adjacency_matrix(group)
+            for length in range(min(max_length, len(group)), max(min_length, 1) - 1, -1):
+                if monitor is not None:
+                    monitor.start_length(length)
+                candidates = self._combinations(group, length, required, stats=stats)
+                if monitor is not None:
+                    candidates = takewhile(lambda _: not monitor.tick(), candidates)
+                for batch in batches(candidates, length, self.batch_size):
+                    start = perf_counter()
+                    sustainable, _ = evaluate_chains(group, batch, adjacency)
+                    if stats is not None:
+                        stats.simulate_time += perf_counter() - start
+                        stats.combinations_generated += len(batch)
+                        stats.combinations_simulated += len(batch)
+                    found = sustainable.nonzero()[0]
+                    if found.size:
+                        return batch[found[0]].tolist()
+                if monitor is not None and monitor.cancelled:
+                    return []
+            return []
 
-        return max_value
+        for length in range(min(max_length, len(group)), max(min_length, 1) - 1, -1):
+            if monitor is not None:
+                monitor.start_length(length)
+            for combination in self._combinations(group, length, required, stats=stats):
+                if stats is not None:
+                    stats.combinations_generated += 1
+                if monitor is not None and monitor.tick():
+                    return []
+                if self._is_chain_sustainable(group, combination, stats):
+                    return list(combination)
+        return []
+
+    @staticmethod
+    def _combinations(group: CompiledGroup, length: int, required: Optional[int] = None,
+                      prefix: Tuple[int, ...] = (), stats: Optional[GroupStats] = None):
+        """
+            Yield the combinations of `length` species of `group` in the same order as `itertools.combinations`,
+            skipping every branch that cannot be sustainable: branches left without a producer, and branches where
+            a species chosen can no longer be fed by the species chosen and the ones after them.
+            When `required` is given, only the combinations containing the species at that position are yielded,
+            and when `prefix` is given, only the combinations starting with those positions. The combinations
+            of the branches skipped are counted as pruned in `stats`.
+        """
+        size = len(group)
+        all_positions = (1 << size) - 1
+        producer_mask = group.producer_mask
+        strong_food_masks = group.strong_food_masks
+        half_food_masks = group.half_food_masks
+        calories_needed = group.calories_needed
+        may_feed = group.may_feed
+        completions = group.completions
+        chosen = list(prefix)
+
+        def extend(start: int, chosen_mask: int, consumers: tuple):
+            remaining = length - len(chosen)
+            # the species required, while it is still to choose
+            pending = required if required is not None and not chosen_mask >> required & 1 else None
+            for i in range(start, size - remaining + 1):
+                if pending is not None:
+                    if i > pending:
+                        break
+                    if remaining == 1 and i < pending:
+                        continue
+                available = chosen_mask | (all_positions >> i << i)
+                if i > start:
+                    # the species skipped is no longer available: the branch is over once it was the last producer
+                    # or the last food able to feed a species chosen, as the next ones only have fewer species left
+                    skipped = 1 << (i - 1)
+                    if not producer_mask & available or any(
+                            half_food_masks[c] & skipped and not (strong_food_masks[c] & available
+                                                                  or (half_food_masks[c] & available).bit_count() >= 2)
+                            for c in consumers):
+                        if stats is not None:
+                            stats.combinations_pruned += completions(i, remaining, pending)
+                        break
+                elif not producer_mask & available:
+                    if stats is not None:
+                        stats.combinations_pruned += completions(i, remaining, pending)
+                    break
+                if not may_feed(i, available):
+                    if stats is not None:
+                        stats.combinations_pruned += completions(i + 1, remaining - 1, None if pending == i else pending)
+                    continue
+                if remaining == 1:
+                    yield (*chosen, i)
+                    continue
+                chosen.append(i)
+                yield from extend(i + 1, chosen_mask | 1 << i, consumers + (i,) if calories_needed[i] else consumers)
+                chosen.pop()
+
+        if prefix:
+            chosen_mask = sum(1 << i for i in prefix)
+            consumers = tuple(i for i in prefix if calories_needed[i])
+            start = prefix[-1] + 1
+            # the species skipped before the end of the prefix are no longer available, nor any other species
+            # once the prefix is a whole combination
+            available = chosen_mask | (all_positions >> start << start) if len(prefix) < length else chosen_mask
+            if len(prefix) <= length and producer_mask & available and all(may_feed(c, available) for c in prefix):
+                if len(prefix) == length:
+                    yield prefix
+                else:
+                    yield from extend(start, chosen_mask, consumers)
+            elif stats is not None:
+                stats.combinations_pruned += completions(start, length - len(prefix))
+        elif length > 0:
+            yield from extend(0, 0, ())
+
+    def find_top_food_chains(self, species: List[Species], top_k: int = 3,
+                             stats: Optional[SolveStats] = None,
+                             group_by: GroupBy = 'depth_range') -> List[OptimizationResult]:
+        """
+            Find the top_k best sustainable food chains across all groups, by default depth ranges.
+
+            Chains are ranked by length first, then by their leftover calories (see `leftover_calories`).
+            A bounded heap keeps the current top_k during the search, and any branch whose calories provided
+            cannot beat the worst chain of a full heap is pruned, since eating only ever removes calories.
+
+            Returns:
+                List[OptimizationResult]: The best chains, best first, each with its score.
+        """
+        if top_k < 1:
+            raise ValueError(f'top_k must be a positive integer, got {top_k}')
+        stats = self._collect_stats(stats)
+        if not species:
+            self._report_stats(stats)
+            return []
+
+        with stage(stats, 'populate'):
+            groups = self._compile_groups(species, group_by)
+
+        # min-heap of (length, score, -discovery order, species names): the root is the worst chain kept
+        heap = []
+        discovery_order = count()
+        for key, group in groups.items():
+            group_stats = stats.group(key) if stats is not None else None
+            with stage(stats, 'search', group_stats):
+                for length in range(min(MAXIMUM_FOOD_CHAIN_LENGTH, len(group)), 0, -1):
+                    if len(heap) == top_k and length < heap[0][0]:
+                        if group_stats is not None:
+                            group_stats.combinations_pruned += sum(comb(len(group), i) for i in range(1, length + 1))
+                        break  # shorter chains in this group can no longer enter the top_k
+                    for combination in self._bounded_combinations(group, length, heap, top_k, group_stats):
+                        if group_stats is not None:
+                            group_stats.combinations_generated += 1
+                        if not self._is_chain_sustainable(group, combination, group_stats):
+                            continue
+                        eating_steps = group.eating_steps(combination)
+                        entry = (length, leftover_calories(eating_steps), -next(discovery_order), list(eating_steps))
+                        if group_stats is not None:
+                            group_stats.chain_length = max(group_stats.chain_length, length)
+                        if len(heap) < top_k:
+                            heapq.heappush(heap, entry)
+                        elif entry > heap[0]:
+                            heapq.heapreplace(heap, entry)
+
+        self._report_stats(stats)
+
+        return [OptimizationResult(species=names, score=score)
+                for _, score, _, names in sorted(heap, reverse=True)]
+
+    @staticmethod
+    def _bounded_combinations(group: CompiledGroup, length: int, heap: list, top_k: int,
+                              stats: Optional[GroupStats] = None):
+        """
+            Yield the combinations of `length` species of `group` in the same order as `itertools.combinations`,
+            skipping every branch whose upper bound on leftover calories cannot enter a full heap.
+        """
+        calories = group.calories_provided
+        cumulative_calories = [0]
+        for c in calories:
+            cumulative_calories.append(cumulative_calories[-1] + c)
+
+        chosen = []
+
+        def extend(start: int, chosen_calories: int):
+            remaining = length - len(chosen)
+            if remaining == 0:
+                yield tuple(chosen)
+                return
+            for i in range(start, len(group) - remaining + 1):
+                # the best completion takes the next `remaining` species, as calories are sorted
+                upper_bound = chosen_calories + cumulative_calories[i + remaining] - cumulative_calories[i]
+                if len(heap) == top_k and (length, upper_bound) <= heap[0][:2]:
+                    if stats is not None:
+                        # every combination completing the chosen species from the i-th one onwards is cut
+                        stats.combinations_pruned += comb(len(group) - i, remaining)
+                    break
+                chosen.append(i)
+                yield from extend(i + 1, chosen_calories + calories[i])
+                chosen.pop()
+
+        yield from extend(0, 0)
 
     @staticmethod
     def _populate_food_sources(species: List[Species]) -> None:
@@ -105,11 +575,35 @@ class Solver:
 
         return all([self._is_species_sustainable(species) for species in list(species_dict.values())])
 
+    @staticmethod
+    def _is_chain_sustainable(group: CompiledGroup, chain: Sequence[int], stats: Optional[GroupStats] = None) -> bool:
+        if not group.has_producer(chain):
+            if stats is not None:
+                stats.combinations_pruned += 1
+            return False
+
+        if stats is not None:
+            start = perf_counter()
+            sustainable = group.is_sustainable(chain)
+            stats.simulate_time += perf_counter() - start
+            stats.combinations_simulated += 1
+            return sustainable
+        return group.is_sustainable(chain)
+
     @staticmethod
     def _is_species_sustainable(species: dict[str, int]) -> bool:
         return species['calories_needed'] == 0 and species['calories_provided'] > 0
 
-    def solve_from_dataframe(self, df: pd.DataFrame) -> dict:
+    def solve_from_dataframe(self, df: pd.DataFrame,
+                             stats: Optional[SolveStats] = None,
+                             progress: Optional[Callable[[ProgressEvent], None]] = None,
+                             cancellation_token: Optional[CancellationToken] = None) -> dict:
+        stats = self._collect_stats(stats)
+        with stage(stats, 'ingest'):
+            species_list = self._species_from_dataframe(df)
+        return self.find_sustainable_food_chain(species_list, stats, progress, cancellation_token)
+
+    def _species_from_dataframe(self, df: pd.DataFrame) -> List[Species]:
         # Ensure we don't modify the original dataframe
         df_copy = df.copy()
 
@@ -117,15 +611,47 @@ class Solver:
         df_copy['food_sources'] = df_copy['food_sources'].apply(
             lambda x: x.split(';') if pd.notna(x) else [])
 
+        intern = self.name_registry.intern
         species_list = []
         for _, row in df_copy.iterrows():
             species = Species(
-                name=row['name'],
+                name=intern(row['name']),
                 calories_provided=row['calories_provided'],
                 calories_needed=row['calories_needed'],
                 depth_range=row['depth_range'],
                 temperature_range=row['temperature_range'],
-                food_sources=row['food_sources']
+                food_sources=[intern(food_source) for food_source in row['food_sources']]
             )
             species_list.append(species)
-        return self.find_sustainable_food_chain(species_list)
+        return species_list
+
+
+def _is_encoded(game) -> bool:
+    return isinstance(game, (bytes, bytearray, memoryview))
+
+
+def _search_group(task) -> tuple:
+    table_name, index, min_length, max_length, collect_stats, settings = task
+    group = attached_table(table_name).group(index)
+    group_stats = GroupStats() if collect_stats else None
+    start = perf_counter()
+    chain = Solver(**settings)._find_longest_chain(group, min_length, max_length, stats=group_stats)
+    if group_stats is not None:
+        group_stats.search_time = perf_counter() - start
+        group_stats.chain_length = len(chain)
+    return chain, group_stats
+
+
+_worker_registry: Optional[NameRegistry] = None
+
+
+def _solve_encoded_game(task) -> tuple:
+    from mckinseysolvegame.infrastructure.binary_format import decode_game
+
+    global _worker_registry
+    game, settings, own_registry, collect_stats = task
+    if own_registry and _worker_registry is None:
+        _worker_registry = NameRegistry()
+    stats = SolveStats() if collect_stats else None
+    solver = Solver(name_registry=_worker_registry if own_registry else None, **settings)
+    return solver.find_sustainable_food_chain(decode_game(game), stats=stats), stats
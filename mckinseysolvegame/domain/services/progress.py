@@ -0,0 +1,117 @@
+import threading
+from math import comb
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+PROGRESS_INTERVAL = 1024
+
+
+class CancellationToken:
+    """
+        Token checked by the search to stop a solve cooperatively, either when `cancel` is called,
+        possibly from another thread, or once `timeout` seconds have elapsed since its creation.
+    """
+    def __init__(self, timeout: Optional[float] = None):
+        self._event = threading.Event()
+        self._deadline = None if timeout is None else monotonic() + timeout
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._deadline is not None and not self._event.is_set() and monotonic() >= self._deadline:
+            self._event.set()
+        return self._event.is_set()
+
+
+class ProgressEvent:
+    """
+        Progress of a solve.
+
+        Attributes:
+            depth_range (str): The depth range being searched.
+            group_index (int): The index of the depth range among the `group_count` ones of the game.
+            group_count (int): The number of depth ranges of the game.
+            length (int): The chain length being searched.
+            combinations_explored (int): The combinations searched or proved unnecessary to search so far.
+            combinations_total (int): The combinations of the whole search space.
+    """
+    def __init__(self, depth_range: str, group_index: int, group_count: int, length: int,
+                 combinations_explored: int, combinations_total: int):
+        self.depth_range = depth_range
+        self.group_index = group_index
+        self.group_count = group_count
+        self.length = length
+        self.combinations_explored = combinations_explored
+        self.combinations_total = combinations_total
+
+    @property
+    def fraction(self) -> float:
+        return self.combinations_explored / self.combinations_total if self.combinations_total else 1.0
+
+
+class SearchMonitor:
+    """
+        Reports the progress of a search and checks its cancellation every `interval` combinations,
+        so that neither costs more than a counter increment per combination.
+    """
+    def __init__(self, groups: Dict[str, List], maximum_length: int,
+                 progress: Optional[Callable[[ProgressEvent], None]] = None,
+                 cancellation_token: Optional[CancellationToken] = None,
+                 interval: int = PROGRESS_INTERVAL):
+        self.progress = progress
+        self.cancellation_token = cancellation_token
+        self.interval = interval
+        self.maximum_length = maximum_length
+        self.group_count = len(groups)
+        self.combinations_total = sum(self._search_space(len(group)) for group in groups.values())
+        self.combinations_explored = 0
+        self.cancelled = False
+        self._depth_range = None
+        self._group_index = -1
+        self._group_start = 0
+        self._group_size = 0
+        self._length = 0
+        self._countdown = interval
+
+    def start_group(self, depth_range: str, size: int) -> None:
+        self._depth_range = depth_range
+        self._group_index += 1
+        self._group_start = self.combinations_explored
+        self._group_size = size
+
+    def start_length(self, length: int) -> None:
+        self._length = length
+        self.report()
+
+    def tick(self) -> bool:
+        """
+            Count a combination, returning whether the search must stop.
+        """
+        self.combinations_explored += 1
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.interval
+        self.report()
+        return self.check_cancellation()
+
+    def end_group(self) -> None:
+        # the lengths below the chain found are proved unnecessary to search
+        if not self.cancelled:
+            self.combinations_explored = self._group_start + self._search_space(self._group_size)
+        self.report()
+
+    def check_cancellation(self) -> bool:
+        if not self.cancelled and self.cancellation_token is not None and self.cancellation_token.cancelled:
+            self.cancelled = True
+        return self.cancelled
+
+    def report(self) -> None:
+        if self.progress is not None:
+            self.progress(ProgressEvent(self._depth_range, self._group_index, self.group_count, self._length,
+                                        self.combinations_explored, self.combinations_total))
+
+    def _search_space(self, size: int) -> int:
+        return sum(comb(size, length) for length in range(1, min(self.maximum_length, size) + 1))
@@ -0,0 +1,117 @@
+"""
+    Tables of the compiled groups of a game in a block of shared memory, so that the processes of a pool read them
+    in place instead of receiving a copy with every task: the tasks only carry the name of the block and the index
+    of a group.
+
+    The block is a single array of 64-bit integers:
+        [group count, group offsets (count + 1), food offsets (species + 1),
+         calories provided (species), calories needed (species), food sources (edges)]
+    where the species of group `g` are `group_offsets[g]:group_offsets[g + 1]`, and the food sources of species `s`,
+    as positions within its group, are `food_sources[food_offsets[s]:food_offsets[s + 1]]`.
+"""
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup, _bits
+
+
+class SharedGameTable:
+    """
+        Compiled groups of a game in shared memory. The process creating the table owns the block and releases it
+        on `close`, or when leaving a `with` block; other processes `attach` to it by name.
+
+        Attributes:
+            name (str): The name of the block of shared memory.
+    """
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory = memory
+        self._owner = owner
+        table = np.ndarray((memory.size // 8,), dtype=np.int64, buffer=memory.buf)
+        count = int(table[0])
+        self._group_offsets = table[1:count + 2]
+        species = int(self._group_offsets[-1])
+        start = count + 2
+        self._food_offsets = table[start:start + species + 1]
+        start += species + 1
+        self._calories_provided = table[start:start + species]
+        start += species
+        self._calories_needed = table[start:start + species]
+        start += species
+        self._food_sources = table[start:start + int(self._food_offsets[-1])]
+        self._groups: Dict[int, CompiledGroup] = {}
+
+    @classmethod
+    def create(cls, groups: Sequence[CompiledGroup]) -> 'SharedGameTable':
+        group_offsets = np.cumsum([0] + [len(group) for group in groups], dtype=np.int64)
+        food_sources: List[int] = []
+        food_offsets = [0]
+        for group in groups:
+            for mask in group.food_masks:
+                food_sources.extend(bit.bit_length() - 1 for bit in _bits(mask))
+                food_offsets.append(len(food_sources))
+        calories_provided = [c for group in groups for c in group.calories_provided]
+        calories_needed = [c for group in groups for c in group.calories_needed]
+        table = np.concatenate([np.array(part, dtype=np.int64) for part in
+                                ([len(groups)], group_offsets, food_offsets, calories_provided, calories_needed,
+                                 food_sources)])
+
+        memory = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        np.ndarray(table.shape, dtype=np.int64, buffer=memory.buf)[:] = table
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedGameTable':
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def __len__(self) -> int:
+        return len(self._group_offsets) - 1
+
+    def __enter__(self) -> 'SharedGameTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def group(self, index: int) -> CompiledGroup:
+        """
+            The compiled group at `index`, whose species are named by their position. Groups are built once per
+            process from the shared tables.
+        """
+        if index not in self._groups:
+            start, end = int(self._group_offsets[index]), int(self._group_offsets[index + 1])
+            food_offsets = (self._food_offsets[start:end + 1] - self._food_offsets[start]).tolist()
+            food_sources = self._food_sources[self._food_offsets[start]:self._food_offsets[end]].tolist()
+            food_masks = [sum(1 << f for f in food_sources[food_offsets[s]:food_offsets[s + 1]])
+                          for s in range(end - start)]
+            self._groups[index] = CompiledGroup(None, list(range(end - start)),
+                                                self._calories_provided[start:end].tolist(),
+                                                self._calories_needed[start:end].tolist(),
+                                                food_masks)
+        return self._groups[index]
+
+    def close(self) -> None:
+        """
+            Release the views of the tables and the block of this process, the block itself when owning it.
+        """
+        self._groups.clear()
+        self._group_offsets = self._food_offsets = self._calories_provided = self._calories_needed = None
+        self._food_sources = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+# tables attached by the current process, e.g. by the workers of a pool, by name
+_attached: Dict[str, SharedGameTable] = {}
+
+
+def attached_table(name: str) -> SharedGameTable:
+    if name not in _attached:
+        _attached[name] = SharedGameTable.attach(name)
+    return _attached[name]
@@ -0,0 +1,112 @@
+"""
+    Check given chains against a compiled game without searching it, e.g. the chains proposed by a user or by
+    a candidate generator.
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from mckinseysolvegame.domain.services.compiled_game import CompiledGame, CompiledGroup
+from mckinseysolvegame.domain.services.eating import NO_PRODUCER, diagnose_eating
+
+UNKNOWN_SPECIES = 'unknown species'
+SEVERAL_GROUPS = 'species of several groups'
+
+
+class ChainValidation:
+    """
+        Outcome of the eating of a chain. Only whether it is sustainable is known at first: the eating is simulated
+        again to tell the calories left and why the chain is not sustainable when they are read.
+
+        Attributes:
+            sustainable (bool): Whether the chain is sustainable.
+            group (Optional[CompiledGroup]): The group of the species of the chain, None when it is empty or its
+                species do not all belong to one group of the game.
+            chain (List[int]): The positions of the species of the chain in `group`, in eating order.
+            species (List[str]): The names of the species of the chain, in eating order when they share a group.
+            calories (Dict[str, int]): The calories provided by each species once everyone has eaten, empty when
+                the chain could not be simulated.
+            failing_species (Optional[str]): The species that failed, None when the chain is sustainable or has
+                no producer.
+            reason (Optional[str]): Why the chain is not sustainable, one of the reasons of
+                `eating.diagnose_eating`, `UNKNOWN_SPECIES` or `SEVERAL_GROUPS`, None when it is sustainable.
+    """
+    __slots__ = ('sustainable', 'group', 'chain', '_details')
+
+    def __init__(self, sustainable: bool, group: Optional[CompiledGroup], chain: List[int],
+                 details: Optional[Tuple[List[str], Dict[str, int], Optional[str], Optional[str]]] = None):
+        self.sustainable = sustainable
+        self.group = group
+        self.chain = chain
+        self._details = details
+
+    @property
+    def species(self) -> List[str]:
+        return self._diagnose()[0]
+
+    @property
+    def calories(self) -> Dict[str, int]:
+        return self._diagnose()[1]
+
+    @property
+    def failing_species(self) -> Optional[str]:
+        return self._diagnose()[2]
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._diagnose()[3]
+
+    def to_json(self, format_type: str = "dict"):
+        my_json = {'sustainable': self.sustainable, 'species': self.species, 'calories': self.calories,
+                   'failingSpecies': self.failing_species, 'reason': self.reason}
+        if format_type == "dict":
+            return my_json
+        elif format_type == "str":
+            return json.dumps(my_json)
+        else:
+            raise NotImplementedError(f"Invalid format type \'{format_type}\' during serialization")
+
+    def _diagnose(self) -> tuple:
+        if self._details is None:
+            group = self.group
+            calories, failing, reason = diagnose_eating(self.chain, group.calories_provided, group.calories_needed,
+                                                        group.food_masks)
+            names = group.registry.names(group.name_ids[i] for i in self.chain)
+            self._details = (names, {name: calories[i] for name, i in zip(names, self.chain)},
+                             None if failing is None else names[self.chain.index(failing)], reason)
+        return self._details
+
+
+def validate_chains(game: CompiledGame, chains: Iterable[Sequence[Union[str, int]]]) -> List[ChainValidation]:
+    """
+        Check whether each chain, given as species names or as their ids in the name registry of the solver
+        of `game`, is sustainable, as `find_sustainable_food_chain` would simulate it. The species of a chain
+        are taken once each, in any order, and must all belong to the same group of the game.
+    """
+    locate = game.positions.__getitem__
+    validations = []
+    for chain in chains:
+        try:
+            groups, chain_positions = zip(*map(locate, chain))
+        except (KeyError, ValueError):
+            groups = ()
+        group = groups[0] if groups else None
+        if group is None or groups.count(group) != len(groups):
+            validations.append(_invalid(game, chain))
+            continue
+        ordered = sorted(set(chain_positions))
+        validations.append(ChainValidation(group.is_sustainable(ordered), group, ordered))
+    return validations
+
+
+def _invalid(game: CompiledGame, chain: Sequence[Union[str, int]]) -> ChainValidation:
+    # an empty chain, or one with species missing from the game or from different groups
+    located = [game.positions.get(species) for species in chain]
+    names = [species if isinstance(species, str) or located[k] is None else game.solver.name_registry.name(species)
+             for k, species in enumerate(chain)]
+    if not chain:
+        return ChainValidation(False, None, [], ([], {}, None, NO_PRODUCER))
+    if None in located:
+        return ChainValidation(False, None, [], (names, {}, str(names[located.index(None)]), UNKNOWN_SPECIES))
+    group = located[0][0]
+    k = next(k for k, species in enumerate(located) if species[0] is not group)
+    return ChainValidation(False, None, [], (names, {}, names[k], SEVERAL_GROUPS))
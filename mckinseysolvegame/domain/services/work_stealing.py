@@ -0,0 +1,179 @@
+"""
+    Parallel search of the groups of a game balanced by work stealing.
+
+    The search of every group and chain length is split into subtrees by the first species of the combinations,
+    and the subtrees are queued longest chains first, from the length bound of each group down. Once the queue runs
+    dry, a worker starting a subtree too large to be searched at once while others are idle splits it further by
+    the next species: it keeps the first part and leaves the others in the queue, where the idle workers take them.
+    Processes do not share memory, so the deques of the workers are a single queue.
+
+    The best chain found so far is shared by the workers, which skip the subtrees unable to beat it: the ones
+    of shorter chains, and, at the same length, the ones of later groups or later in `itertools.combinations`
+    order. The result is therefore the one of the sequential search.
+"""
+import multiprocessing
+import queue
+from math import comb
+from time import perf_counter
+from typing import List, Optional, Sequence, Tuple
+
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+from mckinseysolvegame.domain.services.instrumentation import GroupStats
+from mckinseysolvegame.domain.services.progress import SearchMonitor
+from mckinseysolvegame.domain.services.shared_game import SharedGameTable, attached_table
+
+SPLIT_SIZE = 2048
+
+CHECK_INTERVAL = 1024
+
+POLL_INTERVAL = 0.05
+
+Task = Tuple[int, int, Tuple[int, ...]]
+
+
+class SharedBest:
+    """
+        Best chain found by the workers, as its length, the index of its group and its positions.
+    """
+    def __init__(self, max_length: int):
+        self._values = multiprocessing.Array('q', 2 + max_length)
+
+    def may_improve(self, task: Task) -> bool:
+        group, length, prefix = task
+        with self._values.get_lock():
+            best_length = self._values[0]
+            if best_length != length:
+                return best_length < length
+            return (group, *prefix) <= (self._values[1], *self._values[2:2 + len(prefix)])
+
+    def offer(self, group: int, chain: Sequence[int]) -> None:
+        with self._values.get_lock():
+            best_length = self._values[0]
+            if len(chain) > best_length or (len(chain) == best_length
+                                            and (group, *chain) < (self._values[1], *self._values[2:2 + len(chain)])):
+                self._values[0] = len(chain)
+                self._values[1] = group
+                self._values[2:2 + len(chain)] = list(chain)
+
+    def cancel(self) -> None:
+        # no subtree may improve on a chain longer than any other
+        with self._values.get_lock():
+            self._values[0] = len(self._values)
+
+
+def search_groups(groups: Sequence[CompiledGroup], max_length: int, processes: int,
+                  collect_stats: bool = False,
+                  monitor: Optional[SearchMonitor] = None,
+                  incumbent: Optional[Tuple[int, Sequence[int]]] = None
+                  ) -> Tuple[Optional[int], List[int], List[GroupStats]]:
+    """
+        Search the longest sustainable chain of `groups` with `processes` workers, knowing that the group at index
+        `incumbent[0]` has the sustainable chain `incumbent[1]` when given.
+
+        Returns:
+            The index of the group of the chain, None when there is none, the chain, and the statistics
+            of the search of each group when `collect_stats` is set.
+    """
+    group_stats = [GroupStats() for _ in groups] if collect_stats else []
+    bounds = [group.length_bound() for group in groups]
+    tasks: List[Task] = [(g, length, (first,))
+                         for length in range(max_length, 0, -1)
+                         for g, group in enumerate(groups) if length <= bounds[g]
+                         for first in range(len(group) - length + 1)]
+    if not tasks:
+        return None, [], group_stats
+
+    best = SharedBest(max_length)
+    idle = multiprocessing.Value('i', 0)
+    task_queue, results = multiprocessing.Queue(), multiprocessing.Queue()
+    found: List[Tuple[int, int, Tuple[int, ...]]] = []
+    if incumbent is not None:
+        best.offer(*incumbent)
+        found.append((-len(incumbent[1]), incumbent[0], tuple(incumbent[1])))
+    with SharedGameTable.create(groups) as table:
+        arguments = (table.name, task_queue, results, best, idle, collect_stats)
+        workers = [multiprocessing.Process(target=_work, args=arguments, daemon=True) for _ in range(processes)]
+        for task in tasks:
+            task_queue.put(task)
+        for worker in workers:
+            worker.start()
+        try:
+            outstanding = len(tasks)
+            while outstanding:
+                try:
+                    g, chain, pushed, stats = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # workers only exit once the search is over
+                    if not all(worker.is_alive() for worker in workers):
+                        raise RuntimeError('A worker of the search exited unexpectedly')
+                else:
+                    outstanding += pushed - 1
+                    if chain:
+                        found.append((-len(chain), g, chain))
+                    if stats is not None:
+                        group_stats[g].merge(stats)
+                if monitor is not None and monitor.check_cancellation():
+                    best.cancel()
+        finally:
+            best.cancel()
+            # the tasks left are skipped, or never read when the workers exited unexpectedly
+            task_queue.cancel_join_thread()
+            for _ in workers:
+                task_queue.put(None)
+            # a worker only exits once the results it put are flushed, so they are read until then
+            while any(worker.is_alive() for worker in workers):
+                try:
+                    results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+            for worker in workers:
+                worker.join()
+
+    if not found:
+        return None, [], group_stats
+    _, g, chain = min(found)
+    return g, list(chain), group_stats
+
+
+def _work(table_name: str, tasks: multiprocessing.Queue, results: multiprocessing.Queue, best: SharedBest,
+          idle: multiprocessing.Value, collect_stats: bool) -> None:
+    from mckinseysolvegame.domain.services.optimization_service import Solver
+
+    table = attached_table(table_name)
+    while True:
+        with idle.get_lock():
+            idle.value += 1
+        task = tasks.get()
+        with idle.get_lock():
+            idle.value -= 1
+        if task is None:
+            return
+        g, length, prefix = task
+        group = table.group(g)
+        stats = GroupStats() if collect_stats else None
+        start = perf_counter()
+        chain = ()
+        pushed = 0
+        if best.may_improve(task):
+            # keep the first subtree and leave the others to the idle workers
+            while idle.value and tasks.empty() and len(prefix) < length - 1 \
+                    and comb(len(group) - prefix[-1] - 1, length - len(prefix)) > SPLIT_SIZE:
+                children = [(*prefix, i) for i in range(prefix[-1] + 1, len(group) - length + len(prefix) + 1)]
+                for child in children[1:]:
+                    tasks.put((g, length, child))
+                pushed += len(children) - 1
+                prefix = children[0]
+            for n, combination in enumerate(Solver._combinations(group, length, prefix=prefix, stats=stats), 1):
+                if stats is not None:
+                    stats.combinations_generated += 1
+                # another worker may have found a better chain in the meantime
+                if not n % CHECK_INTERVAL and not best.may_improve((g, length, prefix)):
+                    break
+                if Solver._is_chain_sustainable(group, combination, stats):
+                    chain = combination
+                    best.offer(g, chain)
+                    break
+        if stats is not None:
+            stats.search_time = perf_counter() - start
+            stats.chain_length = len(chain)
+        results.put((g, chain, pushed, stats))
@@ -0,0 +1,18 @@
+from mckinseysolvegame.infrastructure.archive import GameArchive
+from mckinseysolvegame.infrastructure.binary_format import GameView, decode_game, decode_result, encode_game, \
+    encode_result
+from mckinseysolvegame.infrastructure.task_queue import Coordinator, FileSystemTaskQueue, Task, TaskQueue, Worker
+
+__all__ = [
+    'GameArchive',
+    'GameView',
+    'encode_game',
+    'decode_game',
+    'encode_result',
+    'decode_result',
+    'TaskQueue',
+    'FileSystemTaskQueue',
+    'Task',
+    'Coordinator',
+    'Worker'
+]
@@ -0,0 +1,190 @@
+"""
+    Archive of games and their results, memory-mapped for random access by game id.
+
+    The archive is made of two files:
+        - the data file, starting with a header (magic, format version) followed by the games and results
+          encoded with `binary_format`, each padded to 8 bytes, only ever appended to,
+        - the index file, `<path>.index`, holding for each game id, in order, the offset and length in the data
+          file of the game and of its result (zero when the game has no result).
+    Data is always written before the index entry pointing to it, so an interrupted write never leaves the index
+    pointing to missing data.
+"""
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, List, Optional
+
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.binary_format import GameView, decode_result, encode_game, encode_result
+
+ARCHIVE_MAGIC = b'MSGA'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct('<4sHxx')
+INDEX_ENTRY = struct.Struct('<QQQQ')
+INDEX_SUFFIX = '.index'
+
+
+class GameArchive:
+    """
+        Archive of games and results, opened with mode 'r' to read or 'a' to also append (created if missing).
+    """
+    def __init__(self, path: str, mode: str = 'r'):
+        if mode not in ('r', 'a'):
+            raise ValueError(f'Invalid mode \'{mode}\', expected \'r\' or \'a\'')
+        self.path = path
+        self.mode = mode
+        self._index_path = path + INDEX_SUFFIX
+
+        if mode == 'a' and not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+            open(self._index_path, 'wb').close()
+
+        file_mode = 'r+b' if mode == 'a' else 'rb'
+        self._data_file = open(path, file_mode)
+        self._index_file = open(self._index_path, file_mode)
+        magic, version = ARCHIVE_HEADER.unpack(self._data_file.read(ARCHIVE_HEADER.size))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f'{path} is not a game archive')
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f'Unsupported archive version {version}')
+
+        self._data_map = None
+        self._index_map = None
+        self._remap()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._index_size // INDEX_ENTRY.size
+
+    def close(self) -> None:
+        self._unmap()
+        self._data_file.close()
+        self._index_file.close()
+
+    def game_view(self, game_id: int) -> GameView:
+        """
+            Zero-copy view of a game, valid until the archive is closed.
+        """
+        return GameView(self._game_buffer(game_id))
+
+    def game(self, game_id: int) -> List[Species]:
+        return self.game_view(game_id).to_species()
+
+    def games(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[Species]]:
+        for game_id in range(*slice(start, stop).indices(len(self))):
+            yield self.game(game_id)
+
+    def has_result(self, game_id: int) -> bool:
+        return self._entry(game_id)[3] > 0
+
+    def result(self, game_id: int) -> Optional[OptimizationResult]:
+        _, _, offset, length = self._entry(game_id)
+        if not length:
+            return None
+        return decode_result(memoryview(self._data_map)[offset:offset + length])
+
+    def append_game(self, species: List[Species], result: Optional[OptimizationResult] = None) -> int:
+        return self.append_games([species], None if result is None else [result])[0]
+
+    def append_games(self, games: Iterable[List[Species]],
+                     results: Optional[Iterable[Optional[OptimizationResult]]] = None) -> List[int]:
+        """
+            Append games, and optionally their results, returning their ids.
+        """
+        self._check_writable()
+        games = list(games)
+        results = [None] * len(games) if results is None else list(results)
+        entries = []
+        for game, result in zip(games, results):
+            game_offset, game_length = self._append_data(encode_game(game))
+            result_offset, result_length = (0, 0) if result is None else self._append_data(encode_result(result))
+            entries.append(INDEX_ENTRY.pack(game_offset, game_length, result_offset, result_length))
+        self._data_file.flush()
+
+        first_id = len(self)
+        self._index_file.seek(0, os.SEEK_END)
+        self._index_file.write(b''.join(entries))
+        self._index_file.flush()
+        self._remap()
+        return list(range(first_id, first_id + len(entries)))
+
+    def set_result(self, game_id: int, result: OptimizationResult) -> None:
+        self.set_results([(game_id, result)])
+
+    def set_results(self, results: Iterable) -> None:
+        """
+            Store the results of `(game_id, result)` pairs, replacing their previous results if any.
+        """
+        self._check_writable()
+        entries = []
+        for game_id, result in results:
+            game_offset, game_length, _, _ = self._entry(game_id)
+            entries.append((game_id, INDEX_ENTRY.pack(game_offset, game_length,
+                                                      *self._append_data(encode_result(result)))))
+        self._data_file.flush()
+        for game_id, entry in entries:
+            self._index_file.seek(game_id * INDEX_ENTRY.size)
+            self._index_file.write(entry)
+        self._index_file.flush()
+        self._remap()
+
+    def solve(self, solver: Optional[Solver] = None, start: int = 0, stop: Optional[int] = None,
+              processes: Optional[int] = None, overwrite: bool = False) -> int:
+        """
+            Solve the games of a range of ids with `Solver.solve_many` and store their results, skipping
+            the games already solved unless `overwrite` is set. Returns the number of games solved.
+        """
+        self._check_writable()
+        solver = solver or Solver()
+        game_ids = [game_id for game_id in range(*slice(start, stop).indices(len(self)))
+                    if overwrite or not self.has_result(game_id)]
+        # games are handed over encoded, so they are neither decoded here nor re-encoded for worker processes
+        games = (bytes(self._game_buffer(game_id)) for game_id in game_ids)
+        solutions = solver.solve_many(games, processes=processes)
+        self.set_results((game_id, OptimizationResult(species=list(solution)))
+                         for game_id, solution in zip(game_ids, solutions))
+        return len(game_ids)
+
+    def _game_buffer(self, game_id: int) -> memoryview:
+        offset, length, _, _ = self._entry(game_id)
+        return memoryview(self._data_map)[offset:offset + length]
+
+    def _entry(self, game_id: int):
+        if not 0 <= game_id < len(self):
+            raise IndexError(f'Game id {game_id} out of range')
+        return INDEX_ENTRY.unpack_from(self._index_map, game_id * INDEX_ENTRY.size)
+
+    def _append_data(self, data: bytes):
+        self._data_file.seek(0, os.SEEK_END)
+        offset = self._data_file.tell()
+        self._data_file.write(data + b'\0' * (-len(data) % 8))
+        return offset, len(data)
+
+    def _check_writable(self) -> None:
+        if self.mode != 'a':
+            raise PermissionError(f'{self.path} is opened read-only')
+
+    def _remap(self) -> None:
+        self._unmap()
+        self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_size = os.fstat(self._index_file.fileno()).st_size
+        if self._index_size:
+            self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self) -> None:
+        for m in (self._data_map, self._index_map):
+            if m is None:
+                continue
+            try:
+                m.close()
+            except BufferError:
+                pass  # views of games are still alive, the map is released along with them
+        self._data_map = None
+        self._index_map = None
@@ -0,0 +1,219 @@
+"""
+    Compact binary encoding of games and results, for storage and transfer between processes.
+
+    Every message starts with a header (magic, format version, kind, number of strings) followed by a string table
+    holding each distinct name, depth range and temperature range once: the offsets (uint32) of the strings and
+    their UTF-8 bytes, padded to 4 bytes. Integers are little-endian.
+
+    A game then holds the number of species and of food sources, followed by packed arrays indexed by species:
+    name ids (uint32), calories provided and needed (int32), depth range and temperature range ids (uint32),
+    and the food sources as an adjacency list: offsets (uint32, one more than the species) into the food source
+    name ids (uint32).
+
+    A result holds the number of species, whether it has a score, the species name ids (uint32)
+    and, padded to 8 bytes, the score (float64).
+"""
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Union
+
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+
+MAGIC = b'MSGB'
+FORMAT_VERSION = 1
+GAME_KIND = 1
+RESULT_KIND = 2
+
+HEADER = struct.Struct('<4sHHI')
+GAME_COUNTS = struct.Struct('<II')
+RESULT_COUNTS = struct.Struct('<II')
+SCORE = struct.Struct('<d')
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+Buffer = Union[bytes, bytearray, memoryview]
+# a game, as species or encoded
+Game = Union[List[Species], Buffer]
+
+
+class StringTable:
+    """
+        Distinct strings of a message, each identified by its position.
+    """
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, s: str) -> int:
+        if s not in self._ids:
+            self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return self._ids[s]
+
+    def encode(self) -> bytes:
+        encoded = [s.encode('utf-8') for s in self.strings]
+        offsets = array('I', [0])
+        for e in encoded:
+            offsets.append(offsets[-1] + len(e))
+        return _pack(offsets) + _pad(b''.join(encoded), 4)
+
+
+class GameView:
+    """
+        Read-only view of an encoded game: the arrays are `memoryview`s over the buffer, so nothing is copied
+        until species are materialized with `to_species`.
+    """
+    def __init__(self, buffer: Buffer):
+        view = memoryview(buffer).cast('B')
+        self._strings, offset = _read_header(view, GAME_KIND)
+        self.number_of_species, number_of_food_sources = GAME_COUNTS.unpack_from(view, offset)
+        offset += GAME_COUNTS.size
+
+        n = self.number_of_species
+        self.name_ids, offset = _read_array(view, offset, 'I', n)
+        self.calories_provided, offset = _read_array(view, offset, 'i', n)
+        self.calories_needed, offset = _read_array(view, offset, 'i', n)
+        self.depth_range_ids, offset = _read_array(view, offset, 'I', n)
+        self.temperature_range_ids, offset = _read_array(view, offset, 'I', n)
+        self.food_source_offsets, offset = _read_array(view, offset, 'I', n + 1)
+        self.food_source_ids, offset = _read_array(view, offset, 'I', number_of_food_sources)
+        self.nbytes = offset
+
+    def __len__(self) -> int:
+        return self.number_of_species
+
+    def string(self, string_id: int) -> str:
+        return self._strings.string(string_id)
+
+    def name(self, index: int) -> str:
+        return self.string(self.name_ids[index])
+
+    def food_sources(self, index: int) -> List[str]:
+        start, end = self.food_source_offsets[index], self.food_source_offsets[index + 1]
+        return [self.string(i) for i in self.food_source_ids[start:end]]
+
+    def species(self, index: int) -> Species:
+        return Species(name=self.name(index),
+                       calories_provided=self.calories_provided[index],
+                       calories_needed=self.calories_needed[index],
+                       depth_range=self.string(self.depth_range_ids[index]),
+                       temperature_range=self.string(self.temperature_range_ids[index]),
+                       food_sources=self.food_sources(index))
+
+    def to_species(self) -> List[Species]:
+        return [self.species(i) for i in range(self.number_of_species)]
+
+
+def encode_game(species: List[Species]) -> bytes:
+    strings = StringTable()
+    name_ids = array('I', (strings.id(s.name) for s in species))
+    calories_provided = _int32_array(s.calories_provided for s in species)
+    calories_needed = _int32_array(s.calories_needed for s in species)
+    depth_range_ids = array('I', (strings.id(s.depth_range) for s in species))
+    temperature_range_ids = array('I', (strings.id(s.temperature_range) for s in species))
+    food_source_offsets = array('I', [0])
+    food_source_ids = array('I')
+    for s in species:
+        food_source_ids.extend(strings.id(food_source) for food_source in s.food_sources)
+        food_source_offsets.append(len(food_source_ids))
+
+    return b''.join([
+        HEADER.pack(MAGIC, FORMAT_VERSION, GAME_KIND, len(strings.strings)),
+        strings.encode(),
+        GAME_COUNTS.pack(len(species), len(food_source_ids)),
+        _pack(name_ids),
+        _pack(calories_provided),
+        _pack(calories_needed),
+        _pack(depth_range_ids),
+        _pack(temperature_range_ids),
+        _pack(food_source_offsets),
+        _pack(food_source_ids)
+    ])
+
+
+def decode_game(buffer: Buffer) -> List[Species]:
+    return GameView(buffer).to_species()
+
+
+def encode_result(result: OptimizationResult) -> bytes:
+    strings = StringTable()
+    name_ids = array('I', (strings.id(name) for name in result.species))
+    has_score = result.score is not None
+    body = HEADER.pack(MAGIC, FORMAT_VERSION, RESULT_KIND, len(strings.strings)) + strings.encode() + \
+        RESULT_COUNTS.pack(len(name_ids), has_score) + _pack(name_ids)
+    if has_score:
+        body = _pad(body, 8) + SCORE.pack(result.score)
+    return body
+
+
+def decode_result(buffer: Buffer) -> OptimizationResult:
+    view = memoryview(buffer).cast('B')
+    strings, offset = _read_header(view, RESULT_KIND)
+    count, has_score = RESULT_COUNTS.unpack_from(view, offset)
+    name_ids, offset = _read_array(view, offset + RESULT_COUNTS.size, 'I', count)
+    score = None
+    if has_score:
+        offset += -offset % 8
+        score, = SCORE.unpack_from(view, offset)
+    return OptimizationResult(species=[strings.string(i) for i in name_ids], score=score)
+
+
+class _DecodedStrings:
+    def __init__(self, view: memoryview, count: int, offsets: memoryview, data_offset: int):
+        self._view = view
+        self._offsets = offsets
+        self._data_offset = data_offset
+        self._cache: List[Optional[str]] = [None] * count
+
+    def string(self, string_id: int) -> str:
+        s = self._cache[string_id]
+        if s is None:
+            start = self._data_offset + self._offsets[string_id]
+            end = self._data_offset + self._offsets[string_id + 1]
+            s = self._cache[string_id] = str(self._view[start:end], 'utf-8')
+        return s
+
+
+def _read_header(view: memoryview, expected_kind: int):
+    magic, version, kind, number_of_strings = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError('Not an encoded game or result')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported format version {version}')
+    if kind != expected_kind:
+        raise ValueError(f'Expected message kind {expected_kind}, got {kind}')
+
+    offsets, offset = _read_array(view, HEADER.size, 'I', number_of_strings + 1)
+    strings = _DecodedStrings(view, number_of_strings, offsets, offset)
+    return strings, offset + offsets[-1] + (-offsets[-1] % 4)
+
+
+def _read_array(view: memoryview, offset: int, typecode: str, count: int):
+    end = offset + 4 * count
+    if end > len(view):
+        raise ValueError('Truncated buffer')
+    values = view[offset:end].cast(typecode)
+    if sys.byteorder == 'big':
+        values = array(typecode, values.tobytes())
+        values.byteswap()
+        values = memoryview(values)
+    return values, end
+
+
+def _int32_array(values) -> array:
+    values = array('q', values)
+    if values and (min(values) < INT32_MIN or max(values) > INT32_MAX):
+        raise ValueError('Calories must fit in 32-bit integers to be encoded')
+    return array('i', values)
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(data: bytes, alignment: int) -> bytes:
+    return data + b'\0' * (-len(data) % alignment)
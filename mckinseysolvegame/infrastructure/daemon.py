@@ -0,0 +1,197 @@
+"""
+    Resident solver serving games over a Unix socket, so that short jobs pay neither the start of Python, nor the
+    imports, nor the setup of the solver.
+
+    Start the daemon:
+        python -m mckinseysolvegame.infrastructure.daemon /tmp/mckinseysolvegame.sock
+
+    and solve games through it with `SolverClient`. Each message is a frame (kind, length of the payload) followed
+    by its payload: a game encoded with `binary_format` for a request, then either a result encoded with
+    `binary_format` or the UTF-8 text of an error for the response. A connection carries any number of requests.
+    The daemon keeps the games it compiled, with the selections and caches of their compiled game, for the games
+    submitted again. Their names are registered in a registry of the daemon, replaced whenever a game is evicted,
+    so that the names kept are bounded by the games kept. Games are compiled and solved concurrently, each compiled
+    game being solved by one thread at a time as its caches are not shared safely.
+"""
+import argparse
+import hashlib
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import OptimizationResult
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services.compiled_game import CompiledGame
+from mckinseysolvegame.domain.services.eating_kernel import warm_up
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.binary_format import Game, decode_game, decode_result, encode_game, encode_result
+
+FRAME = struct.Struct('<BI')
+SOLVE_KIND = 1
+RESULT_KIND = 2
+ERROR_KIND = 3
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class SolverDaemon:
+    """
+        Solver listening on a Unix socket at `path`, keeping up to `cache_size` compiled games. The name registry
+        of `solver` is replaced by the ones of the daemon.
+    """
+    def __init__(self, path: str, solver: Optional[Solver] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.solver = solver or Solver()
+        self.solver.name_registry = NameRegistry()
+        self.cache_size = cache_size
+        # compiled games with the lock of their solve, by digest of their encoding
+        self._games: 'OrderedDict[bytes, Tuple[CompiledGame, threading.Lock]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._warm_up()
+
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode) and not _is_listening(path):
+            os.remove(path)  # left by a daemon that did not stop cleanly
+        # binding fails when another daemon is listening
+        self._server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+        self._server.daemon_threads = True
+        self._server.daemon = self
+
+    def __enter__(self) -> 'SolverDaemon':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """
+            Stop `serve_forever`, from another thread.
+        """
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def solve(self, game: bytes) -> OptimizationResult:
+        key = hashlib.blake2b(game, digest_size=16).digest()
+        with self._lock:
+            cached = self._games.get(key)
+            if cached is not None:
+                self._games.move_to_end(key)
+        if cached is None:
+            compiled = self.solver.compile(decode_game(game)), threading.Lock()
+            with self._lock:
+                # the game may have been compiled meanwhile by another request
+                cached = self._games.setdefault(key, compiled)
+                self._games.move_to_end(key)
+                if len(self._games) > self.cache_size:
+                    self._games.popitem(last=False)
+                    # the games kept hold the registries they were compiled with, the others are dropped
+                    self.solver.name_registry = NameRegistry()
+        compiled_game, solve_lock = cached
+        with solve_lock:
+            return OptimizationResult(species=list(compiled_game.solve()))
+
+    def _warm_up(self) -> None:
+        # compile the search kernels and fill the cache of the range parser, registering the names of the game
+        # solved in a registry of its own rather than in the one of the solver
+        warm_up()
+        solver = Solver(name_registry=NameRegistry(), engine=self.solver.engine, memo_size=self.solver.memo_size,
+                        batch_size=self.solver.batch_size, beam_width=self.solver.beam_width)
+        solver.find_sustainable_food_chain(generate_species(39))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        while True:
+            header = self.rfile.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            kind, length = FRAME.unpack(header)
+            payload = self.rfile.read(length)
+            try:
+                if kind != SOLVE_KIND:
+                    raise ValueError(f'Unexpected message kind {kind}')
+                response = RESULT_KIND, encode_result(self.server.daemon.solve(payload))
+            except Exception as e:
+                response = ERROR_KIND, f'{type(e).__name__}: {e}'.encode('utf-8')
+            _write_frame(self.wfile, *response)
+
+
+class SolverClient:
+    """
+        Connection to a `SolverDaemon`, to be used by one thread at a time.
+    """
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._file = self._socket.makefile('rwb')
+
+    def __enter__(self) -> 'SolverClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def solve(self, game: Game) -> OptimizationResult:
+        """
+            Solve a game, given as species or encoded with `binary_format`, as `find_sustainable_food_chain` would.
+        """
+        encoded = bytes(game) if isinstance(game, (bytes, bytearray, memoryview)) else encode_game(game)
+        _write_frame(self._file, SOLVE_KIND, encoded)
+        header = self._file.read(FRAME.size)
+        if len(header) < FRAME.size:
+            raise ConnectionError('The solver daemon closed the connection')
+        kind, length = FRAME.unpack(header)
+        payload = self._file.read(length)
+        if kind == ERROR_KIND:
+            raise RuntimeError(payload.decode('utf-8'))
+        return decode_result(payload)
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+
+def _is_listening(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def _write_frame(file, kind: int, payload: bytes) -> None:
+    file.write(FRAME.pack(kind, len(payload)) + payload)
+    file.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve the solver over a Unix socket.')
+    parser.add_argument('path', help='path of the Unix socket')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help='number of compiled games kept')
+    args = parser.parse_args()
+    with SolverDaemon(args.path, cache_size=args.cache_size) as daemon:
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+    Batch solving spread over several machines: a coordinator submits games, or shards of games, to a task queue,
+    and workers, wherever they run, claim the tasks, solve them and write back their results as
+    `OptimizationResult` JSON.
+
+    `TaskQueue` is the interface of the queue, and `FileSystemTaskQueue` an implementation needing no service,
+    only a directory shared by the coordinator and the workers, e.g. on a network filesystem:
+        - games/<game id>.game: the game, encoded with `binary_format`, written once for all its tasks,
+        - pending/<task id>.<attempt> and claimed/<task id>.<attempt>: the ticket of the task, holding the id of
+          its game and the depth ranges of its shard as JSON, moved atomically from one directory to the other
+          when a worker claims it,
+        - results/<task id>.json: the result of the task, only ever written once,
+        - failed/<task id>.json: the last error of a task that failed on every attempt.
+    A task that fails, or whose worker stops renewing its claim, is tried again up to `max_attempts` times.
+    A task may therefore be solved twice, which is harmless as the first result written is kept.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from mckinseysolvegame.domain.models import OptimizationResult
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.binary_format import Game, decode_game, encode_game
+
+TASK_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+SHARD_SEPARATOR = '--'
+
+
+class Task:
+    """
+        Game, or shard of a game, to solve.
+
+        Attributes:
+            task_id (str): The id of the task, made of letters, digits, '_' and '-'.
+            game (bytes): The game, encoded with `binary_format`.
+            depth_ranges (Optional[List[str]]): The depth ranges of the shard, None to solve the whole game.
+            attempt (int): The number of previous attempts at the task.
+            game_id (str): The id of the game, shared by the shards of a game, the task id by default.
+    """
+    def __init__(self, task_id: str, game: bytes, depth_ranges: Optional[List[str]] = None, attempt: int = 0,
+                 game_id: Optional[str] = None):
+        game_id = task_id if game_id is None else game_id
+        for identifier in (task_id, game_id):
+            if not TASK_ID_PATTERN.match(identifier):
+                raise ValueError(f'Invalid task id \'{identifier}\'')
+        self.task_id = task_id
+        self.game = game
+        self.depth_ranges = depth_ranges
+        self.attempt = attempt
+        self.game_id = game_id
+
+
+class TaskQueue:
+    """
+        Queue of the tasks of a batch solve, shared by a coordinator and workers.
+    """
+    def put(self, task: Task) -> None:
+        raise NotImplementedError
+
+    def claim(self) -> Optional[Task]:
+        """
+            Claim the next pending task, None when there is none.
+        """
+        raise NotImplementedError
+
+    def renew(self, task: Task) -> bool:
+        """
+            Renew the claim of a task being solved, returning False when it was lost, e.g. released as expired.
+        """
+        raise NotImplementedError
+
+    def complete(self, task: Task, result: OptimizationResult) -> bool:
+        """
+            Store the result of a claimed task, returning whether it was stored: a result already stored,
+            e.g. by a previous attempt believed lost, is kept.
+        """
+        raise NotImplementedError
+
+    def fail(self, task: Task, error: str) -> None:
+        """
+            Release a claimed task that failed, to be tried again unless it has no attempts left.
+        """
+        raise NotImplementedError
+
+    def result(self, task_id: str) -> Optional[OptimizationResult]:
+        raise NotImplementedError
+
+    def error(self, task_id: str) -> Optional[str]:
+        """
+            The last error of a task that failed on every attempt, None otherwise.
+        """
+        raise NotImplementedError
+
+
+class FileSystemTaskQueue(TaskQueue):
+    """
+        Task queue in a directory (see above). Claims last `lease_timeout` seconds unless renewed by `renew`.
+    """
+    def __init__(self, directory: str, max_attempts: int = 3, lease_timeout: float = 600.0):
+        if max_attempts < 1:
+            raise ValueError(f'max_attempts must be a positive integer, got {max_attempts}')
+        self.directory = directory
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        for name in ('games', 'pending', 'claimed', 'results', 'failed'):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+    def put(self, task: Task) -> None:
+        _write_once(self._path('games', task.game_id + '.game'), task.game)
+        _write_once(self._path('pending', f'{task.task_id}.{task.attempt}'),
+                    json.dumps({'gameId': task.game_id, 'depthRanges': task.depth_ranges}).encode('utf-8'))
+
+    def claim(self) -> Optional[Task]:
+        self.requeue_expired()
+        for ticket in sorted(_tickets(self._path('pending'))):
+            try:
+                # the claim starts fresh, the rename keeping the time of the ticket, and only one worker can move it
+                os.utime(self._path('pending', ticket))
+                os.rename(self._path('pending', ticket), self._path('claimed', ticket))
+            except FileNotFoundError:
+                continue
+            task_id, attempt = _split_ticket(ticket)
+            if os.path.exists(self._path('results', task_id + '.json')):
+                # solved by an attempt believed lost
+                _remove(self._path('claimed', ticket))
+                continue
+            try:
+                with open(self._path('claimed', ticket), 'rb') as f:
+                    content = json.load(f)
+                with open(self._path('games', content['gameId'] + '.game'), 'rb') as f:
+                    game = f.read()
+            except FileNotFoundError:
+                # released concurrently
+                continue
+            return Task(task_id, game, content['depthRanges'], attempt, content['gameId'])
+        return None
+
+    def renew(self, task: Task) -> bool:
+        try:
+            os.utime(self._path('claimed', f'{task.task_id}.{task.attempt}'))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def complete(self, task: Task, result: OptimizationResult) -> bool:
+        stored = _write_once(self._path('results', task.task_id + '.json'), result.to_json('str').encode('utf-8'))
+        _remove(self._path('claimed', f'{task.task_id}.{task.attempt}'))
+        return stored
+
+    def fail(self, task: Task, error: str) -> None:
+        self._release(f'{task.task_id}.{task.attempt}', error)
+
+    def requeue_expired(self) -> int:
+        """
+            Release the tasks whose claim expired, e.g. because their worker stopped. Returns their number.
+        """
+        expired = 0
+        deadline = time.time() - self.lease_timeout
+        for ticket in _tickets(self._path('claimed')):
+            try:
+                if os.stat(self._path('claimed', ticket)).st_mtime < deadline:
+                    self._release(ticket, 'The claim of the task expired')
+                    expired += 1
+            except FileNotFoundError:
+                continue
+        return expired
+
+    def result(self, task_id: str) -> Optional[OptimizationResult]:
+        try:
+            with open(self._path('results', task_id + '.json'), 'rb') as f:
+                return OptimizationResult.from_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def error(self, task_id: str) -> Optional[str]:
+        try:
+            with open(self._path('failed', task_id + '.json'), 'rb') as f:
+                return json.load(f)['error']
+        except FileNotFoundError:
+            return None
+
+    def _release(self, ticket: str, error: str) -> None:
+        task_id, attempt = _split_ticket(ticket)
+        if attempt + 1 < self.max_attempts:
+            try:
+                os.rename(self._path('claimed', ticket), self._path('pending', f'{task_id}.{attempt + 1}'))
+            except FileNotFoundError:
+                pass  # released concurrently
+        else:
+            # the ticket is never written to, so that a ticket released concurrently is not created again
+            _write_once(self._path('failed', task_id + '.json'),
+                        json.dumps({'error': error, 'attempts': attempt + 1}).encode('utf-8'))
+            _remove(self._path('claimed', ticket))
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.directory, *parts)
+
+
+class Coordinator:
+    """
+        Submits games to a task queue and gathers their results. A game submitted in shards is solved one depth
+        range per task, and its result is the longest chain of its shards, the first depth range winning ties
+        as in `Solver.find_sustainable_food_chain`.
+    """
+    def __init__(self, queue: TaskQueue):
+        self.queue = queue
+        self._shards: Dict[str, List[str]] = {}
+
+    def submit(self, game_id: str, game: Game, shards: bool = False) -> List[str]:
+        """
+            Submit a game, as species or encoded with `binary_format`, returning the ids of its tasks.
+        """
+        encoded = bytes(game) if isinstance(game, (bytes, bytearray, memoryview)) else encode_game(game)
+        if not shards:
+            tasks = [Task(game_id, encoded)]
+        else:
+            depth_ranges = sorted({s.depth_range for s in decode_game(encoded)})
+            tasks = [Task(f'{game_id}{SHARD_SEPARATOR}{i}', encoded, [depth_range], game_id=game_id)
+                     for i, depth_range in enumerate(depth_ranges)]
+        for task in tasks:
+            self.queue.put(task)
+        self._shards[game_id] = [task.task_id for task in tasks]
+        return self._shards[game_id]
+
+    def result(self, game_id: str) -> Optional[OptimizationResult]:
+        """
+            The result of a game submitted, None until all its tasks are solved.
+        """
+        results = [self.queue.result(task_id) for task_id in self._shards[game_id]]
+        if any(result is None for result in results):
+            return None
+        return max(results, key=lambda result: len(result.species), default=OptimizationResult(species=[]))
+
+    def errors(self, game_id: str) -> Dict[str, str]:
+        """
+            The errors of the tasks of a game that failed on every attempt, by task id.
+        """
+        errors = {task_id: self.queue.error(task_id) for task_id in self._shards[game_id]}
+        return {task_id: error for task_id, error in errors.items() if error is not None}
+
+
+class Worker:
+    """
+        Claims tasks from a queue and solves them, renewing the claim of the task being solved every
+        `renew_interval` seconds, which must be shorter than the lease of the claims of the queue. The names of
+        each task are registered in a registry of its own, replacing the one of `solver`, so that a long-running
+        worker does not keep the names of every game it solved.
+    """
+    def __init__(self, queue: TaskQueue, solver: Optional[Solver] = None, renew_interval: float = 60.0):
+        if renew_interval <= 0:
+            raise ValueError(f'renew_interval must be positive, got {renew_interval}')
+        self.queue = queue
+        self.solver = solver or Solver()
+        self.renew_interval = renew_interval
+
+    def run_once(self) -> bool:
+        """
+            Solve the next pending task, returning False when there is none.
+        """
+        task = self.queue.claim()
+        if task is None:
+            return False
+        solved = threading.Event()
+        heartbeat = threading.Thread(target=self._renew, args=(task, solved), daemon=True)
+        heartbeat.start()
+        self.solver.name_registry = NameRegistry()
+        try:
+            species = decode_game(task.game)
+            if task.depth_ranges is None:
+                solution = self.solver.find_sustainable_food_chain(species)
+            else:
+                solution = self.solver.compile(species).solve(depth_ranges=task.depth_ranges)
+        except Exception:
+            error = traceback.format_exc()
+            solved.set()
+            heartbeat.join()
+            self.queue.fail(task, error)
+        else:
+            solved.set()
+            heartbeat.join()
+            self.queue.complete(task, OptimizationResult(species=list(solution)))
+        return True
+
+    def run(self, max_tasks: Optional[int] = None, idle_timeout: float = 0.0, poll_interval: float = 1.0) -> int:
+        """
+            Solve tasks until `max_tasks` were solved, or no task was pending for `idle_timeout` seconds.
+            Returns the number of tasks solved.
+        """
+        solved = 0
+        idle_since = time.monotonic()
+        while max_tasks is None or solved < max_tasks:
+            if self.run_once():
+                solved += 1
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= idle_timeout:
+                break
+            else:
+                time.sleep(poll_interval)
+        return solved
+
+    def _renew(self, task: Task, solved: threading.Event) -> None:
+        # the result is still written if the claim is lost, the first result written being kept
+        while not solved.wait(self.renew_interval):
+            if not self.queue.renew(task):
+                return
+
+
+def _tickets(directory: str) -> List[str]:
+    # files being written start with a dot
+    return [name for name in os.listdir(directory) if not name.startswith('.')]
+
+
+def _split_ticket(ticket: str):
+    task_id, attempt = ticket.rsplit('.', 1)
+    return task_id, int(attempt)
+
+
+def _write_once(path: str, data: bytes) -> bool:
+    """
+        Write a file atomically unless it exists, returning whether it was written.
+    """
+    if os.path.exists(path):
+        return False
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+        # unlike a rename, a link never replaces an existing file
+        os.link(temporary_path, path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(temporary_path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
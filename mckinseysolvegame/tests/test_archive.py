@@ -0,0 +1,92 @@
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import OptimizationResult
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.archive import GameArchive
+
+
+@pytest.fixture
+def games():
+    return [generate_species(13, seed=seed) for seed in range(6)]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return str(tmp_path / 'games.msga')
+
+
+def as_json(species):
+    return [s.to_json() for s in species]
+
+
+def test_append_and_read_games(archive_path, games):
+    with GameArchive(archive_path, 'a') as archive:
+        assert len(archive) == 0
+        assert archive.append_games(games[:4]) == [0, 1, 2, 3]
+        assert archive.append_game(games[4], OptimizationResult(species=["Red Moss"], score=1.5)) == 4
+
+    with GameArchive(archive_path) as archive:
+        assert len(archive) == 5
+        assert as_json(archive.game(2)) == as_json(games[2])
+        assert archive.game_view(3).name(0) == games[3][0].name
+        assert [as_json(g) for g in archive.games(1, 3)] == [as_json(g) for g in games[1:3]]
+        assert not archive.has_result(0)
+        assert archive.result(0) is None
+        assert archive.result(4).species == ["Red Moss"]
+        assert archive.result(4).score == 1.5
+
+
+def test_append_to_existing_archive(archive_path, games):
+    with GameArchive(archive_path, 'a') as archive:
+        archive.append_games(games[:2])
+    with GameArchive(archive_path, 'a') as archive:
+        view = archive.game_view(0)
+        assert archive.append_games(games[2:]) == [2, 3, 4, 5]
+        assert view.name(0) == games[0][0].name
+
+    with GameArchive(archive_path) as archive:
+        assert [as_json(g) for g in archive.games()] == [as_json(g) for g in games]
+
+
+def test_solve_archive(archive_path, games):
+    with GameArchive(archive_path, 'a') as archive:
+        archive.append_games(games)
+        archive.set_result(1, OptimizationResult(species=["Already solved"]))
+
+        assert archive.solve(start=0, stop=4) == 3
+        assert archive.solve() == 2
+        assert archive.solve() == 0
+
+        for game_id, game in enumerate(games):
+            if game_id == 1:
+                assert archive.result(game_id).species == ["Already solved"]
+            else:
+                assert archive.result(game_id).species == list(Solver().find_sustainable_food_chain(game))
+
+
+def test_solve_archive_with_processes(archive_path, games):
+    with GameArchive(archive_path, 'a') as archive:
+        archive.append_games(games)
+
+        assert archive.solve(processes=2) == len(games)
+
+        assert [archive.result(i).species for i in range(len(games))] == \
+            [list(Solver().find_sustainable_food_chain(game)) for game in games]
+
+
+def test_invalid_archive_use(archive_path, tmp_path, games):
+    with GameArchive(archive_path, 'a') as archive:
+        archive.append_games(games[:1])
+        with pytest.raises(IndexError):
+            _ = archive.game(1)
+
+    with GameArchive(archive_path) as archive:
+        with pytest.raises(PermissionError):
+            archive.append_game(games[0])
+
+    not_an_archive = tmp_path / 'species.csv'
+    not_an_archive.write_bytes(b'name,calories_provided\n')
+    open(str(not_an_archive) + '.index', 'wb').close()
+    with pytest.raises(ValueError):
+        _ = GameArchive(str(not_an_archive))
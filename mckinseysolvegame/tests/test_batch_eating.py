@@ -0,0 +1,36 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services.batch_eating import batches, evaluate_chains
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.tests.test_eating import tied_species
+
+
+@pytest.mark.parametrize("species", [generate_species(26, seed=3), tied_species(1), tied_species(2)])
+def test_evaluate_chains_matches_eating(species):
+    for group in compile_groups(species, NameRegistry()).values():
+        for length in range(1, min(5, len(group)) + 1):
+            chains = np.array(list(combinations(range(len(group)), length)))
+            sustainable, calories = evaluate_chains(group, chains)
+
+            for chain, is_sustainable, chain_calories in zip(chains.tolist(), sustainable, calories):
+                assert is_sustainable == group.is_sustainable(chain)
+                steps = group.eating_steps(chain)
+                assert chain_calories.tolist() == [steps[group.names[i]]['calories_provided'] for i in chain]
+
+
+def test_evaluate_chains_rejects_a_single_chain():
+    group = next(iter(compile_groups(generate_species(4, seed=1)).values()))
+    with pytest.raises(ValueError):
+        evaluate_chains(group, np.array([0, 1]))
+
+
+def test_batches():
+    packed = list(batches(combinations(range(5), 2), 2, batch_size=4))
+
+    assert [len(batch) for batch in packed] == [4, 4, 2]
+    assert [tuple(chain) for batch in packed for chain in batch.tolist()] == list(combinations(range(5), 2))
@@ -0,0 +1,79 @@
+import json
+import pickle
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.infrastructure.binary_format import GameView, decode_game, decode_result, encode_game, \
+    encode_result
+
+
+@pytest.mark.parametrize("number_of_species", [0, 1, 13, 500])
+def test_game_round_trip(number_of_species):
+    species = generate_species(number_of_species, seed=2)
+
+    decoded = decode_game(encode_game(species))
+
+    assert [s.to_json() for s in decoded] == [s.to_json() for s in species]
+
+
+def test_game_round_trip_with_unicode_and_unknown_food_sources():
+    species = [
+        Species("Étoile de mer", 300, 0, "0-10m", "26.7-28.2", []),
+        Species("Poisson-clown 🐠", 200, 100, "0-10m", "26.7-28.2", ["Étoile de mer", "Not in the game"])
+    ]
+
+    decoded = decode_game(encode_game(species))
+
+    assert [s.to_json() for s in decoded] == [s.to_json() for s in species]
+
+
+def test_encoded_game_is_compact():
+    species = generate_species(500, seed=2)
+
+    encoded = encode_game(species)
+
+    assert len(encoded) < len(json.dumps([s.to_json() for s in species])) / 3
+    assert len(encoded) < len(pickle.dumps(species))
+
+
+def test_game_view_reads_without_copying():
+    species = generate_species(39, seed=2)
+    buffer = bytearray(encode_game(species))
+
+    view = GameView(buffer)
+
+    assert len(view) == 39
+    assert view.name(5) == species[5].name
+    assert list(view.calories_provided) == [s.calories_provided for s in species]
+    assert view.food_sources(5) == species[5].food_sources
+    assert view.calories_provided.obj is buffer
+    assert view.food_source_ids.obj is buffer
+    assert view.nbytes == len(buffer)
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        OptimizationResult(species=[]),
+        OptimizationResult(species=["Red Moss", "Shrimp", "Lanternfish"]),
+        OptimizationResult(species=["Red Moss", "Shrimp"], score=1234.5)
+    ]
+)
+def test_result_round_trip(result):
+    decoded = decode_result(memoryview(encode_result(result)))
+
+    assert decoded.species == result.species
+    assert decoded.score == result.score
+
+
+def test_decode_invalid_buffers():
+    with pytest.raises(ValueError):
+        _ = decode_game(b'not a game at all')
+    with pytest.raises(ValueError):
+        _ = decode_game(encode_result(OptimizationResult(species=["Red Moss"])))
+    with pytest.raises(ValueError):
+        _ = decode_game(encode_game(generate_species(13, seed=2))[:-8])
+    with pytest.raises(ValueError):
+        _ = encode_game([Species("Whale", 2 ** 40, 0, "", "", [])])
@@ -0,0 +1,112 @@
+import socket
+import threading
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import DEFAULT_NAME_REGISTRY, NameRegistry
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.binary_format import encode_game
+from mckinseysolvegame.infrastructure.daemon import SolverClient, SolverDaemon
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = SolverDaemon(str(tmp_path / 'solver.sock'), cache_size=2)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join()
+    daemon.close()
+
+
+def test_client_solves_games_through_the_daemon(daemon):
+    games = [generate_species(39, seed=seed) for seed in range(3)]
+    with SolverClient(daemon.path) as client:
+        for game in games + [encode_game(games[0])]:
+            species = game if isinstance(game, list) else games[0]
+            assert client.solve(game).species == list(Solver().find_sustainable_food_chain(species))
+
+    # only the last games compiled are kept
+    assert len(daemon._games) == 2
+
+
+def test_daemon_reports_errors(daemon):
+    with SolverClient(daemon.path) as client:
+        with pytest.raises(RuntimeError):
+            client.solve(b'not a game')
+        assert client.solve(generate_species(13, seed=1)).species \
+            == list(Solver().find_sustainable_food_chain(generate_species(13, seed=1)))
+
+
+def test_games_are_solved_concurrently(daemon, monkeypatch):
+    blocked, compiling, released = generate_species(39, seed=1), threading.Event(), threading.Event()
+    compile_game = daemon.solver.compile
+
+    def compile_slowly(species, *args, **kwargs):
+        if [s.name for s in species] == [s.name for s in blocked]:
+            compiling.set()
+            released.wait(10)
+        return compile_game(species, *args, **kwargs)
+
+    monkeypatch.setattr(daemon.solver, 'compile', compile_slowly)
+    results = []
+    with SolverClient(daemon.path) as client:
+        thread = threading.Thread(target=lambda: results.append(client.solve(blocked)))
+        thread.start()
+        assert compiling.wait(10)
+        # served while the first game is still being compiled
+        with SolverClient(daemon.path, timeout=5) as other_client:
+            assert other_client.solve(generate_species(13, seed=1)).species \
+                == list(Solver().find_sustainable_food_chain(generate_species(13, seed=1)))
+        released.set()
+        thread.join()
+
+    assert results[0].species == list(Solver().find_sustainable_food_chain(blocked))
+
+
+def test_daemon_keeps_a_live_socket(daemon):
+    with pytest.raises(OSError):
+        SolverDaemon(daemon.path)
+
+    with SolverClient(daemon.path) as client:
+        assert client.solve(generate_species(13, seed=1)).species \
+            == list(Solver().find_sustainable_food_chain(generate_species(13, seed=1)))
+
+
+def test_daemon_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / 'solver.sock')
+    # bound but not listening, as left by a daemon that did not stop cleanly
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    with SolverDaemon(path) as daemon:
+        assert daemon.path == path
+
+
+def test_warm_up_registers_no_name(tmp_path):
+    default_names = len(DEFAULT_NAME_REGISTRY)
+
+    with SolverDaemon(str(tmp_path / 'solver.sock'), Solver(name_registry=NameRegistry())) as daemon:
+        assert len(daemon.solver.name_registry) == 0
+    assert len(DEFAULT_NAME_REGISTRY) == default_names
+
+
+def test_names_kept_are_bounded_by_the_cache(daemon):
+    def renamed(species, suffix):
+        return [Species(f'{s.name} {suffix}', s.calories_provided, s.calories_needed, s.depth_range,
+                        s.temperature_range, [f'{f} {suffix}' for f in s.food_sources]) for s in species]
+
+    default_names = len(DEFAULT_NAME_REGISTRY)
+    with SolverClient(daemon.path) as client:
+        for suffix in range(20):
+            client.solve(renamed(generate_species(13, seed=1), suffix))
+
+    registries = {id(daemon.solver.name_registry): daemon.solver.name_registry}
+    for compiled_game, _ in daemon._games.values():
+        registries.update((id(group.registry), group.registry) for group in compiled_game.groups.values())
+    assert sum(len(registry) for registry in registries.values()) <= 3 * 13
+    assert len(DEFAULT_NAME_REGISTRY) == default_names
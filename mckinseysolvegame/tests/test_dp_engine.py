@@ -0,0 +1,29 @@
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.dp_engine import DynamicProgrammingSearch, eat
+
+
+@pytest.mark.parametrize("need, foods, expected", [
+    (500, ((0, 1000), (1, 2000)), ((1, 1500),)),
+    (1000, ((0, 600), (1, 600)), ((0, 100), (1, 100))),
+    (1001, ((0, 1000), (1, 1000)), ((0, 500), (1, 500))),
+    (1000, ((0, 1000),), None),
+    (1000, (), None)
+])
+def test_eat(need, foods, expected):
+    assert eat(need, foods) == expected
+
+
+def test_memo_is_bounded():
+    # few food sources per species, so that branches reach the same state through different species
+    species = generate_species(20, seed=1, species_per_depth_range=20, maximum_food_sources=1)
+    group = next(iter(compile_groups(species).values()))
+    search = DynamicProgrammingSearch(group, memo_size=8)
+    for length in range(len(group), 0, -1):
+        if search.find(length) is not None:
+            break
+
+    assert search.memo_info().currsize <= 8
+    assert search.memo_info().hits > 0
@@ -0,0 +1,64 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+def tied_species(seed):
+    # few distinct calories, so that species often have tied food sources
+    rng = random.Random(seed)
+    names = [f"Species{i}" for i in range(10)]
+    species = []
+    for name in names:
+        producer = rng.random() < 0.3
+        species.append(Species(name=name,
+                               calories_provided=rng.choice([500, 1000, 1500]),
+                               calories_needed=0 if producer else rng.choice([500, 1000, 1001, 2000]),
+                               depth_range="Depth",
+                               temperature_range="Temperature",
+                               food_sources=[] if producer else rng.sample(names, 3)))
+    return species
+
+
+@pytest.mark.parametrize("species", [generate_species(26, seed=3), tied_species(1), tied_species(2)])
+def test_compiled_groups_match_reference_eating(species):
+    solver = Solver()
+    groups = compile_groups(species, NameRegistry())
+    for depth_range, group in groups.items():
+        reference = [Species(s.name, s.calories_provided, s.calories_needed, s.depth_range, s.temperature_range,
+                             list(s.food_sources)) for s in species if s.depth_range == depth_range]
+        solver._populate_food_sources(reference)
+        reference.sort(key=lambda x: x.calories_provided, reverse=True)
+        assert group.names == [s.name for s in reference]
+
+        for length in range(1, 5):
+            for chain in combinations(range(len(group)), length):
+                chain_species = [reference[i] for i in chain]
+                assert group.is_sustainable(chain) == solver._is_sustainable(chain_species)
+                assert group.eating_steps(chain) == solver._simulate_eating(chain_species)
+
+
+@pytest.mark.parametrize("species", [generate_species(26, seed=3), tied_species(1), tied_species(2), tied_species(5)])
+def test_length_bound_holds_every_sustainable_chain(species):
+    for group in compile_groups(species, NameRegistry()).values():
+        bound = group.length_bound()
+        assert bound <= len(group)
+        for length in range(bound + 1, len(group) + 1):
+            assert not any(group.is_sustainable(chain) for chain in combinations(range(len(group)), length))
+
+
+def test_length_bound_balances_calories():
+    species = [Species("Algae", 1000, 0, "Depth", "Temperature", []),
+               Species("Krill", 900, 600, "Depth", "Temperature", ["Algae"]),
+               Species("Shrimp", 800, 700, "Depth", "Temperature", ["Algae", "Krill"]),
+               Species("Fish", 100, 1500, "Depth", "Temperature", ["Krill", "Shrimp"])]
+    group = next(iter(compile_groups(species, NameRegistry()).values()))
+
+    # the fish needs more calories than it provides and the others can spare
+    assert group.length_bound() == 3
@@ -0,0 +1,54 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services import eating_kernel
+from mckinseysolvegame.domain.services.batch_eating import adjacency_matrix
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.tests.test_eating import tied_species
+
+KERNELS = [eating_kernel._evaluate]
+if eating_kernel.ACCELERATED:
+    KERNELS.append(eating_kernel.evaluate)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("species", [generate_species(26, seed=3), tied_species(1), tied_species(2)])
+def test_kernel_matches_reference_eating(kernel, species):
+    solver = Solver()
+    for depth_range, group in compile_groups(species, NameRegistry()).items():
+        reference = [Species(s.name, s.calories_provided, s.calories_needed, s.depth_range, s.temperature_range,
+                             list(s.food_sources)) for s in species if s.depth_range == depth_range]
+        solver._populate_food_sources(reference)
+        reference.sort(key=lambda x: x.calories_provided, reverse=True)
+
+        for length in range(1, min(5, len(group)) + 1):
+            chains = np.array(list(combinations(range(len(group)), length)), dtype=np.intp)
+            sustainable, calories = kernel(np.array(group.calories_provided, dtype=np.int64),
+                                           np.array(group.calories_needed, dtype=np.int64),
+                                           adjacency_matrix(group), chains)
+
+            for chain, is_sustainable, chain_calories in zip(chains.tolist(), sustainable, calories):
+                chain_species = [reference[i] for i in chain]
+                steps = solver._simulate_eating(chain_species)
+                assert is_sustainable == solver._is_sustainable(chain_species)
+                assert chain_calories.tolist() == [steps[s.name]['calories_provided'] for s in chain_species]
+
+
+@pytest.mark.parametrize("kernel", [None] + KERNELS)
+def test_batch_engine_results_do_not_depend_on_the_kernel(monkeypatch, kernel):
+    # without a kernel, the batch engine simulates the eating with NumPy
+    monkeypatch.setattr(eating_kernel, 'ACCELERATED', kernel is not None)
+    monkeypatch.setattr(eating_kernel, 'evaluate', kernel)
+    species = generate_species(40, seed=5, species_per_depth_range=20)
+
+    assert Solver(engine='batch').find_sustainable_food_chain(species) == Solver().find_sustainable_food_chain(species)
+
+
+def test_warm_up():
+    eating_kernel.warm_up()
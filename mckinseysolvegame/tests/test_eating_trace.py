@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.eating_trace import EatingTrace
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+@pytest.fixture
+def group():
+    species = [Species("Algae", 500, 0, "Depth", "Temperature", []),
+               Species("Kelp", 500, 0, "Depth", "Temperature", []),
+               Species("Krill", 400, 1000, "Depth", "Temperature", ["Algae", "Kelp"]),
+               Species("Shrimp", 300, 100, "Depth", "Temperature", ["Krill"]),
+               Species("Whale", 200, 5000, "Depth", "Temperature", ["Shrimp"]),
+               Species("Eel", 100, 50, "Depth", "Temperature", ["Octopus"])]
+    return next(iter(compile_groups(species, NameRegistry()).values()))
+
+
+def test_trace_records_every_step(group):
+    trace = EatingTrace(capacity=1)
+    group.eating_steps(list(range(len(group))), trace)
+
+    assert len(trace) == 6
+    assert trace.to_json() == [
+        {'event': 'split', 'species': 'Krill', 'caloriesNeeded': 1000,
+         'foods': [{'species': 'Algae', 'caloriesBefore': 500, 'caloriesAfter': 0},
+                   {'species': 'Kelp', 'caloriesBefore': 500, 'caloriesAfter': 0}]},
+        {'event': 'ate', 'species': 'Shrimp', 'caloriesNeeded': 100,
+         'foods': [{'species': 'Krill', 'caloriesBefore': 400, 'caloriesAfter': 300}]},
+        {'event': 'not enough calories', 'species': 'Whale', 'caloriesNeeded': 5000,
+         'foods': [{'species': 'Shrimp', 'caloriesBefore': 300, 'caloriesAfter': 300}]},
+        {'event': 'no food source', 'species': 'Eel', 'caloriesNeeded': 50, 'foods': []},
+        {'event': 'no calories left', 'species': 'Algae', 'caloriesNeeded': 0, 'foods': []},
+        {'event': 'no calories left', 'species': 'Kelp', 'caloriesNeeded': 0, 'foods': []},
+    ]
+
+
+def test_trace_is_reused(group):
+    trace = EatingTrace()
+    group.eating_steps(list(range(len(group))), trace)
+    group.eating_steps([2, 3], trace)
+
+    assert trace.to_json() == [{'event': 'no food source', 'species': 'Krill', 'caloriesNeeded': 1000, 'foods': []},
+                               {'event': 'ate', 'species': 'Shrimp', 'caloriesNeeded': 100,
+                                'foods': [{'species': 'Krill', 'caloriesBefore': 400, 'caloriesAfter': 300}]}]
+
+
+def test_to_json(group):
+    trace = EatingTrace()
+    group.eating_steps([2, 3], trace)
+
+    assert json.loads(trace.to_json('str')) == trace.to_json()
+    with pytest.raises(NotImplementedError):
+        trace.to_json('xml')
+
+
+def test_trace_of_a_solve_round_trips_with_its_result():
+    trace = EatingTrace()
+    chain = Solver().find_sustainable_food_chain(generate_species(39, seed=1), trace=trace)
+    assert [step['species'] for step in trace.to_json()] == [name for name, step in chain.items() if 'eats' in step]
+
+    result = OptimizationResult(species=list(chain), trace=trace.to_json())
+    assert OptimizationResult.from_json(result.to_json('str')).to_json() == result.to_json()
+
+
+def test_trace_is_cleared_without_chain():
+    trace = EatingTrace()
+    Solver().find_sustainable_food_chain(generate_species(39, seed=1), trace=trace)
+    Solver().find_sustainable_food_chain([], trace=trace)
+
+    assert len(trace) == 0
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        EatingTrace(capacity=0)
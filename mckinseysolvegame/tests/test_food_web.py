@@ -0,0 +1,51 @@
+import pytest
+
+from mckinseysolvegame.domain.food_web import FoodWeb
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+@pytest.fixture
+def food_web():
+    return FoodWeb([
+        Species("Kelp", 3000, 0, "Depth", "Temperature", []),
+        Species("Moss", 2000, 0, "Depth", "Temperature", []),
+        Species("Shrimp", 1500, 1000, "Depth", "Temperature", ["Moss", "Kelp", "Plankton"]),
+        Species("Tuna", 1000, 800, "Depth", "Temperature", ["Shrimp"]),
+        Species("Squid", 900, 500, "Depth", "Temperature", ["Eel"]),
+        Species("Eel", 800, 500, "Depth", "Temperature", ["Squid"])
+    ])
+
+
+def test_food_web(food_web):
+    assert len(food_web) == 6
+    assert list(food_web.prey_offsets) == [0, 0, 0, 2, 3, 4, 5]
+    assert list(food_web.prey) == [1, 0, 2, 5, 4]
+    assert food_web.prey_of("Shrimp") == ["Moss", "Kelp"]
+    assert food_web.predators_of("Kelp") == ["Shrimp"]
+    assert food_web.producers == ["Kelp", "Moss"]
+    assert food_web.layers == [0, 0, 1, 2, None, None]
+    assert food_web.species_by_layer() == [["Kelp", "Moss"], ["Shrimp"], ["Tuna"]]
+    assert food_web.strongest_food_source("Shrimp") == "Kelp"
+    assert food_web.strongest_food_source("Kelp") is None
+
+
+def test_food_web_unknown_species(food_web):
+    with pytest.raises(KeyError):
+        _ = food_web.prey_of("Whale")
+
+
+def test_food_sources_named_by_several_species():
+    food_web = FoodWeb([Species("Kelp", 3000, 0, "0-30m", "Temperature", []),
+                        Species("Kelp", 2000, 0, "31-60m", "Temperature", []),
+                        Species("Shrimp", 1500, 1000, "31-60m", "Temperature", ["Kelp"])])
+
+    assert list(food_web.prey_of_index(2)) == [0, 1]
+    assert food_web.index("Kelp") == 0
+
+
+def test_compiled_game_food_web():
+    species = [Species("Kelp", 3000, 0, "Depth", "Temperature", []),
+               Species("Shrimp", 1500, 1000, "Depth", "Temperature", ["Kelp"])]
+
+    assert Solver().compile(species).food_web.prey_of("Shrimp") == ["Kelp"]
@@ -0,0 +1,27 @@
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import Species
+
+
+@pytest.mark.parametrize("number_of_species, expected_depth_ranges", [(13, 1), (39, 3), (100, 8), (500, 39)])
+def test_generate_species(number_of_species, expected_depth_ranges):
+    species = generate_species(number_of_species, seed=1)
+
+    assert len(species) == number_of_species
+    assert len({s.name for s in species}) == number_of_species
+    assert len({s.depth_range for s in species}) == expected_depth_ranges
+    names = {s.name for s in species}
+    for s in species:
+        assert all(food_source in names and food_source != s.name for food_source in s.food_sources)
+        assert (s.calories_needed == 0) == (not s.food_sources)
+        assert Species.from_json(s.to_json()).to_json() == s.to_json()
+
+
+def test_generate_species_is_reproducible():
+    first = [s.to_json() for s in generate_species(39, seed=7)]
+    second = [s.to_json() for s in generate_species(39, seed=7)]
+    other = [s.to_json() for s in generate_species(39, seed=8)]
+
+    assert first == second
+    assert first != other
@@ -0,0 +1,40 @@
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.heuristic import beam_search
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_beam_search_finds_sustainable_chains(seed):
+    solver = Solver()
+    for group in compile_groups(generate_species(39, seed=seed)).values():
+        chain = beam_search(group, 8)
+        exact = solver._find_longest_chain(group, 1, 8)
+
+        assert len(chain) <= len(exact)
+        assert not chain or group.is_sustainable(chain)
+
+
+def test_beam_search_with_required_species():
+    group = max(compile_groups(generate_species(39, seed=2)).values(), key=len)
+    chain = beam_search(group, 8)
+    required = chain[-1]
+
+    assert required in beam_search(group, 8, required=required)
+
+
+def test_beam_search_rejects_an_empty_beam():
+    group = next(iter(compile_groups(generate_species(4, seed=1)).values()))
+    with pytest.raises(ValueError):
+        beam_search(group, 8, beam_width=0)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_greedy_engine(seed):
+    species = generate_species(39, seed=seed)
+    chain = Solver(engine='greedy').find_sustainable_food_chain(species)
+
+    assert 0 < len(chain) <= len(Solver().find_sustainable_food_chain(species))
+    assert all(steps['calories_needed'] == 0 and steps['calories_provided'] > 0 for steps in chain.values())
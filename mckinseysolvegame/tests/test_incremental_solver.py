@@ -0,0 +1,76 @@
+import pytest
+
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.services.incremental_solver import IncrementalSolver
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+@pytest.fixture
+def species():
+    return [
+        Species("Red Moss", 3000, 0, "0-10m", "26.7-28.2", []),
+        Species("Sea Fan", 3500, 0, "0-10m", "26.7-28.2", []),
+        Species("Sea Lettuce", 3000, 0, "0-10m", "26.7-28.2", []),
+        Species("Blue Jellyfish", 4500, 3000, "0-10m", "26.7-28.2", ["Sea Lettuce", "Red Moss"]),
+        Species("Lanternfish", 3300, 2700, "0-10m", "26.7-28.2", ["Shrimp"]),
+        Species("Shrimp", 2750, 1450, "0-10m", "26.7-28.2", ["Red Moss", "Sea Lettuce"]),
+        Species("Sea Urchin", 2100, 3000, "0-10m", "26.7-28.2", ["Sea Fan", "Sea Lettuce"]),
+        Species("Widgeon Grass", 4950, 0, "0-30m", "28.3-30", []),
+        Species("Gem Tang", 1250, 4900, "0-30m", "28.3-30", ["Widgeon Grass"])
+    ]
+
+
+def test_solve_matches_solver(species):
+    session = IncrementalSolver(species)
+    assert session.solve() == Solver().find_sustainable_food_chain(species)
+
+
+def test_solve_with_no_species():
+    assert IncrementalSolver([]).solve() == {}
+
+
+@pytest.mark.parametrize(
+    "operation, arguments",
+    [
+        ("add_species", (Species("Green Sea Turtle", 4400, 3000, "0-10m", "26.7-28.2", ["Lanternfish", "Sea Urchin"]),)),
+        ("add_species", (Species("Kelp", 6000, 0, "0-30m", "28.3-30", []),)),
+        ("add_species", (Species("Coral", 100, 0, "90m+", "25-26.6", []),)),
+        ("remove_species", ("Shrimp",)),
+        ("remove_species", ("Sea Urchin",)),
+        ("remove_species", ("Gem Tang",)),
+        ("update_species", ("Shrimp", {"calories_needed": 3500})),
+        ("update_species", ("Sea Urchin", {"calories_needed": 1000, "food_sources": ["Sea Fan"]})),
+        ("update_species", ("Sea Fan", {"depth_range": "0-30m"})),
+        ("update_species", ("Red Moss", {"name": "Green Moss"}))
+    ]
+)
+def test_delta_matches_solving_from_scratch(species, operation, arguments):
+    session = IncrementalSolver(species)
+    if operation == "update_species":
+        name, changes = arguments
+        result = session.update_species(name, **changes)
+    else:
+        result = getattr(session, operation)(*arguments)
+
+    assert result == Solver().find_sustainable_food_chain(session.species)
+
+
+def test_successive_deltas(species):
+    session = IncrementalSolver(species)
+    session.remove_species("Red Moss")
+    session.add_species(Species("Red Moss", 2500, 0, "0-10m", "26.7-28.2", []))
+    session.update_species("Lanternfish", calories_needed=1000)
+    result = session.remove_species("Widgeon Grass")
+
+    assert result == Solver().find_sustainable_food_chain(session.species)
+    assert len(session.species) == len(species) - 1
+
+
+def test_invalid_deltas(species):
+    session = IncrementalSolver(species)
+    with pytest.raises(KeyError):
+        session.remove_species("Unknown")
+    with pytest.raises(ValueError):
+        session.add_species(Species("Shrimp", 100, 0, "0-10m", "26.7-28.2", []))
+    with pytest.raises(TypeError):
+        session.update_species("Shrimp", colour="pink")
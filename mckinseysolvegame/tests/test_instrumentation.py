@@ -0,0 +1,97 @@
+import json
+from math import comb
+
+import pandas as pd
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services.instrumentation import SolveStats
+from mckinseysolvegame.domain.services.optimization_service import EXACT_ENGINES, Solver
+
+
+@pytest.fixture
+def species():
+    return generate_species(39, seed=3)
+
+
+@pytest.fixture
+def dataframe():
+    return pd.DataFrame({
+        'name': ["Red Moss", "Shrimp"],
+        'calories_provided': [3000, 2750],
+        'calories_needed': [0, 1450],
+        'depth_range': ["0-10m", "0-10m"],
+        'temperature_range': ["26.7-28.2", "26.7-28.2"],
+        'food_sources': [None, "Red Moss"]
+    })
+
+
+def test_find_sustainable_food_chain_with_stats():
+    # a game whose search cuts branches
+    species = generate_species(39, seed=1)
+    stats = SolveStats()
+    result = Solver().find_sustainable_food_chain(species, stats=stats)
+
+    assert result == Solver().find_sustainable_food_chain(species)
+    assert len(stats.groups) == 3
+    assert stats.combinations_generated > 0
+    assert stats.combinations_pruned > 0
+    # the combinations of the branches cut are pruned without being generated
+    assert stats.combinations_generated <= stats.combinations_pruned + stats.combinations_simulated
+    assert max(g.chain_length for g in stats.groups.values()) == len(result)
+    assert stats.stage_times['populate'] > 0
+    assert stats.stage_times['search'] >= stats.stage_times['simulate'] > 0
+    assert stats.stage_times['ingest'] == 0
+    assert stats.total_time == pytest.approx(stats.stage_times['populate'] + stats.stage_times['search'])
+
+
+@pytest.mark.parametrize("engine", EXACT_ENGINES)
+def test_branches_cut_are_counted_as_pruned(engine):
+    group = next(iter(Solver()._compile_groups(generate_species(13, seed=1)).values()))
+    stats = SolveStats()
+
+    # no chain of that length: every combination is either generated or pruned
+    assert Solver(engine=engine)._find_longest_chain(group, min_length=8, max_length=8,
+                                                     stats=stats.group(group.key)) == []
+    assert stats.combinations_pruned > 0
+    assert stats.combinations_generated + stats.combinations_pruned == comb(len(group), 8)
+
+
+def test_find_top_food_chains_with_stats(species):
+    stats = SolveStats()
+    _ = Solver().find_top_food_chains(species, top_k=3, stats=stats)
+
+    assert stats.combinations_simulated > 0
+    assert stats.combinations_pruned > 0
+
+
+def test_stats_hook_is_called_once_per_solve(species):
+    reported = []
+    solver = Solver(stats_hook=reported.append)
+
+    solver.find_sustainable_food_chain(species)
+    solver.find_sustainable_food_chain([])
+
+    assert len(reported) == 2
+    assert reported[0].combinations_simulated > 0
+    assert reported[1].combinations_generated == 0
+
+
+def test_solve_from_dataframe_records_ingest(dataframe):
+    stats = SolveStats()
+    Solver().solve_from_dataframe(dataframe, stats=stats)
+
+    assert stats.stage_times['ingest'] > 0
+    assert stats.combinations_simulated > 0
+
+
+def test_stats_to_json(species):
+    stats = SolveStats()
+    Solver().find_sustainable_food_chain(species, stats=stats)
+
+    data = json.loads(stats.to_json("str"))
+    assert data['combinations_generated'] == stats.combinations_generated
+    assert set(data['stage_times']) == {'ingest', 'populate', 'search', 'simulate'}
+    assert set(data['groups']) == set(stats.groups)
+    with pytest.raises(NotImplementedError):
+        _ = stats.to_json("xml")
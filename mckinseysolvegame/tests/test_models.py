@@ -1,7 +1,12 @@
+import copy
+import json
+import pickle
+
 import pytest
 from marshmallow import ValidationError
 
-from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import FrozenSpecies, OptimizationResult, Species, SpeciesSchema
 
 
 # region deserialization
@@ -164,3 +169,121 @@ def test_optimization_result_serialization():
         assert serialized == {'species': ['Species1', 'Species2', 'Species3']}
     except ValidationError:
         pytest.fail('Serialization should not raise an error.')
+
+
+def test_optimization_result_with_score_round_trip():
+    result = OptimizationResult(species=['Species1', 'Species2'], score=1500)
+    serialized = result.to_json()
+    assert serialized == {'species': ['Species1', 'Species2'], 'score': 1500.0}
+
+    deserialized = OptimizationResult.from_json(serialized)
+    assert deserialized.species == ['Species1', 'Species2']
+    assert deserialized.score == 1500.0
+
+
+# region bulk deserialization
+def test_deserialize_many_species_matches_schema():
+    # Arrange
+    species = generate_species(100, seed=5)
+    species_json = json.dumps([s.to_json() for s in species])
+
+    # Act
+    loaded = Species.from_json(species_json, many=True)
+    loaded_from_bytes = Species.from_json(species_json.encode('utf-8'), many=True)
+    loaded_by_schema = SpeciesSchema(many=True).load(json.loads(species_json))
+
+    # Assert
+    assert [s.to_json() for s in loaded] == [s.to_json() for s in species]
+    assert [s.to_json() for s in loaded_from_bytes] == [s.to_json() for s in species]
+    assert [s.to_json() for s in loaded_by_schema] == [s.to_json() for s in species]
+
+
+@pytest.mark.parametrize(
+    "field, value, expected_message",
+    [
+        ("name", "A" * 65, "Longer than maximum length 64."),
+        ("caloriesProvided", 0, "Must be greater than or equal to 1."),
+        ("caloriesNeeded", -1, "Must be greater than or equal to 0."),
+        ("caloriesProvided", "not_an_int", "Not a valid integer."),
+        ("foodSources", ["B" * 65], "Longer than maximum length 64.")
+    ]
+)
+def test_deserialize_many_species_with_invalid_item(field, value, expected_message):
+    # Arrange
+    items = [s.to_json() for s in generate_species(20, seed=5)]
+    items[7][field] = value
+
+    # Act
+    with pytest.raises(ValidationError) as e:
+        _ = Species.from_json(json.dumps(items), many=True)
+
+    # Assert
+    assert field in e.value.messages[7]
+    assert expected_message in str(e.value.messages[7][field])
+
+
+def test_deserialize_many_species_with_numbers_as_strings():
+    items = [s.to_json() for s in generate_species(5, seed=5)]
+    items[2]['caloriesProvided'] = str(items[2]['caloriesProvided'])
+
+    loaded = Species.from_json(json.dumps(items), many=True)
+
+    assert loaded[2].calories_provided == int(items[2]['caloriesProvided'])
+
+
+def test_deserialize_many_optimization_results():
+    data = '[{"species": ["Species1", "Species2"], "score": 1500}, {"species": ["Species3"]}]'
+
+    results = OptimizationResult.from_json(data, many=True)
+
+    assert [(r.species, r.score) for r in results] == [(['Species1', 'Species2'], 1500.0), (['Species3'], None)]
+    with pytest.raises(ValidationError):
+        _ = OptimizationResult.from_json('[{"species": ["Species1"], "score": "high"}]', many=True)
+
+# endregion
+
+
+# region frozen species
+def test_species_has_no_instance_dictionary():
+    species = Species("Species 1", 2, 3, "", "", [])
+    assert not hasattr(species, '__dict__')
+    with pytest.raises(AttributeError):
+        species.colour = "red"
+
+
+def test_frozen_species_is_immutable_and_hashable():
+    # Arrange
+    frozen = FrozenSpecies("Shrimp", 2750, 1450, "0-10m", "26.7-28.2", ["Red Moss", "Sea Lettuce"])
+    same = FrozenSpecies.from_species(Species("Shrimp", 2750, 1450, "0-10m", "26.7-28.2", ["Red Moss", "Sea Lettuce"]))
+    other = FrozenSpecies("Shrimp", 2750, 1000, "0-10m", "26.7-28.2", ["Red Moss", "Sea Lettuce"])
+
+    # Assert
+    assert frozen.food_sources == ("Red Moss", "Sea Lettuce")
+    assert frozen == same and hash(frozen) == hash(same)
+    assert frozen != other
+    assert len({frozen, same, other}) == 2
+    assert frozen.food_sources is same.food_sources
+    assert copy.deepcopy(frozen) is frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    with pytest.raises(AttributeError):
+        frozen.calories_needed = 0
+    with pytest.raises(AttributeError):
+        del frozen.name
+
+
+def test_frozen_species_serialization():
+    # Arrange
+    species = Species("Species 1", 2, 3, "", "", ["Species 2"])
+    frozen = FrozenSpecies.from_species(species)
+
+    # Act
+    serialized = frozen.to_json()
+    deserialized = FrozenSpecies.from_json(json.dumps([serialized, serialized]), many=True)
+
+    # Assert
+    assert serialized == species.to_json()
+    assert deserialized == [frozen, frozen]
+    assert FrozenSpecies.from_json(serialized) == frozen
+    assert frozen.to_species().to_json() == species.to_json()
+
+# endregion
@@ -0,0 +1,48 @@
+import json
+
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import DEFAULT_NAME_REGISTRY, NameRegistry
+from mckinseysolvegame.domain.services.optimization_service import Solver
+
+
+def test_name_registry():
+    registry = NameRegistry()
+
+    assert registry.ids(["Kelp", "Shrimp", "Kelp"]) == [0, 1, 0]
+    assert registry.get("Whale") is None
+    assert "Whale" not in registry
+    assert len(registry) == 2
+    assert registry.names([1, 0]) == ["Shrimp", "Kelp"]
+    assert registry.intern("".join(["Sh", "rimp"])) is registry.name(1)
+
+
+def test_solver_shares_names_across_games():
+    registry = NameRegistry()
+    solver = Solver(name_registry=registry)
+    games = [
+        [Species("Kelp", 1000, 0, "Depth", "Temperature", []),
+         Species("Shrimp", 500, 400, "Depth", "Temperature", ["Kelp"])],
+        [Species("Kelp", 800, 0, "Depth", "Temperature", []),
+         Species("Shrimp", 600, 900, "Depth", "Temperature", ["Kelp"])]
+    ]
+
+    results = [solver.find_sustainable_food_chain(game) for game in games]
+
+    assert list(results[0]) == ["Kelp", "Shrimp"]
+    assert list(results[1]) == ["Kelp"]
+    assert len(registry) == 2
+    assert all(name is registry.intern(name) for result in results for name in result)
+
+
+def test_loading_species_registers_no_name():
+    data = [{'name': 'Loaded Kelp', 'caloriesProvided': 1000, 'caloriesNeeded': 0, 'depthRange': 'Depth',
+             'temperatureRange': 'Temperature', 'foodSources': []},
+            {'name': 'Loaded Shrimp', 'caloriesProvided': 500, 'caloriesNeeded': 400, 'depthRange': 'Depth',
+             'temperatureRange': 'Temperature', 'foodSources': ['Loaded Kelp']}]
+    registry = NameRegistry()
+
+    for species in (Species.from_json(json.dumps(data), many=True), [Species.from_json(item) for item in data]):
+        Solver(name_registry=registry).find_sustainable_food_chain(species)
+
+    assert 'Loaded Kelp' not in DEFAULT_NAME_REGISTRY and 'Loaded Shrimp' not in DEFAULT_NAME_REGISTRY
+    assert registry.names([0, 1]) == ['Loaded Kelp', 'Loaded Shrimp']
@@ -1,7 +1,14 @@
+from itertools import combinations
+
 import pytest
 import pandas as pd
-from mckinseysolvegame.domain.models import Species
-from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import FrozenSpecies, Species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.ranges import parse_range
+from mckinseysolvegame.domain.services.instrumentation import SolveStats
+from mckinseysolvegame.domain.services.optimization_service import EXACT_ENGINES, Solver
+from mckinseysolvegame.infrastructure.binary_format import encode_game
 
 
 @pytest.mark.parametrize(
@@ -1187,8 +1194,9 @@ from mckinseysolvegame.domain.services.optimization_service import Solver
         )
     ]
 )
-def test_find_sustainable_food_chain(species, expected_output):
-    result = Solver().find_sustainable_food_chain(species)
+@pytest.mark.parametrize("engine", EXACT_ENGINES)
+def test_find_sustainable_food_chain(species, expected_output, engine):
+    result = Solver(engine=engine).find_sustainable_food_chain(species)
     assert result == expected_output
 
 
@@ -1197,6 +1205,11 @@ def solver():
     return Solver()
 
 
+@pytest.fixture(params=EXACT_ENGINES)
+def engine_solver(request):
+    return Solver(engine=request.param)
+
+
 @pytest.mark.parametrize(
     "data, expected_output",
     [
@@ -1281,9 +1294,223 @@ def solver():
         )
     ]
 )
-def test_solve_from_dataframe(solver, data, expected_output):
+def test_solve_from_dataframe(engine_solver, data, expected_output):
     df = pd.DataFrame(data)
-    result = solver.solve_from_dataframe(df)
+    result = engine_solver.solve_from_dataframe(df)
 
     # Check if the result matches the expected output
     assert result == expected_output
+
+
+@pytest.fixture
+def ranked_species():
+    return [
+        Species(name="Producer1", calories_provided=1000, calories_needed=0,
+                depth_range="Depth", temperature_range="Temperature", food_sources=[]),
+        Species(name="Producer2", calories_provided=2000, calories_needed=0,
+                depth_range="Depth", temperature_range="Temperature", food_sources=[]),
+        Species(name="Animal1", calories_provided=100, calories_needed=1000,
+                depth_range="Depth", temperature_range="Temperature", food_sources=["Producer1", "Producer2"])
+    ]
+
+
+@pytest.mark.parametrize(
+    "top_k, expected_output",
+    [
+        (1, [(['Producer2', 'Producer1', 'Animal1'], 2100)]),
+        (
+            3,
+            [
+                (['Producer2', 'Producer1', 'Animal1'], 2100),
+                (['Producer2', 'Producer1'], 3000),
+                (['Producer2', 'Animal1'], 1100)
+            ]
+        ),
+        (
+            10,
+            [
+                (['Producer2', 'Producer1', 'Animal1'], 2100),
+                (['Producer2', 'Producer1'], 3000),
+                (['Producer2', 'Animal1'], 1100),
+                (['Producer2'], 2000),
+                (['Producer1'], 1000)
+            ]
+        )
+    ]
+)
+def test_find_top_food_chains(solver, ranked_species, top_k, expected_output):
+    results = solver.find_top_food_chains(ranked_species, top_k=top_k)
+    assert [(r.species, r.score) for r in results] == expected_output
+
+
+def test_find_top_food_chains_with_no_species(solver):
+    assert solver.find_top_food_chains([], top_k=3) == []
+
+
+def test_find_top_food_chains_with_invalid_top_k(solver, ranked_species):
+    with pytest.raises(ValueError):
+        _ = solver.find_top_food_chains(ranked_species, top_k=0)
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_solve_many(solver, processes):
+    games = [generate_species(13, seed=seed) for seed in range(4)]
+    expected = [solver.find_sustainable_food_chain(game) for game in games]
+
+    assert list(solver.solve_many(games, processes=processes)) == expected
+    assert list(solver.solve_many([encode_game(game) for game in games], processes=processes)) == expected
+
+
+def test_solve_many_in_parallel_keeps_the_settings():
+    games = [generate_species(39, seed=seed) for seed in range(20)]
+    reports = []
+    registry = NameRegistry()
+    solver = Solver(engine='greedy', beam_width=1, stats_hook=reports.append, name_registry=registry)
+    expected = list(solver.solve_many(games))
+    assert expected != list(Solver().solve_many(games))
+    del reports[:]
+
+    assert list(solver.solve_many(games, processes=2)) == expected
+    assert len(reports) == len(games) and all(report.groups for report in reports)
+    assert all(name in registry for chain in expected for name in chain)
+
+
+def test_find_sustainable_food_chain_with_frozen_species(solver):
+    species = generate_species(39, seed=4)
+    frozen = [FrozenSpecies.from_species(s) for s in species]
+
+    assert solver.find_sustainable_food_chain(frozen) == solver.find_sustainable_food_chain(species)
+    assert [FrozenSpecies.from_species(s) for s in species] == frozen
+
+
+def test_compiled_game_matches_find_sustainable_food_chain(solver):
+    species = generate_species(39, seed=5)
+    for i, s in enumerate(species):
+        s.temperature_range = "Warm" if i % 2 else "Cold"
+    game = solver.compile(species)
+
+    def expected(depth_ranges=None, temperature_ranges=None):
+        return solver.find_sustainable_food_chain([
+            s for s in species
+            if (depth_ranges is None or s.depth_range in depth_ranges)
+            and (temperature_ranges is None or s.temperature_range in temperature_ranges)])
+
+    assert game.depth_ranges == sorted({s.depth_range for s in species})
+    assert game.temperature_ranges == ["Cold", "Warm"]
+    assert game.solve() == solver.find_sustainable_food_chain(species)
+    for depth_range in game.depth_ranges:
+        assert game.solve(depth_ranges=[depth_range]) == expected(depth_ranges=[depth_range])
+    assert game.solve(temperature_ranges=["Warm"]) == expected(temperature_ranges=["Warm"])
+    assert game.solve(depth_ranges=game.depth_ranges[:1], temperature_ranges=["Cold"]) == \
+        expected(depth_ranges=game.depth_ranges[:1], temperature_ranges=["Cold"])
+    assert 0 < len(game.solve(max_length=2)) <= 2
+    assert game.solve(depth_ranges=[]) == {}
+
+
+@pytest.fixture
+def habitat_species():
+    species = generate_species(39, seed=6)
+    for i, s in enumerate(species):
+        s.temperature_range = "Warm" if i % 3 else "Cold"
+    return species
+
+
+@pytest.mark.parametrize("group_by, key", [
+    ("depth_range", lambda s: s.depth_range),
+    ("temperature_range", lambda s: s.temperature_range),
+    (("depth_range", "temperature_range"), lambda s: (s.depth_range, s.temperature_range)),
+    (lambda s: s.calories_provided > 1000, lambda s: s.calories_provided > 1000)
+])
+def test_find_sustainable_food_chain_group_by(solver, habitat_species, group_by, key):
+    groups = {}
+    for s in habitat_species:
+        groups.setdefault(key(s), []).append(s)
+    results = [solver.find_sustainable_food_chain(groups[k], group_by=lambda s: None) for k in sorted(groups)]
+    expected = max(results, key=len)
+
+    assert solver.find_sustainable_food_chain(habitat_species, group_by=group_by) == expected
+    assert solver.find_sustainable_food_chain(habitat_species, group_by=group_by, processes=2) == expected
+
+
+def test_find_sustainable_food_chain_with_invalid_group_by(solver, habitat_species):
+    with pytest.raises(ValueError):
+        _ = solver.find_sustainable_food_chain(habitat_species, group_by="name")
+
+
+def test_find_sustainable_food_chain_skips_groups_that_cannot_beat_the_best(solver):
+    species = [
+        Species("Producer1", 1000, 0, "A", "Temperature", []),
+        Species("Animal1", 500, 400, "A", "Temperature", ["Producer1"]),
+        Species("Producer2", 1000, 0, "B", "Temperature", []),
+        Species("Producer3", 1000, 0, "C", "Temperature", []),
+        Species("Animal3", 500, 400, "C", "Temperature", ["Producer3"])
+    ]
+    stats = SolveStats()
+
+    assert list(solver.find_sustainable_food_chain(species, stats=stats)) == ["Producer1", "Animal1"]
+    assert stats.groups["B"].combinations_generated == 0
+    assert stats.groups["C"].combinations_generated == 0
+
+
+@pytest.mark.parametrize("engine", EXACT_ENGINES)
+def test_find_sustainable_food_chain_with_a_name_in_several_depth_ranges(engine):
+    species = [
+        Species("Kelp", 3000, 0, "0-30m", "Temperature", []),
+        Species("Kelp", 3000, 0, "31-60m", "Temperature", []),
+        Species("Shrimp", 1500, 500, "31-60m", "Temperature", ["Kelp"]),
+        Species("Crab", 800, 1000, "31-60m", "Temperature", ["Shrimp"])
+    ]
+
+    # Shrimp eats the Kelp of its own depth range
+    assert Solver(engine=engine).find_sustainable_food_chain(species) == {
+        "Kelp": {"calories_needed": 0, "calories_provided": 2500},
+        "Shrimp": {"calories_needed": 0, "calories_provided": 500, "eats": ["Kelp"]},
+        "Crab": {"calories_needed": 0, "calories_provided": 800, "eats": ["Shrimp"]}
+    }
+
+
+def test_find_sustainable_food_chain_in_habitat(solver):
+    species = generate_species(78, seed=2)
+    shallow = [s for s in species if parse_range(s.depth_range).overlaps(0, 75)]
+
+    assert {s.depth_range for s in shallow} == {"0-30m", "31-60m", "61-90m"}
+    assert solver.find_sustainable_food_chain(species, depth=(0, 75)) == solver.find_sustainable_food_chain(shallow)
+    assert solver.compile(species).solve(depth=(0, 75), depth_ranges=["31-60m"]) == \
+        solver.find_sustainable_food_chain([s for s in species if s.depth_range == "31-60m"])
+
+
+def test_find_sustainable_food_chain_in_open_ended_depth_range(solver):
+    species = [
+        Species("Coral", 3000, 0, "90m+", "Temperature", []),
+        Species("Crab", 1500, 1000, "90m+", "Temperature", ["Coral"]),
+        Species("Kelp", 3000, 0, "0-30m", "Temperature", [])
+    ]
+
+    assert list(solver.find_sustainable_food_chain(species, depth=(100, 200))) == ["Coral", "Crab"]
+    assert list(solver.find_sustainable_food_chain(species, depth=(40, 80))) == []
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_pruned_combinations_keep_every_sustainable_chain_in_order(solver, seed):
+    group = next(iter(solver._compile_groups(generate_species(13, seed=seed)).values()))
+    for length in range(1, 6):
+        for required in (None, 3):
+            all_combinations = [c for c in combinations(range(len(group)), length) if required is None or required in c]
+            pruned = list(solver._combinations(group, length, required))
+            assert [c for c in all_combinations if group.is_sustainable(c)] == \
+                [c for c in pruned if group.is_sustainable(c)]
+            assert len(pruned) <= len(all_combinations)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_dp_engine_matches_combinations_engine(solver, seed):
+    species = generate_species(40, seed=seed, species_per_depth_range=20, producer_ratio=0.1)
+
+    assert Solver(engine="dp").find_sustainable_food_chain(species) == solver.find_sustainable_food_chain(species)
+    assert Solver(engine="dp", memo_size=2).compile(species).solve(max_length=4) == \
+        solver.compile(species).solve(max_length=4)
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        _ = Solver(engine="quantum")
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services import optimization_service
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.domain.services.progress import CancellationToken
+
+
+@pytest.fixture
+def species():
+    return generate_species(39, seed=3)
+
+
+def test_progress_is_reported_until_completion(species):
+    events = []
+    result = Solver().find_sustainable_food_chain(species, progress=events.append)
+
+    assert result == Solver().find_sustainable_food_chain(species)
+    assert events
+    fractions = [e.fraction for e in events]
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1.0
+    assert {e.depth_range for e in events} == {s.depth_range for s in species}
+    assert all(e.group_count == 3 and 0 <= e.group_index < 3 for e in events)
+    assert all(1 <= e.length <= 8 for e in events)
+
+
+@pytest.fixture
+def large_groups_species():
+    # groups large enough for the beam search to run first
+    return generate_species(60, seed=0, species_per_depth_range=30)
+
+
+def test_cancelled_before_solving(species, large_groups_species, monkeypatch):
+    def beam_search(*args, **kwargs):
+        raise AssertionError('The beam search ran after the cancellation')
+
+    monkeypatch.setattr(optimization_service, 'beam_search', beam_search)
+    token = CancellationToken()
+    token.cancel()
+
+    assert Solver().find_sustainable_food_chain(species, cancellation_token=token) == {}
+    assert Solver().find_sustainable_food_chain(large_groups_species, cancellation_token=token) == {}
+
+
+def test_cancelled_returns_best_so_far(species):
+    token = CancellationToken()
+    searched = []
+
+    def cancel_after_first_depth_range(event):
+        if event.group_index > 0:
+            token.cancel()
+        elif event.depth_range not in searched:
+            searched.append(event.depth_range)
+
+    result = Solver().find_sustainable_food_chain(species, progress=cancel_after_first_depth_range,
+                                                  cancellation_token=token)
+
+    # the groups are too small for the beam search to run, only the group searched has a chain
+    first_depth_range = [s for s in species if s.depth_range == searched[0]]
+    assert token.cancelled
+    assert result == Solver().find_sustainable_food_chain(first_depth_range)
+
+
+@pytest.mark.parametrize("engine, processes", [('combinations', None), ('combinations', 2), ('dp', 2)])
+def test_cancelled_returns_the_beam_search_chain(large_groups_species, monkeypatch, engine, processes):
+    token = CancellationToken()
+    chains = []
+    beam_search = optimization_service.beam_search
+
+    def beam_search_then_cancel(*args, **kwargs):
+        chains.append(beam_search(*args, **kwargs))
+        token.cancel()
+        return chains[-1]
+
+    monkeypatch.setattr(optimization_service, 'beam_search', beam_search_then_cancel)
+    result = Solver(engine=engine).find_sustainable_food_chain(large_groups_species, cancellation_token=token,
+                                                               processes=processes)
+
+    assert len(result) == max(len(chain) for chain in chains) > 0
+
+
+def test_cancelled_from_another_thread():
+    species = generate_species(500, seed=1)
+    token = CancellationToken()
+    timer = threading.Timer(0.2, token.cancel)
+    timer.start()
+
+    result = Solver().find_sustainable_food_chain(species, cancellation_token=token)
+
+    timer.join()
+    assert token.cancelled
+    assert isinstance(result, dict)
+
+
+def test_cancellation_token_timeout():
+    assert not CancellationToken().cancelled
+    assert not CancellationToken(timeout=60).cancelled
+    assert CancellationToken(timeout=0).cancelled
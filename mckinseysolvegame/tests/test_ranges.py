@@ -0,0 +1,52 @@
+import math
+import random
+
+import pytest
+
+from mckinseysolvegame.domain.ranges import Interval, IntervalIndex, parse_range
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0-10m", Interval(0, 10, "m")),
+    ("26.7-28.2", Interval(26.7, 28.2)),
+    ("-2-4.5C", Interval(-2, 4.5, "C")),
+    (" 31 - 60 m ", Interval(31, 60, "m")),
+    ("100m", Interval(100, 100, "m")),
+    ("90m+", Interval(90, math.inf, "m")),
+    ("25+", Interval(25, math.inf))
+])
+def test_parse_range(text, expected):
+    assert parse_range(text) == expected
+    assert parse_range(text) is parse_range(text)
+
+
+@pytest.mark.parametrize("text", ["", "Depth", "10-5m", "0-10-20m", "0-10m+", "90m++", "+90m"])
+def test_parse_invalid_range(text):
+    with pytest.raises(ValueError):
+        _ = parse_range(text)
+
+
+def test_interval_index_overlapping():
+    rng = random.Random(0)
+    entries = []
+    for i in range(200):
+        low = rng.randint(-10, 100)
+        entries.append((Interval(low, low + rng.choice([0, rng.randint(1, 30)])), i))
+    index = IntervalIndex(entries)
+
+    assert len(index) == 200
+    for _ in range(100):
+        low = rng.randint(-20, 110)
+        high = low + rng.randint(0, 20)
+        expected = [i for interval, i in sorted(entries, key=lambda e: e[0].low) if interval.overlaps(low, high)]
+        assert index.overlapping(low, high) == expected
+    assert IntervalIndex([]).overlapping(0, 10) == []
+
+
+def test_interval_index_with_open_ended_intervals():
+    index = IntervalIndex([(parse_range("0-30m"), "shallow"), (parse_range("90m+"), "deep"),
+                           (parse_range("31-60m"), "middle")])
+
+    assert index.overlapping(100, 200) == ["deep"]
+    assert index.overlapping(50, 95) == ["middle", "deep"]
+    assert index.overlapping(61, 89) == []
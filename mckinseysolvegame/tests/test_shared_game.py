@@ -0,0 +1,28 @@
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services.compiled_game import compile_groups
+from mckinseysolvegame.domain.services.shared_game import SharedGameTable
+
+
+def test_groups_round_trip_through_shared_memory():
+    groups = list(compile_groups(generate_species(40, seed=2, species_per_depth_range=10)).values())
+    with SharedGameTable.create(groups) as table:
+        attached = SharedGameTable.attach(table.name)
+
+        assert len(attached) == len(groups)
+        for index, group in enumerate(groups):
+            shared_group = attached.group(index)
+            assert shared_group.calories_provided == group.calories_provided
+            assert shared_group.calories_needed == group.calories_needed
+            assert shared_group.food_masks == group.food_masks
+        attached.close()
+        name = table.name
+
+    with pytest.raises(FileNotFoundError):
+        SharedGameTable.attach(name)
+
+
+def test_empty_table():
+    with SharedGameTable.create([]) as table:
+        assert len(table) == 0
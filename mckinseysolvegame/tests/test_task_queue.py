@@ -0,0 +1,179 @@
+import os
+import time
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import OptimizationResult, Species
+from mckinseysolvegame.domain.name_registry import DEFAULT_NAME_REGISTRY
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.infrastructure.binary_format import encode_game
+from mckinseysolvegame.infrastructure import task_queue
+from mckinseysolvegame.infrastructure.task_queue import Coordinator, FileSystemTaskQueue, Task, Worker
+
+
+class FlakySolver(Solver):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def find_sustainable_food_chain(self, species, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('Worker lost')
+        return super().find_sustainable_food_chain(species, *args, **kwargs)
+
+
+class SlowSolver(Solver):
+    def __init__(self, queue: FileSystemTaskQueue):
+        super().__init__()
+        self.queue = queue
+        self.expired = None
+
+    def find_sustainable_food_chain(self, species, *args, **kwargs):
+        time.sleep(3 * self.queue.lease_timeout)
+        self.expired = self.queue.requeue_expired()
+        return super().find_sustainable_food_chain(species, *args, **kwargs)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return FileSystemTaskQueue(str(tmp_path / 'queue'))
+
+
+def test_workers_solve_submitted_games(queue):
+    games = [generate_species(39, seed=seed) for seed in range(4)]
+    coordinator = Coordinator(queue)
+    for i, game in enumerate(games):
+        coordinator.submit(f'game{i}', game, shards=i % 2 == 1)
+    assert coordinator.result('game0') is None
+
+    assert Worker(queue).run() == 1 + 3 + 1 + 3
+
+    for i, game in enumerate(games):
+        assert coordinator.result(f'game{i}').species == list(Solver().find_sustainable_food_chain(game))
+    assert queue.claim() is None
+
+
+def test_shards_share_their_game(queue):
+    game = generate_species(39, seed=1)
+    coordinator = Coordinator(queue)
+
+    task_ids = coordinator.submit('game', game, shards=True)
+
+    assert os.listdir(os.path.join(queue.directory, 'games')) == ['game.game']
+    tasks = [queue.claim() for _ in task_ids]
+    assert [task.task_id for task in tasks] == task_ids
+    assert all(task.game_id == 'game' and task.game == encode_game(game) for task in tasks)
+
+
+def test_workers_keep_no_name_of_the_games_solved(queue):
+    coordinator = Coordinator(queue)
+    for i in range(5):
+        game = [Species(f'{s.name} {i}', s.calories_provided, s.calories_needed, s.depth_range, s.temperature_range,
+                        [f'{f} {i}' for f in s.food_sources]) for s in generate_species(13, seed=1)]
+        coordinator.submit(f'game{i}', game)
+    default_names = len(DEFAULT_NAME_REGISTRY)
+    worker = Worker(queue)
+
+    assert worker.run() == 5
+
+    assert len(worker.solver.name_registry) <= 13
+    assert len(DEFAULT_NAME_REGISTRY) == default_names
+
+
+def test_failed_tasks_are_retried(queue):
+    game = generate_species(13, seed=1)
+    coordinator = Coordinator(queue)
+    coordinator.submit('game', encode_game(game))
+
+    Worker(queue, FlakySolver(failures=2)).run()
+
+    assert coordinator.result('game').species == list(Solver().find_sustainable_food_chain(game))
+    assert coordinator.errors('game') == {}
+
+
+def test_tasks_failing_every_attempt(queue):
+    coordinator = Coordinator(queue)
+    coordinator.submit('game', generate_species(13, seed=1))
+
+    assert Worker(queue, FlakySolver(failures=3)).run() == 3
+
+    assert coordinator.result('game') is None
+    assert 'Worker lost' in coordinator.errors('game')['game']
+
+
+def test_failing_a_task_released_concurrently(tmp_path):
+    queue = FileSystemTaskQueue(str(tmp_path / 'queue'), max_attempts=1)
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    task = queue.claim()
+    # released meanwhile as expired
+    queue.fail(task, 'The claim of the task expired')
+
+    queue.fail(task, 'Worker lost')
+
+    assert os.listdir(os.path.join(queue.directory, 'claimed')) == []
+    assert queue.error('game') == 'The claim of the task expired'
+
+
+def test_results_are_written_once(queue):
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    task = queue.claim()
+
+    assert queue.complete(task, OptimizationResult(species=['Red Moss']))
+    assert not queue.complete(task, OptimizationResult(species=['Sea Fan']))
+    assert queue.result('game').species == ['Red Moss']
+
+
+def test_expired_claims_are_requeued(tmp_path):
+    queue = FileSystemTaskQueue(str(tmp_path / 'queue'), lease_timeout=-1)
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    lost = queue.claim()
+
+    # claiming again first releases the expired claim
+    task = queue.claim()
+    assert (task.task_id, task.attempt) == ('game', 1)
+    assert queue.complete(task, OptimizationResult(species=['Red Moss']))
+    assert not queue.complete(lost, OptimizationResult(species=['Sea Fan']))
+    assert queue.result('game').species == ['Red Moss']
+
+
+def test_claiming_a_ticket_pending_for_long(queue, monkeypatch):
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    os.utime(os.path.join(queue.directory, 'pending', 'game.0'), (0, 0))
+    rename = os.rename
+
+    def rename_then_requeue(source, destination):
+        rename(source, destination)
+        # another worker looking for expired claims right after the ticket moved
+        assert queue.requeue_expired() == 0
+
+    monkeypatch.setattr(task_queue.os, 'rename', rename_then_requeue)
+    task = queue.claim()
+
+    assert (task.task_id, task.attempt) == ('game', 0)
+
+
+def test_claims_are_renewed_while_solving(tmp_path):
+    queue = FileSystemTaskQueue(str(tmp_path / 'queue'), lease_timeout=0.2)
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    solver = SlowSolver(queue)
+
+    assert Worker(queue, solver, renew_interval=0.02).run_once()
+
+    assert solver.expired == 0
+    assert queue.result('game') is not None
+    assert queue.error('game') is None
+
+
+def test_renewing_a_lost_claim(queue):
+    queue.put(Task('game', encode_game(generate_species(13, seed=1))))
+    task = queue.claim()
+    queue.fail(task, 'Worker lost')
+
+    assert not queue.renew(task)
+
+
+def test_invalid_task_id():
+    with pytest.raises(ValueError):
+        Task('../game', b'')
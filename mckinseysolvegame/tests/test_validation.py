@@ -0,0 +1,92 @@
+import json
+from itertools import combinations
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.models import Species
+from mckinseysolvegame.domain.name_registry import NameRegistry
+from mckinseysolvegame.domain.services import eating, validation
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.domain.services.validation import validate_chains
+from mckinseysolvegame.tests.test_eating import tied_species
+
+
+@pytest.fixture
+def game():
+    species = [Species("Algae", 1000, 0, "0-30m", "Temperature", []),
+               Species("Krill", 900, 600, "0-30m", "Temperature", ["Algae"]),
+               Species("Shrimp", 800, 700, "0-30m", "Temperature", ["Algae", "Krill"]),
+               Species("Whale", 100, 5000, "0-30m", "Temperature", ["Krill"]),
+               Species("Kelp", 500, 0, "31-60m", "Temperature", [])]
+    return Solver(name_registry=NameRegistry()).compile(species)
+
+
+@pytest.mark.parametrize("species", [generate_species(26, seed=3), tied_species(1), tied_species(2)])
+def test_validate_chains_matches_eating(species):
+    game = Solver().compile(species)
+    for group in game.groups.values():
+        chains = [chain for length in range(1, 5) for chain in combinations(range(len(group)), length)]
+        validations = validate_chains(game, [[group.names[i] for i in reversed(chain)] for chain in chains])
+
+        for chain, result in zip(chains, validations):
+            assert result.sustainable == group.is_sustainable(chain)
+            assert result.sustainable == (result.reason is None)
+            steps = group.eating_steps(chain)
+            assert result.calories == {name: step['calories_provided'] for name, step in steps.items()}
+
+
+def test_sustainable_chain(game):
+    result = validate_chains(game, [["Shrimp", "Algae", "Krill"]])[0]
+
+    assert result.sustainable
+    assert result.species == ["Algae", "Krill", "Shrimp"]
+    assert result.calories == {"Algae": 400, "Krill": 200, "Shrimp": 800}
+    assert (result.failing_species, result.reason) == (None, None)
+
+
+def test_chains_given_by_name_ids(game):
+    registry = game.solver.name_registry
+    by_id, by_name = validate_chains(game, [registry.ids(["Krill", "Algae"]), ["Krill", "Algae"]])
+
+    assert by_id.to_json() == by_name.to_json()
+
+
+def test_to_json(game):
+    result = validate_chains(game, [["Algae", "Whale"]])[0]
+
+    assert result.to_json() == {"sustainable": False, "species": ["Algae", "Whale"],
+                                "calories": {"Algae": 1000, "Whale": 100},
+                                "failingSpecies": "Whale", "reason": eating.NO_FOOD_SOURCE}
+    assert json.loads(result.to_json("str")) == result.to_json()
+    with pytest.raises(NotImplementedError):
+        result.to_json("xml")
+
+
+@pytest.mark.parametrize("chain, failing_species, reason", [
+    (["Algae", "Whale"], "Whale", eating.NO_FOOD_SOURCE),
+    (["Algae", "Krill", "Whale"], "Whale", eating.NOT_ENOUGH_CALORIES),
+    (["Krill", "Shrimp"], "Krill", eating.NO_FOOD_SOURCE),
+    (["Krill"], "Krill", eating.NO_FOOD_SOURCE),
+    ([], None, eating.NO_PRODUCER),
+    (["Algae", "Octopus"], "Octopus", validation.UNKNOWN_SPECIES),
+    (["Algae", "Kelp"], "Kelp", validation.SEVERAL_GROUPS),
+])
+def test_unsustainable_chains(game, chain, failing_species, reason):
+    result = validate_chains(game, [chain])[0]
+
+    assert not result.sustainable
+    assert (result.failing_species, result.reason) == (failing_species, reason)
+
+
+def test_chain_eaten_down():
+    # the krill eats half of its needs from each of its tied food sources, which provide nothing more
+    species = [Species("Algae", 500, 0, "Depth", "Temperature", []),
+               Species("Kelp", 500, 0, "Depth", "Temperature", []),
+               Species("Krill", 400, 1000, "Depth", "Temperature", ["Algae", "Kelp"])]
+    game = Solver(name_registry=NameRegistry()).compile(species)
+
+    result = validate_chains(game, [["Algae", "Kelp", "Krill"]])[0]
+
+    assert (result.failing_species, result.reason) == ("Algae", eating.NO_CALORIES_LEFT)
+    assert result.calories == {"Algae": 0, "Kelp": 0, "Krill": 400}
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+import pytest
+
+from mckinseysolvegame.domain.generator import generate_species
+from mckinseysolvegame.domain.services import work_stealing
+from mckinseysolvegame.domain.services.compiled_game import CompiledGroup
+from mckinseysolvegame.domain.services.instrumentation import SolveStats
+from mckinseysolvegame.domain.services.optimization_service import Solver
+from mckinseysolvegame.domain.services.work_stealing import SharedBest
+
+
+def test_shared_best_keeps_the_first_longest_chain():
+    best = SharedBest(8)
+    assert best.may_improve((1, 3, (2,)))
+
+    best.offer(1, (2, 4, 5))
+    best.offer(1, (2, 4, 6))
+    best.offer(2, (0, 1, 2))
+
+    assert not best.may_improve((0, 2, (0,)))
+    assert not best.may_improve((1, 3, (3,)))
+    assert best.may_improve((1, 3, (2, 4)))
+    assert best.may_improve((0, 3, (5,)))
+    assert best.may_improve((3, 4, (0,)))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_work_stealing_matches_the_sequential_search(monkeypatch, seed):
+    # subtrees are split as soon as a worker is idle
+    monkeypatch.setattr(work_stealing, 'SPLIT_SIZE', 1)
+    species = generate_species(50, seed=seed, species_per_depth_range=25, producer_ratio=0.1) \
+        + generate_species(20, seed=seed + 10, species_per_depth_range=5)
+    stats = SolveStats()
+
+    assert Solver().find_sustainable_food_chain(species, processes=3, stats=stats) \
+        == Solver().find_sustainable_food_chain(species)
+    assert stats.combinations_generated > 0
+
+
+def test_search_groups_without_chain():
+    # two animals feeding on each other, without any producer
+    groups = [CompiledGroup(None, [0, 1], [2000, 1000], [500, 500], [0b10, 0b01])]
+
+    assert work_stealing.search_groups(groups, 8, 2) == (None, [], [])
+
+
+def test_search_groups_with_a_worker_exiting(monkeypatch):
+    group = next(iter(Solver()._compile_groups(generate_species(13, seed=1)).values()))
+    claimed = work_stealing.multiprocessing.Value('i', 0)
+
+    def work(table_name, tasks, results, best, idle, collect_stats):
+        with claimed.get_lock():
+            first, claimed.value = not claimed.value, 1
+        if first:
+            os._exit(1)
+        # more results than the pipe holds, put once the search failed
+        time.sleep(4 * work_stealing.POLL_INTERVAL)
+        for _ in range(64):
+            results.put((0, tuple(range(4096)), 0, None))
+        while tasks.get() is not None:
+            pass
+
+    def search():
+        try:
+            work_stealing.search_groups([group], 8, 2)
+        except RuntimeError as e:
+            errors.append(e)
+
+    monkeypatch.setattr(work_stealing, '_work', work)
+    errors = []
+    thread = threading.Thread(target=search, daemon=True)
+    thread.start()
+    thread.join(30)
+
+    assert not thread.is_alive()
+    assert errors
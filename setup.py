@@ -24,6 +24,9 @@ setup(name='mckinseysolvegame',
           'pytest>=7.1.3',
           'marshmallow>=3.19.0'
       ],
+      extras_require={
+          'numba': ['numba>=0.56']
+      },
       python_requires='>=3.10.2, <4',
       classifiers=[
           'Development Status :: 5 - Production/Stable',